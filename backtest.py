@@ -2,9 +2,9 @@
 """
 Simple backtester for HR score model.
 
-Uses existing data files in ./data for given dates and calls
-generate_hr_scores_core.generate(date, save=False) under different
-environment parameter settings to evaluate predictive quality.
+Uses existing data files in ./data for given dates and scores each date
+once per parameter setting (a ScoringConfig built from env-style overrides;
+the process environment is never modified) to evaluate predictive quality.
 
 Metrics:
 - ROC-AUC (rank-based)
@@ -20,7 +20,12 @@ from __future__ import annotations
 import argparse
 import json
 import os
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
+
+import generate_hr_scores_core as core
+from identity import IdentityMap, id_key, load_identity
+from scoring_config import ScoringConfig, from_env as config_from_env
+from scores_store import existing_scores_path, load_columns
 
 APP_DIR = os.path.dirname(os.path.abspath(__file__))
 DATA_DIR = os.path.join(APP_DIR, 'data')
@@ -31,22 +36,13 @@ def _load_json(path: str) -> dict:
         return json.load(f)
 
 
-def _get_player_id_map(date: str) -> Dict[str, int]:
-    """Map player name -> MLBAM id for a given date using player-stats file."""
+def _get_identity(date: str) -> IdentityMap:
+    """Identity map (persisted aliases + the date's player-stats) for resolving rows without an id."""
+    ident = load_identity().copy()
     path = os.path.join(DATA_DIR, f'player-stats-{date}.json')
-    if not os.path.exists(path):
-        return {}
-    data = _load_json(path)
-    out: Dict[str, int] = {}
-    for p in data.get('players', []):
-        n = p.get('name')
-        try:
-            pid = int(p.get('mlbam_id')) if p.get('mlbam_id') is not None else None
-        except Exception:
-            pid = None
-        if n and pid:
-            out[n] = pid
-    return out
+    if os.path.exists(path):
+        ident.add_records(_load_json(path).get('players', []), role='batter')
+    return ident
 
 
 def _get_ground_truth_ids(date: str) -> Dict[int, int]:
@@ -66,33 +62,27 @@ def _get_ground_truth_ids(date: str) -> Dict[int, int]:
     return out
 
 
-def _generate_predictions(date: str, env_overrides: Dict[str, str]) -> List[Tuple[int, float, str]]:
+def _config_for(env_overrides: Dict[str, str], engine: Optional[str] = None) -> ScoringConfig:
+    """Current environment plus a setting's overrides (env var names), as an immutable config."""
+    cfg = config_from_env().with_overrides(env_overrides)
+    return cfg.with_overrides({'engine': engine}) if engine else cfg
+
+
+def _generate_predictions(date: str, env_overrides: Dict[str, str], engine: Optional[str] = None) -> List[Tuple[int, float, str]]:
     """Return list of (batter_id, score, name) for the date under env overrides."""
-    # Apply env overrides for this run
-    prev_vals = {}
-    for k, v in env_overrides.items():
-        prev_vals[k] = os.environ.get(k)
-        os.environ[k] = str(v)
-    try:
-        # Import locally to ensure it reads current env
-        import importlib
-        core = importlib.import_module('generate_hr_scores_core')
-        res = core.generate(date, save=False)
-    finally:
-        # restore env
-        for k, old in prev_vals.items():
-            if old is None:
-                os.environ.pop(k, None)
-            else:
-                os.environ[k] = old
-    id_map = _get_player_id_map(date)
+    res = core.generate(date, save=False, config=_config_for(env_overrides, engine))
+    return _predictions_from(date, res)
+
+
+def _predictions_from(date: str, res: Dict) -> List[Tuple[int, float, str]]:
+    ident = None
     preds: List[Tuple[int, float, str]] = []
     for p in res.get('players', []):
         n = p.get('name')
-        try:
-            bid = int(id_map.get(n)) if id_map.get(n) is not None else None
-        except Exception:
-            bid = None
+        bid = id_key(p.get('mlbam_id'))
+        if bid is None:
+            ident = ident or _get_identity(date)
+            bid = ident.resolve(n, p.get('team'))
         if bid is None:
             continue
         s = float(p.get('hr_score') or 0.0)
@@ -100,6 +90,25 @@ def _generate_predictions(date: str, env_overrides: Dict[str, str]) -> List[Tupl
     return preds
 
 
+def _saved_predictions(date: str) -> Optional[List[Tuple[int, float, str]]]:
+    """(batter_id, score, name) from the published hr-scores file for the date, any format; None if absent."""
+    path = existing_scores_path(DATA_DIR, date)
+    if not path:
+        return None
+    cols = load_columns(path)
+    ident = None
+    preds: List[Tuple[int, float, str]] = []
+    for bid, s, n, team in zip(cols['mlbam_id'].tolist(), cols['hr_score'].tolist(), cols['name'].tolist(),
+                               cols['team'].tolist()):
+        if bid < 0:
+            ident = ident or _get_identity(date)
+            bid = ident.resolve(n, team)
+        if bid is None:
+            continue
+        preds.append((bid, 0.0 if s != s else s, n))
+    return preds
+
+
 def _auc_roc(pairs: List[Tuple[float, int]]) -> float:
     """Compute ROC-AUC via pairwise comparisons: (score, label)."""
     pos = [s for s, y in pairs if y == 1]
@@ -162,9 +171,11 @@ def _decile_rates(pairs: List[Tuple[float, int]]) -> List[float]:
     return deciles
 
 
-def eval_one(date: str, env_overrides: Dict[str, str]) -> Dict:
+def eval_one(date: str, env_overrides: Dict[str, str], engine: Optional[str] = None,
+             preds: Optional[List[Tuple[int, float, str]]] = None) -> Dict:
     gt = _get_ground_truth_ids(date)
-    preds = _generate_predictions(date, env_overrides)
+    if preds is None:
+        preds = _generate_predictions(date, env_overrides, engine=engine)
     # Build (score, label) pairs
     label_by_id = {bid: 1 for bid in gt.keys()}
     pairs: List[Tuple[float, int]] = [(s, 1 if label_by_id.get(bid, 0) == 1 else 0) for (bid, s, _) in preds]
@@ -202,6 +213,12 @@ def main():
     parser = argparse.ArgumentParser(description='Backtest HR score model over given dates')
     parser.add_argument('--dates', required=True, help='Comma-separated dates YYYY-MM-DD')
     parser.add_argument('--out', help='Optional output JSON path for results')
+    parser.add_argument('--engine', choices=['loop', 'vectorized'],
+                        help='Scoring engine (default: SCORING_ENGINE env or loop)')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='Score the settings for each date in this many threads (default 1)')
+    parser.add_argument('--saved', action='store_true',
+                        help='Also evaluate the saved hr-scores files as published (json, compact or gzip)')
     args = parser.parse_args()
 
     dates = [d.strip() for d in args.dates.split(',') if d.strip()]
@@ -217,12 +234,30 @@ def main():
         {'name': 'park_wide_clamp', 'env': {'PARK_CLAMP_MIN': '0.85', 'PARK_CLAMP_MAX': '1.15'}},
     ]
 
+    # Each date's inputs are loaded once and scored under every setting
+    configs = [_config_for(setting['env'], args.engine) for setting in settings]
+    per_setting: List[List[Dict]] = [[] for _ in settings]
+    for d in dates:
+        variants = core.generate_variants(d, configs, workers=args.workers)
+        for i, (setting, res) in enumerate(zip(settings, variants)):
+            per_setting[i].append(eval_one(d, setting['env'], preds=_predictions_from(d, res)))
+
+    if args.saved:
+        saved = []
+        for d in dates:
+            preds = _saved_predictions(d)
+            if preds is not None:
+                saved.append(eval_one(d, {}, preds=preds))
+        if saved:
+            settings.append({'name': 'saved', 'env': {}})
+            per_setting.append(saved)
+        else:
+            print('No saved hr-scores files for the given dates')
+
     all_results = []
-    for setting in settings:
-        env_over = setting['env']
-        per_date = [eval_one(d, env_over) for d in dates]
+    for setting, per_date in zip(settings, per_setting):
         agg = aggregate(per_date)
-        all_results.append({'setting': setting['name'], 'env': env_over, 'aggregate': agg, 'per_date': per_date})
+        all_results.append({'setting': setting['name'], 'env': setting['env'], 'aggregate': agg, 'per_date': per_date})
 
     # Print concise report
     print('\nBacktest Summary:')
@@ -82,6 +82,44 @@ def apply_calibration(raw_p: float, calibrator: Optional[Dict]) -> float:
 	return raw_p
 
 
+def apply_calibration_array(raw_p, calibrator: Optional[Dict]):
+	"""Vectorized apply_calibration over a NumPy array (numpy imported lazily)."""
+	import numpy as np
+	raw_p = np.asarray(raw_p, dtype=float)
+	if calibrator is None:
+		return raw_p
+	method = calibrator.get('method')
+	if method == 'platt':
+		params = calibrator.get('params') or {}
+		alpha = float(params.get('alpha', 1.0))
+		beta = float(params.get('beta', 0.0))
+		p = np.clip(raw_p, 1e-12, 1 - 1e-12)
+		z = alpha * np.log(p / (1 - p)) + beta
+		with np.errstate(over='ignore'):
+			out = 1.0 / (1.0 + np.exp(-z))
+		out = np.where(z < -60, 0.0, np.where(z > 60, 1.0, out))
+		return np.clip(out, 0.0, 1.0)
+	if method == 'isotonic':
+		params = calibrator.get('params') or {}
+		xs = params.get('x') or []
+		ys = params.get('y') or []
+		if not xs or not ys or len(xs) != len(ys):
+			return raw_p
+		xs_a = np.asarray(xs, dtype=float)
+		ys_a = np.asarray(ys, dtype=float)
+		i2 = np.clip(np.searchsorted(xs_a, raw_p, side='left'), 1, len(xs_a) - 1)
+		i1 = i2 - 1
+		x1, x2 = xs_a[i1], xs_a[i2]
+		y1, y2 = ys_a[i1], ys_a[i2]
+		span = np.where(x2 == x1, 1.0, x2 - x1)
+		t = (raw_p - x1) / span
+		out = np.where(x2 == x1, y1, y1 + t * (y2 - y1))
+		out = np.where(np.abs(x2 - raw_p) < 1e-12, y2, out)
+		out = np.where(raw_p <= xs_a[0], ys_a[0], out)
+		return np.where(raw_p >= xs_a[-1], ys_a[-1], out)
+	return raw_p
+
+
 def fit_platt(examples: List[Dict[str, float]], max_iter: int = 250, lr: float = 0.1) -> Dict:
 	alpha = 1.0
 	beta = 0.0
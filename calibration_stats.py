@@ -0,0 +1,244 @@
+"""Calibration diagnostics over data/historical-hr-events.csv, aggregated incrementally.
+
+tools/log_outcomes.py only ever appends to the CSV, so OutcomeHistory reads
+each byte once: refresh() stats the file and parses just the complete lines
+added since the last offset into typed columns (date ordinal, calibrated and
+raw probability, homered). It also keeps, per probability column, the values
+sorted with their outcomes (new rows merged in stably, so ties stay in file
+order) and running sums for the unfiltered totals. A rewritten or truncated
+file (different inode, smaller size or changed header) is re-read from the
+start.
+
+stats(days) builds the /api/calibration-stats payload with NumPy; results
+are memoized per (rows read, cutoff date).
+"""
+from __future__ import annotations
+
+import csv
+import io
+import os
+import threading
+from array import array
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+import numpy as np
+
+N_BINS = 10
+
+_HISTORIES: Dict[str, 'OutcomeHistory'] = {}
+_HISTORIES_LOCK = threading.Lock()
+
+
+def _prob(v) -> float:
+    return float(v) if v not in (None, '', 'None') else float('nan')
+
+
+def _date_ordinal(v) -> int:
+    try:
+        return datetime.strptime(v, '%Y-%m-%d').toordinal() if v else -1
+    except Exception:
+        return -1
+
+
+class _SortedColumn:
+    """Probabilities (NaN excluded) in ascending order with the matching outcomes; stable across appends."""
+
+    def __init__(self):
+        self.p = np.empty(0)
+        self.y = np.empty(0, dtype=np.int64)
+        # Running sums over the column, in file order
+        self.sq_err = 0.0
+
+    def extend(self, p: np.ndarray, y: np.ndarray) -> None:
+        keep = ~np.isnan(p)
+        p, y = p[keep], y[keep]
+        if not len(p):
+            return
+        self.sq_err += sum(((p - y) ** 2).tolist())
+        order = np.argsort(p, kind='stable')
+        p, y = p[order], y[order]
+        at = np.searchsorted(self.p, p, side='right')
+        self.p = np.insert(self.p, at, p)
+        self.y = np.insert(self.y, at, y)
+
+
+class OutcomeHistory:
+    """Columns of one append-only outcomes CSV, extended by tailing new bytes."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self) -> None:
+        self.offset = 0
+        self.header: Optional[bytes] = None
+        self.fields: List[str] = []
+        self.inode = None
+        self.dates = array('l')
+        self.p = array('d')
+        self.p_raw = array('d')
+        self.y = array('l')
+        self.sorted = {'p': _SortedColumn(), 'p_raw': _SortedColumn()}
+        self.homers = 0
+        self.sum_p = 0.0
+        self.n_p = 0
+        self._results: Dict[tuple, Optional[dict]] = {}
+
+    def __len__(self) -> int:
+        return len(self.y)
+
+    def refresh(self) -> bool:
+        """Read complete lines appended since the last call; returns True when rows were added."""
+        with self._lock:
+            try:
+                st = os.stat(self.path)
+            except OSError:
+                self._reset()
+                return False
+            inode = (st.st_dev, st.st_ino)
+            if inode != self.inode or st.st_size < self.offset:
+                self._reset()
+            if st.st_size == self.offset:
+                return False
+            with open(self.path, 'rb') as f:
+                if self.header is not None and f.read(len(self.header)) != self.header:
+                    self._reset()
+                f.seek(self.offset)
+                chunk = f.read(st.st_size - self.offset)
+            self.inode = inode
+            end = chunk.rfind(b'\n') + 1
+            if not end:
+                return False
+            chunk = chunk[:end]
+            if self.header is None:
+                nl = chunk.index(b'\n') + 1
+                self.header, chunk = chunk[:nl], chunk[nl:]
+                self.fields = next(csv.reader([self.header.decode('utf-8')]))
+                self.offset = nl
+            self.offset += len(chunk)
+            return self._append(chunk.decode('utf-8'))
+
+    def _append(self, text: str) -> bool:
+        dates, p, p_raw, y = [], [], [], []
+        for row in csv.DictReader(io.StringIO(text), fieldnames=self.fields):
+            try:
+                pc, pr, hy = _prob(row.get('model_prob')), _prob(row.get('model_prob_raw')), int(row.get('homered'))
+            except Exception:
+                continue
+            dates.append(_date_ordinal(row.get('date')))
+            p.append(pc)
+            p_raw.append(pr)
+            y.append(hy)
+        if not y:
+            return False
+        self.dates.extend(dates)
+        self.p.extend(p)
+        self.p_raw.extend(p_raw)
+        self.y.extend(y)
+        self.homers += sum(y)
+        p_known = [v for v in p if v == v]
+        self.sum_p += sum(p_known)
+        self.n_p += len(p_known)
+        ya = np.array(y, dtype=np.int64)
+        self.sorted['p'].extend(np.array(p), ya)
+        self.sorted['p_raw'].extend(np.array(p_raw), ya)
+        self._results.clear()
+        return True
+
+    def stats(self, days: Optional[int] = None) -> Optional[dict]:
+        """Totals, Brier scores and equal-count reliability bins; days keeps dates on or after
+        today (UTC) minus days. None when no rows match."""
+        cutoff = (datetime.utcnow().date() - timedelta(days=days)).toordinal() if days else None
+        with self._lock:
+            key = (len(self.y), cutoff)
+            if key not in self._results:
+                if len(self._results) >= 64:
+                    self._results.clear()
+                self._results[key] = self._stats_all() if cutoff is None else self._stats_since(cutoff)
+            return self._results[key]
+
+    def _stats_all(self) -> Optional[dict]:
+        n = len(self.y)
+        if not n:
+            return None
+        cols = self.sorted
+        return _summary(n, self.homers, self.sum_p / self.n_p if self.n_p else None,
+                        cols['p'].sq_err / len(cols['p'].p) if len(cols['p'].p) else None,
+                        cols['p_raw'].sq_err / len(cols['p_raw'].p) if len(cols['p_raw'].p) else None,
+                        _bins(cols['p'].p, cols['p'].y), _bins(cols['p_raw'].p, cols['p_raw'].y))
+
+    def _stats_since(self, cutoff: int) -> Optional[dict]:
+        mask = np.frombuffer(self.dates, dtype=self.dates.typecode) >= cutoff
+        n = int(mask.sum())
+        if not n:
+            return None
+        y = np.frombuffer(self.y, dtype=self.y.typecode)[mask].astype(np.int64)
+        out = {}
+        for key, col in (('p', self.p), ('p_raw', self.p_raw)):
+            p = np.frombuffer(col, dtype=np.float64)[mask]
+            known = ~np.isnan(p)
+            pk, yk = p[known], y[known]
+            order = np.argsort(pk, kind='stable')
+            out[key] = (pk, yk, pk[order], yk[order])
+        pk = out['p'][0]
+        brier = {k: (float(np.mean((v[0] - v[1]) ** 2)) if len(v[0]) else None) for k, v in out.items()}
+        return _summary(n, int(y.sum()), float(np.mean(pk)) if len(pk) else None, brier['p'], brier['p_raw'],
+                        _bins(out['p'][2], out['p'][3]), _bins(out['p_raw'][2], out['p_raw'][3]))
+
+
+def _round(v: Optional[float]) -> Optional[float]:
+    return round(v, 5) if v is not None else None
+
+
+def _summary(total: int, homers: int, pred_mean, brier_cal, brier_raw, bins, raw_bins) -> dict:
+    return {
+        'total': total,
+        'homers': int(homers),
+        'overall_pred_mean': _round(pred_mean),
+        'overall_obs_rate': round(homers / total, 5),
+        'brier_calibrated': _round(brier_cal),
+        'brier_raw': _round(brier_raw),
+        'bins': bins,
+        'raw_bins': raw_bins,
+    }
+
+
+def _bins(p: np.ndarray, y: np.ndarray, k: int = N_BINS) -> Optional[List[dict]]:
+    """Equal-count bins over probabilities sorted ascending (remainder spread over the first bins)."""
+    n = len(p)
+    if not n:
+        return None
+    base = max(1, n // k)
+    bins = []
+    start = 0
+    for i in range(k):
+        end = min(n, start + base + (1 if i < n % k else 0))
+        if end > start:
+            pm = float(np.mean(p[start:end]))
+            ym = float(np.mean(y[start:end]))
+            # Outcomes are ints: an all-0 or all-1 bin reports an int rate, as statistics.mean did
+            ym = int(ym) if ym.is_integer() else ym
+            bins.append({
+                'idx': i + 1,
+                'count': end - start,
+                'p_lo': round(float(p[start]), 5),
+                'p_hi': round(float(p[end - 1]), 5),
+                'pred_mean': round(pm, 5),
+                'obs_rate': round(ym, 5),
+                'abs_error': round(abs(pm - ym), 5),
+            })
+        start = end
+    return bins
+
+
+def get_history(path: str) -> OutcomeHistory:
+    """Shared, refreshed history for the CSV at path."""
+    path = os.path.abspath(path)
+    with _HISTORIES_LOCK:
+        hist = _HISTORIES.get(path)
+        if hist is None:
+            hist = _HISTORIES[path] = OutcomeHistory(path)
+    hist.refresh()
+    return hist
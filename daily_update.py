@@ -30,7 +30,11 @@ def main():
     import argparse, subprocess, sys
     parser = argparse.ArgumentParser(description='Self-contained daily runner')
     parser.add_argument('--date', default=datetime.now().strftime('%Y-%m-%d'))
+    parser.add_argument('--offline', action='store_true', help='serve HTTP only from data/.http-cache')
     args = parser.parse_args()
+    if args.offline:
+        # Inherited by every step: http_client serves only from data/.http-cache
+        os.environ['HTTP_OFFLINE'] = '1'
     date = args.date
 
     # Load .env so tools (implied totals) can see ODDS_API_KEY if not in OS env
@@ -0,0 +1,138 @@
+"""Date-indexed catalog of the dated files in data/.
+
+Files named `<kind>-YYYY-MM-DD.json` (player-stats, fresh-schedule,
+hr-scores, ...; hr-scores also as `.json.gz`) are indexed once per directory change into
+kind -> sorted dates, so lookups are a dict hit or a bisect instead of an
+os.listdir + sort per prefix per call:
+
+- exact(kind, date)     the file for that date
+- nearest(kind, date)   the newest file on or before date (never a later date)
+- latest(kind)          the newest file of that kind
+- pick(kind, date)      exact -> nearest; with allow_future, then latest
+
+The directory's mtime is checked on each lookup (one stat); the listing is
+re-read only when files were added, removed or renamed. Catalogs are shared
+per directory by get_catalog().
+"""
+from __future__ import annotations
+
+import bisect
+import os
+import re
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+_DATED = re.compile(r'^(?P<kind>.+?)-(?P<date>\d{4}-\d{2}-\d{2})\.json(?P<gz>\.gz)?$')
+
+# Kinds whose readers go through scores_store and so accept .json.gz; a .json.gz
+# of any other kind is not indexed, since its readers open plain JSON.
+GZ_KINDS = ('hr-scores',)
+
+_CATALOGS: Dict[str, 'DataCatalog'] = {}
+_CATALOGS_LOCK = threading.Lock()
+
+
+def kind_of(prefix: str) -> str:
+    """'player-stats-' -> 'player-stats' (accepts either form)."""
+    return prefix[:-1] if prefix.endswith('-') else prefix
+
+
+class DataCatalog:
+    # A listing taken within this many seconds of the directory's mtime may
+    # have raced a same-tick write, so the next lookup re-reads it.
+    SETTLE_SECONDS = 1.0
+
+    def __init__(self, root: str):
+        self.root = root
+        self._lock = threading.Lock()
+        self._mtime_ns: Optional[int] = None
+        self._scanned_at = 0.0
+        self._dates: Dict[str, List[str]] = {}
+        # (kind, date) -> file name, for dates stored only as .json.gz
+        self._gz: Dict[Tuple[str, str], str] = {}
+        self.scans = 0
+
+    def _scan(self) -> None:
+        found: Dict[str, Dict[str, bool]] = {}
+        try:
+            names = os.listdir(self.root)
+        except FileNotFoundError:
+            names = []
+        for name in names:
+            m = _DATED.match(name)
+            if m and (not m.group('gz') or m.group('kind') in GZ_KINDS):
+                by_date = found.setdefault(m.group('kind'), {})
+                # Plain .json wins when both forms exist
+                by_date[m.group('date')] = by_date.get(m.group('date'), True) and bool(m.group('gz'))
+        self._dates = {kind: sorted(by_date) for kind, by_date in found.items()}
+        self._gz = {(kind, d): f"{kind}-{d}.json.gz" for kind, by_date in found.items() for d, gz in by_date.items() if gz}
+        self.scans += 1
+
+    def refresh(self, force: bool = False) -> None:
+        try:
+            st = os.stat(self.root)
+            mtime_ns, mtime = st.st_mtime_ns, st.st_mtime
+        except OSError:
+            mtime_ns, mtime = None, 0.0
+        with self._lock:
+            settled = self._scanned_at - mtime > self.SETTLE_SECONDS
+            if not force and self._scanned_at and mtime_ns == self._mtime_ns and settled:
+                return
+            self._scan()
+            self._mtime_ns = mtime_ns
+            self._scanned_at = time.time()
+
+    def path_for(self, kind: str, date: str) -> str:
+        kind = kind_of(kind)
+        return os.path.join(self.root, self._gz.get((kind, date)) or f"{kind}-{date}.json")
+
+    def dates(self, kind: str) -> List[str]:
+        self.refresh()
+        return list(self._dates.get(kind_of(kind), ()))
+
+    def kinds(self) -> List[str]:
+        self.refresh()
+        return sorted(self._dates)
+
+    def exact(self, kind: str, date: Optional[str]) -> Optional[str]:
+        if not date:
+            return None
+        self.refresh()
+        ds = self._dates.get(kind_of(kind), ())
+        i = bisect.bisect_left(ds, date)
+        return self.path_for(kind, date) if i < len(ds) and ds[i] == date else None
+
+    def nearest(self, kind: str, date: str) -> Tuple[Optional[str], Optional[str]]:
+        """Newest (path, date) on or before date."""
+        self.refresh()
+        ds = self._dates.get(kind_of(kind), ())
+        i = bisect.bisect_right(ds, date)
+        if i == 0:
+            return None, None
+        return self.path_for(kind, ds[i - 1]), ds[i - 1]
+
+    def latest(self, kind: str) -> Tuple[Optional[str], Optional[str]]:
+        self.refresh()
+        ds = self._dates.get(kind_of(kind), ())
+        if not ds:
+            return None, None
+        return self.path_for(kind, ds[-1]), ds[-1]
+
+    def pick(self, kind: str, date: Optional[str], allow_future: bool = False) -> Tuple[Optional[str], Optional[str]]:
+        """(path, file date): exact, else nearest earlier; latest only without a date or with allow_future."""
+        if not date:
+            return self.latest(kind)
+        path, found = self.nearest(kind, date)
+        if path is None and allow_future:
+            return self.latest(kind)
+        return path, found
+
+
+def get_catalog(root: str) -> DataCatalog:
+    root = os.path.abspath(root)
+    with _CATALOGS_LOCK:
+        cat = _CATALOGS.get(root)
+        if cat is None:
+            cat = _CATALOGS[root] = DataCatalog(root)
+    return cat
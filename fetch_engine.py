@@ -0,0 +1,259 @@
+"""Process-wide admission control for outbound HTTP: one concurrency limit,
+a token bucket per host and priority lanes, scheduled on an asyncio loop.
+
+The fetch tools used to size their own ThreadPoolExecutors (16, 12, 8, ...)
+so a run could have dozens of uncoordinated requests in flight. Now every
+network attempt made by http_client first asks the engine for a slot:
+
+- at most CONCURRENCY requests are in flight (FETCH_CONCURRENCY, default
+  HTTP_POOL_MAXSIZE or 16, so slots match http_client's pooled connections);
+- each host gets RATE_PER_HOST requests per second with bursts of
+  BURST_PER_HOST (FETCH_RATE_PER_HOST, FETCH_BURST_PER_HOST);
+- waiting requests are served by lane priority (LANES: schedule and
+  probables first, H2H last), then in arrival order;
+- a request still queued at its deadline is cancelled with
+  requests.Timeout, which the fetchers already treat as a failed request.
+
+The scheduler runs on a daemon thread's asyncio event loop; the requests
+themselves stay blocking calls on the caller's thread (requests has no async
+transport), so the synchronous facade is all the fetchers see:
+
+    with fetch_engine.executor('h2h', deadline=600) as ex:   # ThreadPoolExecutor drop-in
+        futures = [ex.submit(fetch_bvp, b, p, year) for ...]
+
+    with fetch_engine.lane('schedule'):                      # current thread only
+        sched = http_json(url)
+
+Work submitted to an executor runs in its lane; code outside any lane uses
+DEFAULT_LANE.
+"""
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import heapq
+import itertools
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+import requests
+
+LANES = {
+    'live': 0,        # app: live HR scan, game states
+    'schedule': 0,    # schedule and probable pitchers
+    'rosters': 1,
+    'stats': 2,       # season stats, weather, park factors
+    'extras': 3,      # boxscore lineups, statcast extras, odds
+    'h2h': 4,         # batter-vs-pitcher history
+}
+DEFAULT_LANE = 'stats'
+
+
+def _env_num(name: str, default: float) -> float:
+    try:
+        return max(0.1, float(os.environ.get(name, default)))
+    except Exception:
+        return default
+
+
+CONCURRENCY = int(_env_num('FETCH_CONCURRENCY', _env_num('HTTP_POOL_MAXSIZE', 16)))
+RATE_PER_HOST = _env_num('FETCH_RATE_PER_HOST', 25.0)
+BURST_PER_HOST = _env_num('FETCH_BURST_PER_HOST', 10.0)
+
+# (lane, absolute time.monotonic() deadline or None) of the current thread's work
+_CONTEXT: contextvars.ContextVar = contextvars.ContextVar('fetch_lane', default=(DEFAULT_LANE, None))
+
+
+class _Bucket:
+    """Token bucket refilled continuously at rate tokens/s up to burst."""
+
+    def __init__(self, rate: float, burst: float):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.stamp = time.monotonic()
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(self.burst, self.tokens + (now - self.stamp) * self.rate)
+        self.stamp = now
+
+    def take(self, now: float) -> bool:
+        self._refill(now)
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return True
+        return False
+
+    def wait_time(self, now: float) -> float:
+        self._refill(now)
+        return max(0.0, (1 - self.tokens) / self.rate)
+
+
+class FetchEngine:
+    """Priority admission of requests under a global limit and per-host token buckets."""
+
+    def __init__(self, concurrency: int = CONCURRENCY, rate: float = RATE_PER_HOST, burst: float = BURST_PER_HOST):
+        self.concurrency = max(1, int(concurrency))
+        self.rate = rate
+        self.burst = burst
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._start_lock = threading.Lock()
+        # Touched only on the loop thread
+        self._waiting: List[tuple] = []
+        self._seq = itertools.count()
+        self._buckets: Dict[str, _Bucket] = {}
+        self._active = 0
+        self._wakeup: Optional[asyncio.TimerHandle] = None
+        self._stats: Dict[str, Dict[str, float]] = {}
+
+    # --- loop thread -------------------------------------------------------
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        with self._start_lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                threading.Thread(target=loop.run_forever, name='fetch-engine', daemon=True).start()
+                self._loop = loop
+            return self._loop
+
+    def _lane_stats(self, lane: str) -> Dict[str, float]:
+        st = self._stats.get(lane)
+        if st is None:
+            st = self._stats[lane] = {'granted': 0, 'timed_out': 0, 'wait_sec': 0.0, 'max_wait_sec': 0.0}
+        return st
+
+    async def _acquire(self, host: str, lane: str, deadline: Optional[float]) -> None:
+        loop = asyncio.get_running_loop()
+        fut = loop.create_future()
+        heapq.heappush(self._waiting, (LANES.get(lane, LANES[DEFAULT_LANE]), next(self._seq), host, lane, fut))
+        self._dispatch()
+        if deadline is None:
+            await fut
+            return
+        try:
+            await asyncio.wait_for(asyncio.shield(fut), max(0.0, deadline - time.monotonic()))
+        except asyncio.TimeoutError:
+            if fut.done() and not fut.cancelled():
+                # Granted in the same tick the deadline fired: give the slot back
+                self._release()
+            fut.cancel()
+            self._lane_stats(lane)['timed_out'] += 1
+            self._dispatch()
+            raise
+
+    def _dispatch(self) -> None:
+        """Grant slots to the highest-priority waiters whose host has a token."""
+        now = time.monotonic()
+        self._waiting = [w for w in self._waiting if not w[4].done()]
+        heapq.heapify(self._waiting)
+        blocked: List[tuple] = []
+        next_token = None
+        while self._waiting and self._active < self.concurrency:
+            w = heapq.heappop(self._waiting)
+            bucket = self._buckets.get(w[2])
+            if bucket is None:
+                bucket = self._buckets[w[2]] = _Bucket(self.rate, self.burst)
+            if not bucket.take(now):
+                blocked.append(w)
+                wait = bucket.wait_time(now)
+                next_token = wait if next_token is None else min(next_token, wait)
+                continue
+            self._active += 1
+            w[4].set_result(now)
+        for w in blocked:
+            heapq.heappush(self._waiting, w)
+        if next_token is not None and self._active < self.concurrency:
+            if self._wakeup is not None:
+                self._wakeup.cancel()
+            self._wakeup = self._loop.call_later(next_token, self._dispatch)
+
+    def _release(self) -> None:
+        self._active -= 1
+        self._dispatch()
+
+    # --- synchronous facade -----------------------------------------------
+
+    @contextmanager
+    def slot(self, host: str):
+        """Block the calling thread until a request to host may start; released on exit."""
+        lane, deadline = _CONTEXT.get()
+        loop = self._ensure_loop()
+        started = time.monotonic()
+        try:
+            asyncio.run_coroutine_threadsafe(self._acquire(host, lane, deadline), loop).result()
+        except (asyncio.TimeoutError, TimeoutError):
+            raise requests.Timeout(f"{lane} lane deadline passed while queued for {host}")
+        waited = time.monotonic() - started
+        loop.call_soon_threadsafe(self._granted, lane, waited)
+        try:
+            yield
+        finally:
+            loop.call_soon_threadsafe(self._release)
+
+    def _granted(self, lane: str, waited: float) -> None:
+        st = self._lane_stats(lane)
+        st['granted'] += 1
+        st['wait_sec'] += waited
+        st['max_wait_sec'] = max(st['max_wait_sec'], waited)
+
+    def stats(self) -> dict:
+        if self._loop is None:
+            return {'concurrency': self.concurrency, 'active': 0, 'waiting': 0, 'lanes': {}}
+
+        async def snapshot():
+            return {'concurrency': self.concurrency, 'active': self._active, 'waiting': len(self._waiting),
+                    'lanes': {k: {kk: (round(vv, 3) if isinstance(vv, float) else vv) for kk, vv in v.items()}
+                              for k, v in self._stats.items()}}
+        return asyncio.run_coroutine_threadsafe(snapshot(), self._loop).result()
+
+
+ENGINE = FetchEngine()
+
+
+def current_deadline() -> Optional[float]:
+    """time.monotonic() deadline of the current lane, or None."""
+    return _CONTEXT.get()[1]
+
+
+@contextmanager
+def lane(name: str, deadline: Optional[float] = None):
+    """Run the current thread's requests in lane; deadline in seconds from now cancels queued requests."""
+    token = _CONTEXT.set((name, time.monotonic() + deadline if deadline is not None else None))
+    try:
+        yield
+    finally:
+        _CONTEXT.reset(token)
+
+
+class LaneExecutor(ThreadPoolExecutor):
+    """ThreadPoolExecutor whose tasks run in a lane; the engine, not the pool size, bounds the wire."""
+
+    def __init__(self, name: str, deadline: Optional[float] = None, max_workers: Optional[int] = None):
+        super().__init__(max_workers=max_workers or ENGINE.concurrency, thread_name_prefix=f'fetch-{name}')
+        self.context = (name, time.monotonic() + deadline if deadline is not None else None)
+
+    def submit(self, fn, /, *args, **kwargs):
+        return super().submit(self._run, fn, *args, **kwargs)
+
+    def _run(self, fn, *args, **kwargs):
+        token = _CONTEXT.set(self.context)
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            _CONTEXT.reset(token)
+
+
+def executor(name: str, deadline: Optional[float] = None, max_workers: Optional[int] = None) -> LaneExecutor:
+    return LaneExecutor(name, deadline, max_workers)
+
+
+def slot(host: str):
+    return ENGINE.slot(host)
+
+
+def stats() -> dict:
+    return ENGINE.stats()
@@ -0,0 +1,58 @@
+"""Memoize values parsed from data files by the files' version.
+
+file_version(path) is (path, mtime_ns, size), or None when the file is
+missing; a rewrite changes it, so a memo keyed by it never serves a stale
+parse. file_memo(loader, maxsize) wraps loader so each file version (plus
+the loader's other arguments) is parsed once, keeping the newest maxsize
+results:
+
+    load_schedule = file_memo(_parse_schedule, maxsize=16)
+    sched = load_schedule(path, norm_team)      # parsed once per file version
+
+Memoized values are shared between callers; treat them as read-only.
+"""
+from __future__ import annotations
+
+import os
+import threading
+from typing import Callable, Dict, Optional
+
+
+def file_version(path: Optional[str]) -> Optional[tuple]:
+    """(path, mtime_ns, size) of the file, or None when path is empty or missing."""
+    if not path:
+        return None
+    try:
+        st = os.stat(path)
+        return (path, st.st_mtime_ns, st.st_size)
+    except OSError:
+        return None
+
+
+def file_memo(loader: Callable, maxsize: int, paths: int = 1, missing: Optional[Callable] = None) -> Callable:
+    """loader(*args) memoized by the version of its first `paths` arguments and the rest as-is.
+
+    The oldest result is dropped once maxsize are held. With missing, a call
+    whose files are all absent returns missing(*args) instead, uncached.
+    """
+    cache: Dict[tuple, object] = {}
+    lock = threading.Lock()
+    maxsize = max(1, int(maxsize))
+
+    def memo(*args):
+        versions = tuple(file_version(p) for p in args[:paths])
+        if missing is not None and not any(versions):
+            return missing(*args)
+        key = versions + tuple(args[paths:])
+        with lock:
+            if key in cache:
+                return cache[key]
+        value = loader(*args)
+        with lock:
+            while len(cache) >= maxsize:
+                cache.pop(next(iter(cache)))
+            cache[key] = value
+        return value
+
+    memo.__doc__ = loader.__doc__
+    return memo
@@ -18,6 +18,7 @@ ROOT_DATA = os.path.join(ROOT_DIR, 'data')
 
 # Import the actual core generator implementation
 import generate_hr_scores_core as core  # type: ignore
+from scores_store import output_format, save_scores
 
 
 def _ensure_local_dir():
@@ -30,10 +31,10 @@ def generate(date_str: Optional[str] = None) -> dict:
     The core module already writes to ROOT_DATA; we mirror into LOCAL_DATA.
     """
     data = core.generate(date_str, save=True)
+    if os.path.abspath(LOCAL_DATA) == os.path.abspath(core.DATA_DIR):
+        return data
     _ensure_local_dir()
-    out_path = os.path.join(LOCAL_DATA, f"hr-scores-{data['date']}.json")
-    with open(out_path, 'w', encoding='utf-8') as f:
-        json.dump(data, f, indent=2)
+    out_path = save_scores(data, LOCAL_DATA, output_format())
     print(f"Mirrored HR scores to {out_path}")
     return data
 
@@ -6,12 +6,21 @@ This is a copy of the core generator adjusted to use hr_app/data by default.
 """
 from __future__ import annotations
 
+import hashlib
 import json
 import os
-from calibration import load_calibrator, apply_calibration
-from datetime import datetime
-from typing import Dict, List, Tuple, Optional
-import unicodedata
+from calibration import load_calibrator, apply_calibration, apply_calibration_array
+from data_catalog import get_catalog
+from file_memo import file_version
+from h2h_index import H2HIndex, load_h2h_index, load_legacy_h2h
+from identity import IDENTITY_FILE, IdentityMap, alias_keys, id_key, load_identity, norm_name_key, norm_name_simple
+from schedule_index import Schedule, load_schedule
+from scores_store import load_scores, output_format as _output_format, save_scores, scores_path as _scores_path
+from scoring_config import ScoringConfig, from_env as config_from_env, parse_set_args, resolve_config
+import dataclasses
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Tuple, Optional
 import re
 import math
 
@@ -54,18 +63,6 @@ ROOFED_VENUES = {
     'Miller Park',  # historical name of American Family Field
 }
 
-# Fallback mapping from full team names (as provided by MLB schedule) to abbreviations
-TEAM_NAME_TO_ABBR = {
-    'Arizona Diamondbacks': 'ARI', 'Atlanta Braves': 'ATL', 'Baltimore Orioles': 'BAL', 'Boston Red Sox': 'BOS',
-    'Chicago Cubs': 'CHC', 'Chicago White Sox': 'CWS', 'Cincinnati Reds': 'CIN', 'Cleveland Guardians': 'CLE',
-    'Colorado Rockies': 'COL', 'Detroit Tigers': 'DET', 'Houston Astros': 'HOU', 'Kansas City Royals': 'KC',
-    'Los Angeles Angels': 'LAA', 'Los Angeles Dodgers': 'LAD', 'Miami Marlins': 'MIA', 'Milwaukee Brewers': 'MIL',
-    'Minnesota Twins': 'MIN', 'New York Mets': 'NYM', 'New York Yankees': 'NYY', 'Oakland Athletics': 'OAK',
-    'Philadelphia Phillies': 'PHI', 'Pittsburgh Pirates': 'PIT', 'San Diego Padres': 'SD', 'Seattle Mariners': 'SEA',
-    'San Francisco Giants': 'SF', 'St. Louis Cardinals': 'STL', 'Tampa Bay Rays': 'TB', 'Texas Rangers': 'TEX',
-    'Toronto Blue Jays': 'TOR', 'Washington Nationals': 'WSH'
-}
-
 
 def _norm_team(abbr: Optional[str]) -> Optional[str]:
     if not abbr:
@@ -90,35 +87,12 @@ def _find_park_key(team_abbr: Optional[str], park_factors: dict, weather_conditi
 
 
 def _norm_name_simple(n: str) -> str:
-    if not n:
-        return ''
-    s = unicodedata.normalize('NFKD', str(n)).encode('ascii', 'ignore').decode('ascii')
-    s = s.lower().strip()
-    s = re.sub(r"\b(jr|sr|ii|iii|iv|v)\b", "", s)
-    s = re.sub(r"[^a-z0-9\s]", "", s)
-    s = re.sub(r"\s+", " ", s)
-    return s.strip()
+    return norm_name_simple(n)
 
 
 def _norm_name_key(n: str) -> str:
-    """Normalize a player's name for cross-source matching.
-    - Strip anything after '/' (e.g., "Name/Team").
-    - Remove trailing team in parentheses.
-    - Lowercase, remove punctuation, compress spaces.
-    """
-    if not n:
-        return ''
-    s = unicodedata.normalize('NFKD', str(n)).encode('ascii', 'ignore').decode('ascii')
-    s = s.strip()
-    if '/' in s:
-        s = s.split('/', 1)[0].strip()
-    s = re.sub(r"\s*\([A-Z]{2,4}\)$", '', s)
-    s = s.lower()
-    s = re.sub(r"[\.'’`-]", ' ', s)
-    s = re.sub(r"\s+", ' ', s).strip()
-    # Drop jr/sr/roman suffix
-    s = re.sub(r"\s+(jr|sr|ii|iii|iv|v)\b\.?$", '', s)
-    return s
+    """Normalize a player's name for cross-source matching (memoized; see identity.norm_name_key)."""
+    return norm_name_key(n)
 
 
 def _logit(p: float) -> float:
@@ -133,34 +107,16 @@ def _sigmoid(z: float) -> float:
         return 0.0 if z < 0 else 1.0
 
 
-def _list_data_files(prefix: str) -> List[str]:
-    try:
-        return sorted([f for f in os.listdir(DATA_DIR) if f.startswith(prefix)], reverse=True)
-    except FileNotFoundError:
-        return []
-
-
 def _pick_dated_file(prefix: str, date_str: str) -> Tuple[str, str]:
-    desired = f"{prefix}{date_str}.json"
-    path = os.path.join(DATA_DIR, desired)
-    if os.path.exists(path):
-        return path, date_str
-    candidates = _list_data_files(prefix)
-    for f in candidates:
-        if f.endswith('.json'):
-            return os.path.join(DATA_DIR, f), f[len(prefix):-5]
-    raise FileNotFoundError(f"No data files found for prefix '{prefix}'")
+    """File for the date, else the newest earlier one; never a later date's file."""
+    path, found = get_catalog(DATA_DIR).pick(prefix, date_str)
+    if path is None:
+        raise FileNotFoundError(f"No data files found for prefix '{prefix}' on or before {date_str}")
+    return path, found
 
 
 def _pick_dated_file_optional(prefix: str, date_str: str) -> Tuple[Optional[str], Optional[str]]:
-    desired = os.path.join(DATA_DIR, f"{prefix}{date_str}.json")
-    if os.path.exists(desired):
-        return desired, date_str
-    candidates = _list_data_files(prefix)
-    for f in candidates:
-        if f.endswith('.json'):
-            return os.path.join(DATA_DIR, f), f[len(prefix):-5]
-    return None, None
+    return get_catalog(DATA_DIR).pick(prefix, date_str)
 
 
 def _safe_float(value, default: float = 0.0) -> float:
@@ -215,10 +171,11 @@ def _index_player_odds(odds_json: Optional[dict]) -> Tuple[Dict[str, float], Opt
     return out, odds_json.get('source')
 
 
-def _index_recent_form(recent: dict) -> Dict[str, float]:
+def _index_recent_form(recent: dict, by_id: bool = False) -> Dict:
+    """Name (or, with by_id, MLBAM id) -> recent HR rate."""
     idx = {}
     for p in recent.get('players', []):
-        n = p.get('name')
+        n = id_key(p.get('mlbam_id')) if by_id else p.get('name')
         if n:
             # Accept explicit rate or fallback to HR count over last 14 days
             if p.get('last_14_day_hr_rate') is not None:
@@ -235,10 +192,10 @@ def _index_recent_form(recent: dict) -> Dict[str, float]:
     return idx
 
 
-def _index_pitchers(pitchers: dict) -> Dict[str, dict]:
+def _index_pitchers(pitchers: dict, by_id: bool = False) -> Dict:
     idx = {}
     for p in pitchers.get('pitchers', []):
-        name = p.get('name')
+        name = id_key(p.get('mlbam_id')) if by_id else p.get('name')
         if not name:
             continue
         current = idx.get(name)
@@ -256,29 +213,6 @@ def _index_statcast(metrics: dict) -> Dict[str, dict]:
     return metrics.get('metrics', {}) if metrics else {}
 
 
-def _load_h2h_js_optional(path: str) -> Dict[str, Dict[str, dict]]:
-    try:
-        with open(path, 'r', encoding='utf-8') as f:
-            txt = f.read()
-        marker = 'const hitterVsPitcherData ='
-        i = txt.find(marker)
-        if i == -1:
-            return {}
-        body = txt[i + len(marker):].strip()
-        if body.endswith(';'):
-            body = body[:-1]
-        body = re.sub(r"//.*", "", body)
-        body = re.sub(r"/\*[\s\S]*?\*/", "", body)
-        start = body.find('{')
-        end = body.rfind('}')
-        if start == -1 or end == -1:
-            return {}
-        json_like = body[start:end+1]
-        return json.loads(json_like)
-    except Exception:
-        return {}
-
-
 def _index_pitcher_advanced(data: Optional[dict]) -> Dict[str, dict]:
     if not data:
         return {}
@@ -313,24 +247,6 @@ def _index_pitch_type(data: Optional[dict]):
     return pit, bat
 
 
-def _index_bullpen(data: Optional[dict]):
-    if not data:
-        return {}, {}
-    bp = {}
-    starters = {}
-    for t, bd in (data.get('bullpens') or {}).items():
-        try:
-            bp[_norm_team(t)] = float(bd.get('hr9'))
-        except Exception:
-            continue
-    for n, sd in (data.get('starters') or {}).items():
-        try:
-            starters[n] = float(sd.get('expected_ip'))
-        except Exception:
-            continue
-    return bp, starters
-
-
 def _index_implied(data: Optional[dict]) -> Dict[str, float]:
     if not data:
         return {}
@@ -355,7 +271,7 @@ def _index_implied(data: Optional[dict]) -> Dict[str, float]:
     return out
 
 
-def _park_weather_factor(ballpark: dict, weather: dict) -> float:
+def _park_weather_factor(ballpark: dict, weather: dict, clamp_min: float = 0.9, clamp_max: float = 1.1) -> float:
     if not ballpark and not weather:
         return 1.0
     hr_factor = float(ballpark.get('hr_factor', 1.0)) if ballpark else 1.0
@@ -375,277 +291,350 @@ def _park_weather_factor(ballpark: dict, weather: dict) -> float:
             bonus += 0.02
         elif temp <= 55:
             bonus -= 0.02
-    # Allow env-tunable clamp range
-    try:
-        clamp_min = float(os.getenv('PARK_CLAMP_MIN', '0.9'))
-    except Exception:
-        clamp_min = 0.9
-    try:
-        clamp_max = float(os.getenv('PARK_CLAMP_MAX', '1.1'))
-    except Exception:
-        clamp_max = 1.1
     return max(clamp_min, min(clamp_max, hr_factor * (1.0 + bonus)))
 
 
-def _compute_scores(date_str: Optional[str] = None) -> Dict:
-    target_date = date_str or datetime.now().strftime('%Y-%m-%d')
+PA_MULTIPLIER_BY_SLOT = {1: 1.08, 2: 1.06, 3: 1.05, 4: 1.04, 5: 1.03, 6: 1.02, 7: 1.01, 8: 1.00, 9: 0.99}
 
-    player_path, players_date = _pick_dated_file('player-stats-', target_date)
-    pitcher_path, pitchers_date = _pick_dated_file('pitcher-stats-', target_date)
-    recent_path, recent_date = _pick_dated_file('recent-performance-', target_date)
 
-    alt_sched = os.path.join(DATA_DIR, 'todays-schedule.json')
-    use_todays = False
-    if os.path.exists(alt_sched):
-        try:
-            ts = _load_json(alt_sched)
-            ts_date = None
-            if isinstance(ts.get('dates'), list) and ts['dates']:
-                ts_date = ts['dates'][0].get('date')
-            if ts_date == target_date:
-                schedule_path = alt_sched
-                schedule_date = ts_date
-                use_todays = True
-        except Exception:
-            pass
-    if not use_todays:
-        try:
-            schedule_path, schedule_date = _pick_dated_file('fresh-schedule-', target_date)
-        except FileNotFoundError:
-            if os.path.exists(alt_sched):
-                schedule_path = alt_sched
-                try:
-                    schedule_date = ts_date or target_date
-                except Exception:
-                    schedule_date = target_date
-            else:
-                raise
+def _park_multiplier(park_team: Optional[str], park_factors: dict, weather_conditions: dict,
+                     config: ScoringConfig) -> Tuple[float, float]:
+    """(park/weather factor, multiplier applied to the score) for a game played at park_team."""
+    park_key = _find_park_key(park_team, park_factors, weather_conditions) if park_team else None
+    park_factor = _park_weather_factor(
+        (park_factors.get(park_key) if park_key else {}),
+        (weather_conditions.get(park_key) if park_key else {}),
+        config.park_clamp_min, config.park_clamp_max
+    )
+    # Apply multiplicatively with exponent k
+    return park_factor, max(0.5, min(1.5, (park_factor ** config.park_exponent)))
 
-    try:
-        statcast_path, statcast_date = _pick_dated_file('statcast-metrics-', target_date)
-    except FileNotFoundError:
-        statcast_path = os.path.join(DATA_DIR, 'statcast-metrics.json')
-        statcast_date = _load_json(statcast_path).get('date', 'unknown') if os.path.exists(statcast_path) else 'unknown'
 
-    try:
-        ballpark_path, bw_date = _pick_dated_file('ballpark-weather-', target_date)
-        ballpark_data = _load_json(ballpark_path)
-    except FileNotFoundError:
-        ballpark_data = {}
+def _opp_pitcher_by_team(schedule: Schedule, resolve: Callable) -> Dict[str, dict]:
+    """team -> opposing probable pitcher, home flag and opponent.
 
-    players_data = _load_json(player_path)
-    pitchers_data = _load_json(pitcher_path)
-    recent_data = _load_json(recent_path)
-    schedule = _load_json(schedule_path)
-    statcast = _load_json(statcast_path) if os.path.exists(statcast_path) else {}
+    Games are walked in schedule order, so a team playing a doubleheader gets
+    its later game.
+    """
+    out = {}
+    for game in schedule.games:
+        if not game.home or not game.away:
+            continue
+        for team, opp_team, is_home, opp_p, opp_pid in (
+                (game.home, game.away, True, game.away_pitcher, game.away_pitcher_id),
+                (game.away, game.home, False, game.home_pitcher, game.home_pitcher_id)):
+            opp_pid = id_key(opp_pid) or resolve(opp_p)
+            out[team] = {'opp_pitcher': opp_p or 'TBD', 'opp_pitcher_id': opp_pid, 'home': is_home, 'opp_team': opp_team}
+    return out
 
-    try:
-        p_adv_path, _ = _pick_dated_file_optional('pitcher-advanced-', target_date)
-        pitcher_adv = _load_json(p_adv_path) if p_adv_path else None
-    except Exception:
-        pitcher_adv = None
-    try:
-        pitch_type_path, _ = _pick_dated_file_optional('pitch-type-metrics-', target_date)
-        pitch_type_data = _load_json(pitch_type_path) if pitch_type_path else None
-    except Exception:
-        pitch_type_data = None
-    try:
-        bullpen_path, _ = _pick_dated_file_optional('bullpen-metrics-', target_date)
-        bullpen_data = _load_json(bullpen_path) if bullpen_path else None
-    except Exception:
-        bullpen_data = None
-    try:
-        implied_path, _ = _pick_dated_file_optional('implied-totals-', target_date)
-        implied_data = _load_json(implied_path) if implied_path else None
-    except Exception:
-        implied_data = None
-    try:
-        lineups_path, _ = _pick_dated_file_optional('lineups-', target_date)
-        lineups_data = _load_json(lineups_path) if lineups_path else None
-    except Exception:
-        lineups_data = None
 
-    recent_idx = _index_recent_form(recent_data)
-    pitcher_idx = _index_pitchers(pitchers_data)
-    statcast_idx = _index_statcast(statcast)
-    h2h_idx = _load_h2h_js_optional(os.path.join(DATA_DIR, 'hitter-vs-pitcher.js'))
-    pitcher_adv_idx = _index_pitcher_advanced(pitcher_adv)
-    pitcher_top_pitches_idx, batter_xslg_by_pitch_idx = _index_pitch_type(pitch_type_data)
-    bullpen_hr9_by_team, starter_expected_ip = _index_bullpen(bullpen_data)
-    implied_by_team = _index_implied(implied_data)
+def _park_team(opp_pitcher_by_team: dict, team: Optional[str]) -> Optional[str]:
+    """Park a hitter's game is scored at: the team's own when at home; away hitters get a neutral park."""
+    return team if (opp_pitcher_by_team.get(team) or {}).get('home') else None
 
-    # Optional player HR odds for market blend
-    try:
-        player_odds_path, _ = _pick_dated_file_optional('player-hr-odds-', target_date)
-        player_odds_json = _load_json(player_odds_path) if player_odds_path else None
-    except Exception:
-        player_odds_json = None
-    player_odds_map, player_odds_source = _index_player_odds(player_odds_json)
 
-    lineup_slot_by_player = {}
-    lineup_slot_by_norm_player = {}
-    if lineups_data and isinstance(lineups_data.get('lineups'), dict):
-        for team_abbr, entries in (lineups_data.get('lineups') or {}).items():
-            t = _norm_team(team_abbr)
-            if not t:
+def _finalize_score(base: float, park_mult: float, market_factor: float, pa_multiplier: float,
+                    p_market: Optional[float], config: ScoringConfig) -> Tuple[float, float]:
+    """Apply park, market and lineup multipliers, then the optional market blend, to a base score.
+
+    p_market is the hitter's market HR probability when the blend applies, else None.
+    Returns (published one-decimal score, blend delta in points).
+    """
+    # First apply park multiplier, then market, then lineup slot
+    hr_score = base * park_mult
+    hr_score = hr_score * market_factor
+    hr_score = hr_score * pa_multiplier
+    blend_delta = 0.0
+    if p_market is not None:
+        alpha = config.market_alpha
+        p_model_prob = max(0.01, min(0.99, hr_score / 100.0))
+        z_blend = (1.0 - alpha) * _logit(p_model_prob) + alpha * _logit(max(0.01, min(0.99, float(p_market))))
+        score_blend = _sigmoid(z_blend) * 100.0
+        cap_pts = config.player_market_blend_cap
+        blend_delta = max(-cap_pts, min(cap_pts, score_blend - hr_score))
+        hr_score = hr_score + blend_delta
+    return max(0.0, min(100.0, round(hr_score, 1))), blend_delta
+
+
+def _h2h_bonus(rec: Optional[dict], player_slg: float) -> float:
+    """Small bounded bump if batter has strong SLG/HR history vs the pitcher."""
+    if not rec or not isinstance(rec, dict):
+        return 0.0
+    pa = int(rec.get('pa') or 0)
+    hr = int(rec.get('hr') or 0)
+    h2h_slg = _safe_float(rec.get('slg'))
+    # Only consider if sample is non-trivial
+    if pa < 3:
+        return 0.0
+    # Compare to player's baseline SLG
+    baseline = player_slg if player_slg > 0 else 0.0
+    delta = max(0.0, h2h_slg - baseline)
+    # Weight: scale with log(PA) and add extra for HRs
+    weight = min(1.0, (0.2 + 0.15 * min(3.0, (pa / 6.0))) + 0.1 * min(2, hr))
+    return min(2.0, delta * 10.0 * weight)
+
+
+def _pitch_weights(top_pitches: List[dict]) -> List[Tuple[str, float]]:
+    """(pitch type, weight) for each of a pitcher's top pitches that names its type."""
+    out = []
+    for entry in top_pitches:
+        ptype = entry.get('type')
+        if not ptype:
+            continue
+        usage = _safe_float(entry.get('usage')) / 100.0
+        hr100 = _safe_float(entry.get('hr_per_100'))
+        weight = max(0.0, min(1.0, usage)) * (1.0 + min(0.5, hr100 / 3.0) if hr100 > 0 else 1.0)
+        out.append((ptype, weight))
+    return out
+
+
+def _pitchtype_bonus(top_pitches: List[dict], xslg_by_pitch: dict, sc: dict, slg: float) -> float:
+    sc_xslg = _safe_float(sc.get('xslg')) if sc else 0.0
+    baseline = sc_xslg if sc_xslg > 0 else slg
+    agg = 0.0
+    if xslg_by_pitch:
+        for ptype, weight in _pitch_weights(top_pitches):
+            batter_vs = _safe_float(xslg_by_pitch.get(ptype))
+            if batter_vs <= 0 or baseline <= 0:
                 continue
-            for e in entries:
-                n = (e.get('name') or '').strip()
-                try:
-                    slot = int(e.get('slot'))
-                except Exception:
-                    slot = None
-                if n and slot:
-                    lineup_slot_by_player[(t, n)] = slot
-                    lineup_slot_by_norm_player[(t, _norm_name_simple(n))] = slot
-
-    opp_pitcher_by_team = {}
-    games = schedule.get('games') or schedule.get('dates', [{}])[0].get('games', [])
-    for g in games:
-        teams_obj = g.get('teams') or {}
-        home_abbr = None
-        away_abbr = None
-        if 'home_team' in g and 'away_team' in g:
-            home_abbr = _norm_team(g.get('home_team'))
-            away_abbr = _norm_team(g.get('away_team'))
-        elif teams_obj:
-            try:
-                home_team = teams_obj.get('home', {}).get('team', {})
-                away_team = teams_obj.get('away', {}).get('team', {})
-                # Try multiple fields and fallback to full-name mapping
-                def team_to_abbr(tobj: dict) -> Optional[str]:
-                    ab = tobj.get('abbreviation') or tobj.get('triCode') or tobj.get('teamCode')
-                    if not ab:
-                        nm = tobj.get('name') or tobj.get('teamName') or tobj.get('shortName')
-                        ab = TEAM_NAME_TO_ABBR.get(nm or '', None)
-                    return _norm_team(ab) if ab else None
-                home_abbr = team_to_abbr(home_team)
-                away_abbr = team_to_abbr(away_team)
-            except Exception:
-                pass
-        home_p = (g.get('home_pitcher') or {}).get('name')
-        away_p = (g.get('away_pitcher') or {}).get('name')
-        if not home_p or not away_p:
-            pp = g.get('probablePitchers') or {}
-            hp = pp.get('home') or {}
-            ap = pp.get('away') or {}
-            home_p = home_p or hp.get('fullName') or hp.get('name')
-            away_p = away_p or ap.get('fullName') or ap.get('name')
-        if (not home_p or not away_p) and teams_obj:
-            try:
-                hp = teams_obj.get('home', {}).get('probablePitcher') or {}
-                ap = teams_obj.get('away', {}).get('probablePitcher') or {}
-                home_p = home_p or hp.get('fullName') or hp.get('lastFirstName') or hp.get('name')
-                away_p = away_p or ap.get('fullName') or ap.get('lastFirstName') or ap.get('name')
-            except Exception:
-                pass
-        home = home_abbr
-        away = away_abbr
-        if home and away:
-            opp_pitcher_by_team[home] = {'opp_pitcher': away_p or 'TBD', 'home': True, 'opp_team': away}
-            opp_pitcher_by_team[away] = {'opp_pitcher': home_p or 'TBD', 'home': False, 'opp_team': home}
+            delta = batter_vs - baseline
+            agg += max(0.0, delta) * weight
+    else:
+        # Fallback: slight bonus based primarily on pitcher's top pitch usage
+        for entry in top_pitches:
+            usage = _safe_float(entry.get('usage')) / 100.0
+            # Without batter xSLG-by-pitch or HR/100, give a tiny usage-based boost
+            agg += max(0.0, min(1.0, usage)) * 0.05
+    if agg > 0:
+        return max(0.0, min(3.0, agg * 6.0))
+    return 0.0
+
+
+def _player_row(p: dict, name: str, team: str, hr_score: float, model_prob_cal: float, model_prob_raw: float,
+                calibrator: Optional[dict], calib_method: Optional[str], season_hr: int, iso: float,
+                opp_name: Optional[str], p_era, p_hr_allowed, factors: dict) -> dict:
+    return {
+        'name': name,
+        'team': team,
+        'mlbam_id': id_key(p.get('mlbam_id')),
+        'position': p.get('position') or 'Unknown',
+        'hr_score': hr_score,
+        'homer_likelihood_score': hr_score,
+        'model_prob': round(model_prob_cal, 5),
+        'model_prob_raw': round(model_prob_raw, 5) if calibrator else None,
+        'calibration_method': calib_method if calibrator else None,
+        'stats': {
+            'homeRuns': season_hr,
+            'battingAvg': _safe_float(p.get('battingAvg')),
+            'slugging': _safe_float(p.get('sluggingPerc')),
+            'iso': round(iso, 3)
+        },
+        'opposing_pitcher': opp_name or 'TBD',
+        'pitcher_era': p_era if p_era is not None else None,
+        'pitcher_hr_allowed': p_hr_allowed if p_hr_allowed is not None else None,
+        'factors': factors
+    }
 
-    park_factors = (ballpark_data or {}).get('ballpark_factors', {})
-    weather_conditions = (ballpark_data or {}).get('weather_conditions', {})
 
-    adv_barrels, adv_hrfb, adv_fbpct, adv_vshand_vals = [], [], [], []
-    for pi in pitcher_adv_idx.values():
-        if pi.get('barrel_rate_allowed') is not None:
-            adv_barrels.append(float(pi.get('barrel_rate_allowed')))
-        if pi.get('hr_fb') is not None:
-            adv_hrfb.append(float(pi.get('hr_fb')))
-        if pi.get('fb_pct') is not None:
-            adv_fbpct.append(float(pi.get('fb_pct')))
-        for hand_key in ('vsR', 'vsL'):
-            h = pi.get(hand_key) or {}
-            v = h.get('xslg') or h.get('hr_per_pa')
-            if v is not None:
-                try:
-                    adv_vshand_vals.append(float(v))
-                except Exception:
-                    pass
-    adv_barrels_norm = _normalize(adv_barrels) if adv_barrels else {}
-    adv_hrfb_norm = _normalize(adv_hrfb) if adv_hrfb else {}
-    adv_fbpct_norm = _normalize(adv_fbpct) if adv_fbpct else {}
-    adv_vshand_norm = _normalize(adv_vshand_vals) if adv_vshand_vals else {}
+def _vs_hand_value(adv: Optional[dict], batter_hand: str) -> Optional[float]:
+    if not adv:
+        return None
+    if batter_hand == 'R' and (adv.get('vsR') or {}).get('xslg') is not None:
+        return float(adv['vsR']['xslg'])
+    if batter_hand == 'L' and (adv.get('vsL') or {}).get('xslg') is not None:
+        return float(adv['vsL']['xslg'])
+    if batter_hand == 'R' and (adv.get('vsR') or {}).get('hr_per_pa') is not None:
+        return float(adv['vsR']['hr_per_pa'])
+    if batter_hand == 'L' and (adv.get('vsL') or {}).get('hr_per_pa') is not None:
+        return float(adv['vsL']['hr_per_pa'])
+    return None
+
+
+@dataclass
+class SlateContext:
+    """Per-date tables, built once so scoring a hitter is a dict lookup.
+
+    ``pitchers`` maps each probable pitcher name (as it appears in the schedule)
+    to its components: ERA/HR-allowed scores, the starter composite per batter
+    hand and the raw ERA/HR values echoed in the output. The remaining fields are
+    the hitter-side indexes both scoring engines read.
+
+    Name-keyed sources are also joined to MLBAM ids once per slate (``*_by_id``);
+    the ``*_for`` lookups try the id first and fall back to the source's name key.
+    """
+    pitchers: Dict[str, dict] = field(default_factory=dict)
+    hitters: List[dict] = field(default_factory=list)
+    statcast: Dict[str, dict] = field(default_factory=dict)
+    recent: Dict[str, float] = field(default_factory=dict)
+    opp_pitcher_by_team: Dict[str, dict] = field(default_factory=dict)
+    schedule: Schedule = field(default_factory=Schedule)
+    park_factors: Dict[str, dict] = field(default_factory=dict)
+    weather_conditions: Dict[str, dict] = field(default_factory=dict)
+    h2h: Optional[H2HIndex] = None
+    pitcher_top_pitches: Dict[str, list] = field(default_factory=dict)
+    batter_xslg_by_pitch: Dict[str, dict] = field(default_factory=dict)
+    market_scaler_by_team: Dict[str, float] = field(default_factory=dict)
+    lineup_slot_by_player: Dict[tuple, int] = field(default_factory=dict)
+    lineup_slot_by_norm_player: Dict[tuple, int] = field(default_factory=dict)
+    player_odds_map: Dict[str, float] = field(default_factory=dict)
+    calibrator: Optional[dict] = None
+    statcast_by_id: Dict[int, dict] = field(default_factory=dict)
+    recent_by_id: Dict[int, float] = field(default_factory=dict)
+    pitcher_top_pitches_by_id: Dict[int, list] = field(default_factory=dict)
+    batter_xslg_by_id: Dict[int, dict] = field(default_factory=dict)
+    lineup_slot_by_id: Dict[int, int] = field(default_factory=dict)
+    player_odds_by_id: Dict[int, float] = field(default_factory=dict)
+    implied_by_team: Dict[str, float] = field(default_factory=dict)
+    teams_today: set = field(default_factory=set)
+    date: Optional[str] = None
+    source_dates: Dict[str, Optional[str]] = field(default_factory=dict)
+    inputs: Dict[str, tuple] = field(default_factory=dict)
+    lineup_entries: List[tuple] = field(default_factory=list)
+
+    def statcast_for(self, pid: Optional[int], name: str) -> dict:
+        sc = self.statcast_by_id.get(pid) if pid is not None else None
+        return sc if sc is not None else self.statcast.get(name, {})
+
+    def recent_for(self, pid: Optional[int], name: str) -> float:
+        rate = self.recent_by_id.get(pid) if pid is not None else None
+        return float(rate if rate is not None else self.recent.get(name, 0.0))
+
+    def top_pitches_for(self, pid: Optional[int], name: str) -> list:
+        tp = self.pitcher_top_pitches_by_id.get(pid) if pid is not None else None
+        return tp if tp is not None else (self.pitcher_top_pitches.get(name) or [])
+
+    def xslg_for(self, pid: Optional[int], name: str) -> dict:
+        xs = self.batter_xslg_by_id.get(pid) if pid is not None else None
+        return xs if xs is not None else (self.batter_xslg_by_pitch.get(name) or {})
+
+    def lineup_slot_for(self, pid: Optional[int], team: str, name: str) -> Optional[int]:
+        slot = self.lineup_slot_by_id.get(pid) if pid is not None else None
+        if not slot:
+            slot = self.lineup_slot_by_player.get((team, name))
+        if not slot:
+            slot = self.lineup_slot_by_norm_player.get((team, _norm_name_simple(name)))
+        return slot
+
+    def market_prob_for(self, pid: Optional[int], name: str) -> Optional[float]:
+        pm = self.player_odds_by_id.get(pid) if pid is not None else None
+        return pm if pm is not None else self.player_odds_map.get(_norm_name_key(name))
+
+    def pitcher(self, name: Optional[str]) -> Optional[dict]:
+        return self.pitchers.get(name) if name else None
+
+    def pitcher_comp(self, name: Optional[str], batter_hand: str) -> float:
+        comp = self.pitcher(name)
+        if comp is None:
+            return 50.0
+        by_hand = comp['starter_comp']
+        return by_hand.get(batter_hand, by_hand[''])
+
+
+def _index_by_alias(idx: Dict[str, dict]) -> Dict[str, dict]:
+    """Name-keyed index re-keyed by every normalized spelling of each name (first name wins)."""
+    out: Dict[str, dict] = {}
+    for name, row in idx.items():
+        for key in alias_keys(name):
+            out.setdefault(key, row)
+    return out
 
-    bullpen_hr9_by_team_norm = {}
-    bullpen_hr9_by_team = {}
-    
-    bullpen_hr9_by_team_norm = _normalize(list(bullpen_hr9_by_team.values())) if bullpen_hr9_by_team else {}
 
-    teams_today = set()
-    for k, v in opp_pitcher_by_team.items():
-        teams_today.add(k)
-        if v.get('opp_team'):
-            teams_today.add(v['opp_team'])
-    implied_vals_today = [implied_by_team.get(t) for t in teams_today if implied_by_team.get(t) is not None]
-    market_scaler_by_team = {}
-    # Market scaling range (tightened by default), env-tunable
-    try:
-        market_lo = float(os.getenv('MARKET_SCALE_MIN', '0.99'))
-    except Exception:
-        market_lo = 0.99
-    try:
-        market_hi = float(os.getenv('MARKET_SCALE_MAX', '1.03'))
-    except Exception:
-        market_hi = 1.03
-    market_lo, market_hi = max(0.9, min(market_lo, market_hi)), max(market_lo, market_hi)
-    # If implied totals provide no real differentiation (all equal), neutralize scaling
-    if implied_vals_today and not (len(set(round(v, 3) for v in implied_vals_today)) == 1):
-        lo = min(implied_vals_today)
-        hi = max(implied_vals_today)
-        span = hi - lo if hi > lo else 1.0
-        for t in teams_today:
-            v = implied_by_team.get(t)
-            if v is None:
-                market_scaler_by_team[t] = 1.0
-            else:
-                norm01 = (v - lo) / span
-                market_scaler_by_team[t] = market_lo + (market_hi - market_lo) * max(0.0, min(1.0, norm01))
-    else:
-        for t in teams_today:
-            market_scaler_by_team[t] = 1.0
+def _alias_lookup(by_alias: Dict[str, dict], name: Optional[str]) -> Optional[dict]:
+    """Row for name when it differs from the index's spelling only in accents, punctuation or suffix."""
+    for key in (norm_name_key(name), norm_name_simple(name)):
+        if key and key in by_alias:
+            return by_alias[key]
+    return None
 
-    hitters = players_data.get('players') or []
-    season_hrs, iso_vals, slg_vals, ev_vals, brl_vals = [], [], [], [], []
-    filtered_hitters = []
-    for p in hitters:
-        pos = (p.get('position') or '').lower()
-        if 'pitch' in pos:
+
+def _build_slate_context(opp_pitcher_by_team: Dict[str, dict], pitcher_idx: Dict[str, dict],
+                         pitcher_adv_idx: Dict[str, dict], pitcher_by_id: Optional[Dict[int, dict]] = None,
+                         pitcher_adv_by_id: Optional[Dict[int, dict]] = None) -> SlateContext:
+    ctx = SlateContext()
+    pitcher_by_id = pitcher_by_id or {}
+    pitcher_adv_by_id = pitcher_adv_by_id or {}
+    pitcher_eras = [pi.get('era_f', 0.0) for pi in pitcher_idx.values()]
+    pitcher_hrs = [pi.get('hr_allowed_i', 0) for pi in pitcher_idx.values()]
+    era_norm = _normalize(pitcher_eras)
+    hr_allowed_norm = _normalize(pitcher_hrs)
+    pitcher_by_alias = _index_by_alias(pitcher_idx)
+    pitcher_adv_by_alias = _index_by_alias(pitcher_adv_idx)
+    for info in opp_pitcher_by_team.values():
+        opp_name = info.get('opp_pitcher') or 'TBD'
+        if opp_name in ctx.pitchers:
             continue
-        filtered_hitters.append(p)
+        opp_pid = info.get('opp_pitcher_id')
+        opp_pi = pitcher_by_id.get(opp_pid) if opp_pid is not None else None
+        if opp_pi is None:
+            opp_pi = pitcher_idx.get(opp_name) or _alias_lookup(pitcher_by_alias, opp_name)
+        if not opp_pi:
+            continue
+        p_era = opp_pi.get('era_f')
+        p_hr_allowed = opp_pi.get('hr_allowed_i')
+        e_score = era_norm.get(p_era, 50.0) if p_era is not None else 50.0
+        h_score = hr_allowed_norm.get(p_hr_allowed, 50.0) if p_hr_allowed is not None else 50.0
+        adv = pitcher_adv_by_id.get(opp_pid) if opp_pid is not None else None
+        if adv is None:
+            adv = pitcher_adv_idx.get(opp_name) or _alias_lookup(pitcher_adv_by_alias, opp_name)
+        barrel_score = 50.0
+        hrfb_score = 50.0
+        fbpct_score = 50.0
+        starter_comp = {}
+        for hand in ('R', 'L', ''):
+            vhand_val = _vs_hand_value(adv, hand)
+            vhand_score = _normalize([vhand_val] if vhand_val is not None else [50.0]).get(vhand_val, 50.0)
+            starter_comp[hand] = (
+                0.35 * e_score +
+                0.25 * h_score +
+                0.15 * barrel_score +
+                0.10 * hrfb_score +
+                0.05 * fbpct_score +
+                0.10 * vhand_score
+            )
+        ctx.pitchers[opp_name] = {
+            'era': p_era,
+            'hr_allowed': p_hr_allowed,
+            'era_score': e_score,
+            'hr_allowed_score': h_score,
+            'starter_comp': starter_comp,
+        }
+    return ctx
+
+
+def _normalized_hitter_tables(slate: SlateContext):
+    season_hrs, iso_vals, slg_vals, ev_vals, brl_vals = [], [], [], [], []
+    for p in slate.hitters:
         season_hrs.append(int(p.get('homeRuns') or 0))
         ba = _safe_float(p.get('battingAvg'))
         slg = _safe_float(p.get('sluggingPerc'))
         iso = max(0.0, slg - ba)
         slg_vals.append(slg)
         iso_vals.append(iso)
-        sc = statcast_idx.get(p.get('name') or '', {})
+        sc = slate.statcast_for(id_key(p.get('mlbam_id')), p.get('name') or '')
         ev_vals.append(_safe_float(sc.get('exit_velocity')))
         brl_vals.append(_safe_float(sc.get('barrel_rate')))
+    return (_normalize(season_hrs), _normalize(iso_vals), _normalize(slg_vals),
+            _normalize(ev_vals), _normalize(brl_vals))
 
-    season_hr_norm = _normalize(season_hrs)
-    iso_norm = _normalize(iso_vals)
-    slg_norm = _normalize(slg_vals)
-    ev_norm = _normalize(ev_vals)
-    brl_norm = _normalize(brl_vals)
 
-    pitcher_eras = [pi.get('era_f', 0.0) for pi in pitcher_idx.values() if pi.get('era_f') is not None]
-    pitcher_hrs = [pi.get('hr_allowed_i', 0) for pi in pitcher_idx.values()]
-    era_norm = _normalize(pitcher_eras) if pitcher_eras else {}
-    hr_allowed_norm = _normalize(pitcher_hrs) if pitcher_hrs else {}
-
-    results = []
+def _score_hitters_loop(slate: SlateContext, config: ScoringConfig, parts: Optional[list] = None) -> List[dict]:
+    """Reference engine: score one hitter at a time.
 
-    games = schedule.get('games') or schedule.get('dates', [{}])[0].get('games', [])
-
-    # Load calibration model if present
-    calib_path = os.getenv('CALIBRATION_FILE', os.path.join(DATA_DIR, 'model_calibration.json'))
-    calibrator = load_calibrator(calib_path)
+    When ``parts`` is given, each scored hitter's unrounded [name, team, id, base score,
+    park multiplier, market factor, PA multiplier, market prob] is appended to it.
+    """
+    season_hr_norm, iso_norm, slg_norm, ev_norm, brl_norm = _normalized_hitter_tables(slate)
+    opp_pitcher_by_team = slate.opp_pitcher_by_team
+    park_factors = slate.park_factors
+    weather_conditions = slate.weather_conditions
+    h2h_idx = slate.h2h or H2HIndex()
+    market_scaler_by_team = slate.market_scaler_by_team
+    player_odds_map = slate.player_odds_map
+    calibrator = slate.calibrator
     calib_method = calibrator.get('method') if calibrator else None
 
-    for p in filtered_hitters:
+    results = []
+    for p in slate.hitters:
         name = p.get('name')
         raw_team = p.get('team')
         team = _norm_team(raw_team)
@@ -653,13 +642,14 @@ def _compute_scores(date_str: Optional[str] = None) -> Dict:
             continue
         if team not in opp_pitcher_by_team:
             continue
+        pid = id_key(p.get('mlbam_id'))
 
         ba = _safe_float(p.get('battingAvg'))
         slg = _safe_float(p.get('sluggingPerc'))
         iso = max(0.0, slg - ba)
         season_hr = int(p.get('homeRuns') or 0)
-        recent_rate = float(recent_idx.get(name, 0.0))
-        sc = statcast_idx.get(name, {})
+        recent_rate = slate.recent_for(pid, name)
+        sc = slate.statcast_for(pid, name)
 
         power_comp = (
             0.28 * season_hr_norm.get(season_hr, 50.0) +
@@ -673,146 +663,27 @@ def _compute_scores(date_str: Optional[str] = None) -> Dict:
 
         opp_info = opp_pitcher_by_team.get(team, {})
         opp_name = opp_info.get('opp_pitcher') or 'TBD'
-        opp_team = opp_info.get('opp_team')
         p_era = None
         p_hr_allowed = None
         pitcher_comp = 50.0
-        opp_pi = None
-        if opp_name:
-            opp_pi = pitcher_idx.get(opp_name)
-            if opp_pi is None:
-                def _nn(n: str) -> str:
-                    s = n.lower().strip()
-                    s = re.sub(r"[\.'`-]", "", s)
-                    s = re.sub(r"\s+", " ", s)
-                    return s
-                norm_lookup = { _nn(k): k for k in pitcher_idx.keys() }
-                key = _nn(opp_name)
-                if key in norm_lookup:
-                    opp_pi = pitcher_idx.get(norm_lookup[key])
-        if opp_name and opp_pi:
-            p_era = opp_pi.get('era_f')
-            p_hr_allowed = opp_pi.get('hr_allowed_i')
-            e_score = _normalize([pi.get('era_f', 0.0) for pi in pitcher_idx.values()]).get(p_era, 50.0) if p_era is not None else 50.0
-            h_score = _normalize([pi.get('hr_allowed_i', 0) for pi in pitcher_idx.values()]).get(p_hr_allowed, 50.0) if p_hr_allowed is not None else 50.0
-            adv = pitcher_adv_idx.get(opp_name)
+        opp_comp = slate.pitcher(opp_name)
+        if opp_comp is not None:
+            p_era = opp_comp['era']
+            p_hr_allowed = opp_comp['hr_allowed']
             batter_hand = (p.get('bats') or p.get('batting_hand') or (p.get('battingSide') or {}).get('code') or '').upper()
-            vhand_val = None
-            if adv:
-                if batter_hand == 'R' and (adv.get('vsR') or {}).get('xslg') is not None:
-                    vhand_val = float(adv['vsR']['xslg'])
-                elif batter_hand == 'L' and (adv.get('vsL') or {}).get('xslg') is not None:
-                    vhand_val = float(adv['vsL']['xslg'])
-                elif batter_hand == 'R' and (adv.get('vsR') or {}).get('hr_per_pa') is not None:
-                    vhand_val = float(adv['vsR']['hr_per_pa'])
-                elif batter_hand == 'L' and (adv.get('vsL') or {}).get('hr_per_pa') is not None:
-                    vhand_val = float(adv['vsL']['hr_per_pa'])
-            vhand_score = _normalize([vhand_val] if vhand_val is not None else [50.0]).get(vhand_val, 50.0)
-            barrel_score = 50.0
-            hrfb_score = 50.0
-            fbpct_score = 50.0
-            pitcher_comp = (
-                0.35 * e_score +
-                0.25 * h_score +
-                0.15 * barrel_score +
-                0.10 * hrfb_score +
-                0.05 * fbpct_score +
-                0.10 * vhand_score
-            )
-            if opp_team:
-                bp_norm = None
-                exp_ip = 6.0
-                try:
-                    w_start = max(0.0, min(1.0, float(exp_ip) / 9.0))
-                except Exception:
-                    w_start = 0.7
-                if bp_norm is not None:
-                    pitcher_comp = w_start * pitcher_comp + (1.0 - w_start) * bp_norm
-
-        is_home = opp_info.get('home') is True
-        park_team = team if is_home else None
-        if not park_team:
-            for g in games:
-                teams_obj = g.get('teams') or {}
-                ht = _norm_team(g.get('home_team'))
-                at = _norm_team(g.get('away_team'))
-                if not ht or not at:
-                    if teams_obj:
-                        ht = _norm_team(teams_obj.get('home', {}).get('team', {}).get('abbreviation'))
-                        at = _norm_team(teams_obj.get('away', {}).get('team', {}).get('abbreviation'))
-                if ht and at and (team == ht or team == at):
-                    park_team = ht
-                    break
-        # Determine park key with alias support and compute park/weather factor
-        park_key = _find_park_key(park_team, park_factors, weather_conditions) if park_team else None
-        park_factor = _park_weather_factor(
-            (park_factors.get(park_key) if park_key else {}),
-            (weather_conditions.get(park_key) if park_key else {})
-        )
-        # Apply multiplicatively with exponent k (env-tunable)
-        try:
-            park_k = float(os.getenv('PARK_EXPONENT', '1.1'))
-        except Exception:
-            park_k = 1.1
-        park_mult = max(0.5, min(1.5, (park_factor ** park_k)))
+            pitcher_comp = slate.pitcher_comp(opp_name, batter_hand)
 
-        # H2H bonus: small bounded bump if batter has strong SLG/HR history vs the pitcher
-        h2h_bonus = 0.0
-        if opp_name and name:
-            try:
-                # Prefer dated JSON; fall back to JS map already loaded if needed
-                h2h_path, _ = _pick_dated_file_optional('hitter-vs-pitcher-', target_date)
-                h2h_json = _load_json(h2h_path) if h2h_path else None
-                h2h_map = (h2h_json.get('h2h') if isinstance(h2h_json, dict) else None) or {}
-            except Exception:
-                h2h_map = {}
-            rec = ((h2h_map.get(name) or {}).get(opp_name)) if h2h_map else None
-            if not rec and h2h_idx:
-                rec = ((h2h_idx.get(name) or {}).get(opp_name))
-            # Note: If needed, we could add normalized-name fallback here.
-            if rec and isinstance(rec, dict):
-                pa = int(rec.get('pa') or 0)
-                hr = int(rec.get('hr') or 0)
-                h2h_slg = _safe_float(rec.get('slg'))
-                # Only consider if sample is non-trivial
-                if pa >= 3:
-                    # Compare to player's baseline SLG
-                    player_slg = _safe_float(p.get('sluggingPerc'))
-                    baseline = player_slg if player_slg > 0 else 0.0
-                    delta = max(0.0, h2h_slg - baseline)
-                    # Weight: scale with log(PA) and add extra for HRs
-                    weight = min(1.0, (0.2 + 0.15 * min(3.0, (pa / 6.0))) + 0.1 * min(2, hr))
-                    h2h_bonus = min(2.0, delta * 10.0 * weight)
+        park_factor, park_mult = _park_multiplier(_park_team(slate.opp_pitcher_by_team, team), park_factors, weather_conditions,
+                                                  config)
 
+        h2h_bonus = 0.0
         pitchtype_bonus = 0.0
         if opp_name and name:
-            top_pitches = pitcher_top_pitches_idx.get(opp_name) or []
-            xslg_by_pitch = batter_xslg_by_pitch_idx.get(name) or {}
-            sc_xslg = _safe_float(sc.get('xslg')) if sc else 0.0
-            baseline = sc_xslg if sc_xslg > 0 else slg
-            agg = 0.0
-            if xslg_by_pitch:
-                for entry in top_pitches:
-                    ptype = entry.get('type')
-                    if not ptype:
-                        continue
-                    batter_vs = _safe_float(xslg_by_pitch.get(ptype))
-                    if batter_vs <= 0 or baseline <= 0:
-                        continue
-                    delta = batter_vs - baseline
-                    usage = _safe_float(entry.get('usage')) / 100.0
-                    hr100 = _safe_float(entry.get('hr_per_100'))
-                    weight = max(0.0, min(1.0, usage)) * (1.0 + min(0.5, hr100 / 3.0) if hr100 > 0 else 1.0)
-                    agg += max(0.0, delta) * weight
-            else:
-                # Fallback: slight bonus based primarily on pitcher's top pitch usage
-                for entry in top_pitches:
-                    usage = _safe_float(entry.get('usage')) / 100.0
-                    # Without batter xSLG-by-pitch or HR/100, give a tiny usage-based boost
-                    agg += max(0.0, min(1.0, usage)) * 0.05
-            if agg > 0:
-                pitchtype_bonus = max(0.0, min(3.0, agg * 6.0))
-        hr_score = (
+            rec = h2h_idx.get(name, opp_name, batter_id=pid, pitcher_id=opp_info.get('opp_pitcher_id'))
+            h2h_bonus = _h2h_bonus(rec, _safe_float(p.get('sluggingPerc')))
+            pitchtype_bonus = _pitchtype_bonus(slate.top_pitches_for(opp_info.get('opp_pitcher_id'), opp_name),
+                                               slate.xslg_for(pid, name), sc, slg)
+        base_score = (
             0.52 * power_comp +
             0.12 * recent_comp +
             0.26 * pitcher_comp +
@@ -822,47 +693,23 @@ def _compute_scores(date_str: Optional[str] = None) -> Dict:
             pitchtype_bonus
         )
         market_factor = market_scaler_by_team.get(team, 1.0)
-        # First apply park multiplier, then market
-        hr_score = hr_score * park_mult
-        hr_score = hr_score * market_factor
 
         pa_multiplier = 1.0
-        slot = lineup_slot_by_player.get((team, name))
-        if not slot:
-            slot = lineup_slot_by_norm_player.get((team, _norm_name_simple(name)))
+        slot = slate.lineup_slot_for(pid, team, name)
         if slot:
-            pa_map = {1:1.08, 2:1.06, 3:1.05, 4:1.04, 5:1.03, 6:1.02, 7:1.01, 8:1.00, 9:0.99}
-            pa_multiplier = pa_map.get(int(slot), 1.0)
-            hr_score = hr_score * pa_multiplier
+            pa_multiplier = PA_MULTIPLIER_BY_SLOT.get(int(slot), 1.0)
 
         # Optional market blend (only if RANK_MODE=blended). Default ranking is pure model for predictability.
-        blend_delta_pts = 0.0
-        rank_mode = os.getenv('RANK_MODE', 'model').lower().strip()
-        try:
-            alpha = float(os.getenv('PLAYER_MARKET_ALPHA', '0.0' if rank_mode != 'blended' else '0.1'))
-        except Exception:
-            alpha = 0.0 if rank_mode != 'blended' else 0.1
-        if rank_mode == 'blended' and alpha > 0.0 and player_odds_map:
-            key = _norm_name_key(name)
-            p_market = player_odds_map.get(key)
-            if p_market is not None and p_market > 0.0:
-                p_model_prob = max(0.01, min(0.99, hr_score / 100.0))
-                z_blend = (1.0 - alpha) * _logit(p_model_prob) + alpha * _logit(max(0.01, min(0.99, float(p_market))))
-                p_blend = _sigmoid(z_blend)
-                score_blend = p_blend * 100.0
-                try:
-                    cap_pts = float(os.getenv('PLAYER_MARKET_BLEND_CAP', '3.0'))
-                except Exception:
-                    cap_pts = 3.0
-                blend_delta = score_blend - hr_score
-                if blend_delta > cap_pts:
-                    blend_delta = cap_pts
-                elif blend_delta < -cap_pts:
-                    blend_delta = -cap_pts
-                hr_score = hr_score + blend_delta
-                blend_delta_pts = blend_delta
+        p_market = None
+        if config.blended and player_odds_map:
+            pm = slate.market_prob_for(pid, name)
+            if pm is not None and pm > 0.0:
+                p_market = float(pm)
 
-        hr_score = max(0.0, min(100.0, round(hr_score, 1)))
+        hr_score, blend_delta_pts = _finalize_score(base_score, park_mult, market_factor, pa_multiplier, p_market,
+                                                    config)
+        if parts is not None:
+            parts.append([name, team, pid, base_score, park_mult, market_factor, pa_multiplier, p_market])
 
         factors = {
             'power_comp': round(power_comp, 1),
@@ -878,58 +725,824 @@ def _compute_scores(date_str: Optional[str] = None) -> Dict:
 
         model_prob_raw = max(0.0, min(1.0, hr_score / 100.0))
         model_prob_cal = apply_calibration(model_prob_raw, calibrator) if calibrator else model_prob_raw
-        results.append({
-            'name': name,
-            'team': team,
-            'position': p.get('position') or 'Unknown',
-            'hr_score': hr_score,
-            'homer_likelihood_score': hr_score,
-            'model_prob': round(model_prob_cal, 5),
-            'model_prob_raw': round(model_prob_raw, 5) if calibrator else None,
-            'calibration_method': calib_method if calibrator else None,
-            'stats': {
-                'homeRuns': season_hr,
-                'battingAvg': _safe_float(p.get('battingAvg')),
-                'slugging': _safe_float(p.get('sluggingPerc')),
-                'iso': round(iso, 3)
-            },
-            'opposing_pitcher': opp_name or 'TBD',
-            'pitcher_era': p_era if p_era is not None else None,
-            'pitcher_hr_allowed': p_hr_allowed if p_hr_allowed is not None else None,
-            'factors': factors
-        })
+        results.append(_player_row(p, name, team, hr_score, model_prob_cal, model_prob_raw, calibrator, calib_method,
+                                   season_hr, iso, opp_name, p_era, p_hr_allowed, factors))
+
+    return results
+
+
+# Pitcher-comp columns per batter hand; any other hand (switch, unknown) uses the '' composite
+_HAND_COLUMNS = ('R', 'L', '')
+_HAND_INDEX = {hand: k for k, hand in enumerate(_HAND_COLUMNS)}
+
+
+def _normalize_array(np, values):
+    """Array form of _normalize: same expression per element, 50.0 when flat."""
+    if values.size == 0:
+        return values
+    lo, hi = values.min(), values.max()
+    if hi - lo < 1e-9:
+        return np.full(values.shape, 50.0)
+    return 100.0 * (values - lo) / (hi - lo)
+
+
+def _score_hitters_vectorized(slate: SlateContext, config: ScoringConfig, parts: Optional[list] = None) -> List[dict]:
+    """Batch engine: gather per-hitter inputs into columns, score the slate as array expressions.
+
+    Everything that depends only on a hitter's game (opposing starter by batter hand, park,
+    market scaler, the pitch-type fallback) is computed once per team and gathered by index.
+    The per-hitter dict lookups (Statcast, recent form, H2H, lineup slot, odds) and building
+    the output rows stay Python. Produces the same rows (and ``parts``), in the same order,
+    as _score_hitters_loop; final rounding stays in Python so the published one-decimal
+    scores match exactly.
+    """
+    import numpy as np
+
+    hitters = slate.hitters
+    n = len(hitters)
+    season_hr = np.empty(n)
+    iso = np.empty(n)
+    slg = np.empty(n)
+    ev = np.empty(n)
+    brl = np.empty(n)
+    # Rows that get scored: named hitters whose team plays today
+    rows = []
+    for i, p in enumerate(hitters):
+        name = p.get('name')
+        pid = id_key(p.get('mlbam_id'))
+        ba_i = _safe_float(p.get('battingAvg'))
+        slg_i = _safe_float(p.get('sluggingPerc'))
+        season_hr[i] = int(p.get('homeRuns') or 0)
+        slg[i] = slg_i
+        iso[i] = max(0.0, slg_i - ba_i)
+        sc = slate.statcast_for(pid, name or '')
+        ev[i] = _safe_float(sc.get('exit_velocity'))
+        brl[i] = _safe_float(sc.get('barrel_rate'))
+        team = _norm_team(p.get('team'))
+        if name and team and team in slate.opp_pitcher_by_team:
+            rows.append((i, p, name, team, pid, sc, slg_i))
+    if not rows:
+        return []
+    idx = np.fromiter((r[0] for r in rows), dtype=np.intp, count=len(rows))
+
+    power_comp = (
+        0.28 * _normalize_array(np, season_hr)[idx] +
+        0.18 * _normalize_array(np, iso)[idx] +
+        0.10 * _normalize_array(np, slg)[idx] +
+        0.22 * _normalize_array(np, ev)[idx] +
+        0.22 * _normalize_array(np, brl)[idx]
+    )
+
+    alpha = config.market_alpha
+    cap_pts = config.player_market_blend_cap
+    blend_on = config.blended and bool(slate.player_odds_map)
+
+    # Per-team columns, gathered below by each row's team index
+    teams = list(dict.fromkeys(r[3] for r in rows))
+    team_index = {team: t for t, team in enumerate(teams)}
+    team_comp = np.full((len(teams), len(_HAND_COLUMNS)), 50.0)
+    team_park = np.empty((len(teams), 2))
+    team_market = np.empty(len(teams))
+    team_opp = []
+    team_pitcher_vals = []
+    team_pitch_weights = []
+    team_pitchtype = []
+    for t, team in enumerate(teams):
+        opp_info = slate.opp_pitcher_by_team.get(team, {})
+        opp_name = opp_info.get('opp_pitcher') or 'TBD'
+        opp_pid = opp_info.get('opp_pitcher_id')
+        opp_comp = slate.pitcher(opp_name)
+        if opp_comp is not None:
+            team_comp[t] = [slate.pitcher_comp(opp_name, hand) for hand in _HAND_COLUMNS]
+            team_pitcher_vals.append((opp_name, opp_comp['era'], opp_comp['hr_allowed']))
+        else:
+            team_pitcher_vals.append((opp_name, None, None))
+        team_opp.append((opp_name, opp_pid))
+        team_park[t] = _park_multiplier(_park_team(slate.opp_pitcher_by_team, team), slate.park_factors,
+                                        slate.weather_conditions, config)
+        team_market[t] = slate.market_scaler_by_team.get(team, 1.0)
+        top_pitches = slate.top_pitches_for(opp_pid, opp_name)
+        team_pitch_weights.append(_pitch_weights(top_pitches))
+        # Without the batter's xSLG by pitch the bonus depends on the pitcher alone
+        team_pitchtype.append(_pitchtype_bonus(top_pitches, {}, None, 0.0))
+
+    m = len(rows)
+    team_of = np.empty(m, dtype=np.intp)
+    hand_of = np.empty(m, dtype=np.intp)
+    recent_rate = np.empty(m)
+    h2h_bonus = np.zeros(m)
+    # Pitch-type bonus inputs: batter xSLG vs each of the starter's top pitches, and its weight
+    width = max(1, max(len(w) for w in team_pitch_weights))
+    has_xslg = np.zeros(m, dtype=bool)
+    pitch_baseline = np.zeros(m)
+    batter_vs = np.zeros((m, width))
+    pitch_weight = np.zeros((m, width))
+    pa_multiplier = np.ones(m)
+    p_market = np.full(m, np.nan)
+    h2h_idx = slate.h2h or H2HIndex()
+    has_h2h = len(h2h_idx) > 0
+    for j, (_, p, name, team, pid, sc, slg_j) in enumerate(rows):
+        t = team_of[j] = team_index[team]
+        recent_rate[j] = slate.recent_for(pid, name)
+        batter_hand = (p.get('bats') or p.get('batting_hand') or (p.get('battingSide') or {}).get('code') or '').upper()
+        hand_of[j] = _HAND_INDEX.get(batter_hand, _HAND_INDEX[''])
+
+        if has_h2h:
+            opp_name, opp_pid = team_opp[t]
+            rec = h2h_idx.get(name, opp_name, batter_id=pid, pitcher_id=opp_pid)
+            if rec:
+                h2h_bonus[j] = _h2h_bonus(rec, slg_j)
+        xslg_by_pitch = slate.xslg_for(pid, name)
+        if xslg_by_pitch:
+            has_xslg[j] = True
+            sc_xslg = _safe_float(sc.get('xslg')) if sc else 0.0
+            pitch_baseline[j] = sc_xslg if sc_xslg > 0 else slg_j
+            for k, (ptype, weight) in enumerate(team_pitch_weights[t]):
+                batter_vs[j, k] = _safe_float(xslg_by_pitch.get(ptype))
+                pitch_weight[j, k] = weight
+
+        slot = slate.lineup_slot_for(pid, team, name)
+        if slot:
+            pa_multiplier[j] = PA_MULTIPLIER_BY_SLOT.get(int(slot), 1.0)
+        if blend_on:
+            pm = slate.market_prob_for(pid, name)
+            if pm is not None and pm > 0.0:
+                p_market[j] = float(pm)
+
+    pitcher_comp = team_comp[team_of, hand_of]
+    park_factor = team_park[team_of, 0]
+    park_mult = team_park[team_of, 1]
+    market_factor = team_market[team_of]
+    pitcher_vals = [team_pitcher_vals[t] for t in team_of.tolist()]
+    counted = (batter_vs > 0) & (pitch_baseline[:, None] > 0)
+    pitch_agg = np.where(counted, np.maximum(0.0, batter_vs - pitch_baseline[:, None]) * pitch_weight, 0.0).sum(axis=1)
+    pitchtype_bonus = np.where(has_xslg, np.where(pitch_agg > 0, np.clip(pitch_agg * 6.0, 0.0, 3.0), 0.0),
+                               np.array(team_pitchtype)[team_of])
+
+    recent_comp = np.minimum(100.0, np.maximum(0.0, recent_rate * 100.0))
+    hr_score = (
+        0.52 * power_comp +
+        0.12 * recent_comp +
+        0.26 * pitcher_comp +
+        0.00 * (park_factor * 100.0) +
+        h2h_bonus +
+        pitchtype_bonus
+    )
+    base_score = hr_score
+    hr_score = hr_score * park_mult
+    hr_score = hr_score * market_factor
+    hr_score = hr_score * pa_multiplier
+    if parts is not None:
+        for (_, _, name, team, pid, _, _), b, pmul, mf, pam, pm in zip(rows, base_score.tolist(), park_mult.tolist(),
+                                                                        market_factor.tolist(), pa_multiplier.tolist(),
+                                                                        p_market.tolist()):
+            parts.append([name, team, pid, b, pmul, mf, pam, None if pm != pm else pm])
+
+    blend_delta = np.zeros(m)
+    if blend_on:
+        has_market = ~np.isnan(p_market)
+        if has_market.any():
+            def logit(x):
+                x = np.clip(x, 1e-6, 1 - 1e-6)
+                return np.log(x / (1.0 - x))
+            p_model = np.clip(hr_score / 100.0, 0.01, 0.99)
+            p_mkt = np.clip(np.where(has_market, p_market, 0.5), 0.01, 0.99)
+            z_blend = (1.0 - alpha) * logit(p_model) + alpha * logit(p_mkt)
+            score_blend = (1.0 / (1.0 + np.exp(-z_blend))) * 100.0
+            delta = np.clip(score_blend - hr_score, -cap_pts, cap_pts)
+            blend_delta = np.where(has_market, delta, 0.0)
+            hr_score = np.where(has_market, hr_score + blend_delta, hr_score)
+
+    hr_scores = [max(0.0, min(100.0, round(v, 1))) for v in hr_score.tolist()]
+    model_prob_raw = np.clip(np.array(hr_scores) / 100.0, 0.0, 1.0)
+    calibrator = slate.calibrator
+    calib_method = calibrator.get('method') if calibrator else None
+    model_prob_cal = apply_calibration_array(model_prob_raw, calibrator) if calibrator else model_prob_raw
+
+    cols = zip(rows, pitcher_vals, hr_scores, power_comp.tolist(), recent_comp.tolist(), pitcher_comp.tolist(),
+               park_mult.tolist(), h2h_bonus.tolist(), pitchtype_bonus.tolist(), market_factor.tolist(),
+               blend_delta.tolist(), pa_multiplier.tolist(), model_prob_raw.tolist(), model_prob_cal.tolist())
+    results = []
+    for ((i, p, name, team, _, _, _), (opp_name, p_era, p_hr_allowed), score, pw, rc, pc, pmul, h2h, ptb, mf, bd, pam,
+         raw, cal) in cols:
+        factors = {
+            'power_comp': round(pw, 1),
+            'recent_comp': round(rc, 1),
+            'pitcher_comp': round(pc, 1),
+            'park_weather_pct': round((pmul - 1.0) * 100.0, 1),
+            'h2h_bonus': round(h2h, 2),
+            'pitchtype_bonus': round(ptb, 1),
+            'market_scaler_pct': round((mf - 1.0) * 100.0, 1),
+            'market_blend_delta': round(bd, 1) if bd else 0.0,
+            'pa_multiplier_pct': round((pam - 1.0) * 100.0, 1)
+        }
+        season_hr_i = int(p.get('homeRuns') or 0)
+        results.append(_player_row(p, name, team, score, cal, raw, calibrator, calib_method,
+                                   season_hr_i, float(iso[i]), opp_name, p_era, p_hr_allowed, factors))
+    return results
+
+
+def _resolve_inputs(target_date: str) -> Dict[str, Tuple[Optional[str], Optional[str]]]:
+    """Input kind -> (path, file date) for a slate, without reading the data files.
+
+    Raises FileNotFoundError when a required input (player, pitcher, recent, schedule) is missing.
+    A statcast fallback to the undated statcast-metrics.json is returned with date None.
+    """
+    inputs: Dict[str, Tuple[Optional[str], Optional[str]]] = {}
+    for kind in ('player-stats', 'pitcher-stats', 'recent-performance'):
+        inputs[kind] = _pick_dated_file(kind + '-', target_date)
+
+    alt_sched = os.path.join(DATA_DIR, 'todays-schedule.json')
+    ts_date = None
+    if os.path.exists(alt_sched):
+        try:
+            ts_date = load_schedule(alt_sched, _norm_team).date
+        except Exception:
+            ts_date = None
+    if ts_date == target_date:
+        inputs['schedule'] = (alt_sched, ts_date)
+    else:
+        try:
+            inputs['schedule'] = _pick_dated_file('fresh-schedule-', target_date)
+        except FileNotFoundError:
+            if not os.path.exists(alt_sched):
+                raise
+            inputs['schedule'] = (alt_sched, ts_date or target_date)
+
+    try:
+        inputs['statcast-metrics'] = _pick_dated_file('statcast-metrics-', target_date)
+    except FileNotFoundError:
+        inputs['statcast-metrics'] = (os.path.join(DATA_DIR, 'statcast-metrics.json'), None)
+
+    for kind in ('ballpark-weather', 'pitcher-advanced', 'pitch-type-metrics', 'implied-totals', 'lineups',
+                 'hitter-vs-pitcher', 'player-hr-odds'):
+        inputs[kind] = _pick_dated_file_optional(kind + '-', target_date)
+    inputs['hitter-vs-pitcher-js'] = (os.path.join(DATA_DIR, 'hitter-vs-pitcher.js'), None)
+    return inputs
+
+
+def _load_optional(path: Optional[str]) -> Optional[dict]:
+    try:
+        return _load_json(path) if path else None
+    except Exception:
+        return None
+
+
+def _slate_identity(players_data: dict, pitchers_data: dict) -> IdentityMap:
+    """Persisted aliases plus the slate's id-carrying rows, so name-keyed sources join by id once."""
+    identity = load_identity().copy()
+    identity.add_records(players_data.get('players') or [], role='batter', norm_team=_norm_team)
+    identity.add_records(pitchers_data.get('pitchers') or [], role='pitcher')
+    return identity
+
+
+def _lineup_entries(lineups_data: Optional[dict], resolve) -> List[tuple]:
+    """[(team, name, slot, source id, MLBAM id)] in file order; resolve(name, team) ids rows without one."""
+    entries = []
+    if lineups_data and isinstance(lineups_data.get('lineups'), dict):
+        for team_abbr, rows in (lineups_data.get('lineups') or {}).items():
+            t = _norm_team(team_abbr)
+            if not t:
+                continue
+            for e in rows:
+                n = (e.get('name') or '').strip()
+                try:
+                    slot = int(e.get('slot'))
+                except Exception:
+                    slot = None
+                if n and slot:
+                    source_id = id_key(e.get('mlbam_id') or e.get('id'))
+                    entries.append((t, n, slot, source_id, source_id or resolve(n, t)))
+    return entries
+
+
+def _index_lineups(entries: List[tuple]):
+    """(team, name) -> slot, (team, simple name) -> slot and MLBAM id -> slot."""
+    lineup_slot_by_player = {}
+    lineup_slot_by_norm_player = {}
+    lineup_slot_by_id = {}
+    for t, n, slot, _, pid in entries:
+        lineup_slot_by_player[(t, n)] = slot
+        lineup_slot_by_norm_player[(t, _norm_name_simple(n))] = slot
+        if pid is not None:
+            lineup_slot_by_id.setdefault(pid, slot)
+    return lineup_slot_by_player, lineup_slot_by_norm_player, lineup_slot_by_id
+
+
+def _slate_date(inputs: Dict[str, tuple], target_date: str) -> str:
+    """Date the scores are published under: the schedule's, else the player stats', else the target."""
+    return inputs['schedule'][1] or inputs['player-stats'][1] or target_date
+
+
+def _load_slate(date_str: Optional[str] = None) -> SlateContext:
+    """Read every input for the date and build the config-independent slate tables."""
+    target_date = date_str or datetime.now().strftime('%Y-%m-%d')
+    inputs = _resolve_inputs(target_date)
+    player_path, players_date = inputs['player-stats']
+    pitcher_path, pitchers_date = inputs['pitcher-stats']
+    recent_path, recent_date = inputs['recent-performance']
+    schedule_path, schedule_date = inputs['schedule']
+    statcast_path, statcast_date = inputs['statcast-metrics']
+    if statcast_date is None:
+        statcast_date = _load_json(statcast_path).get('date', 'unknown') if os.path.exists(statcast_path) else 'unknown'
+
+    players_data = _load_json(player_path)
+    pitchers_data = _load_json(pitcher_path)
+    recent_data = _load_json(recent_path)
+    schedule = load_schedule(schedule_path, _norm_team)
+    statcast = _load_json(statcast_path) if os.path.exists(statcast_path) else {}
+    ballpark_data = _load_optional(inputs['ballpark-weather'][0]) or {}
+    pitcher_adv = _load_optional(inputs['pitcher-advanced'][0])
+    pitch_type_data = _load_optional(inputs['pitch-type-metrics'][0])
+    implied_data = _load_optional(inputs['implied-totals'][0])
+    lineups_data = _load_optional(inputs['lineups'][0])
+
+    recent_idx = _index_recent_form(recent_data)
+    pitcher_idx = _index_pitchers(pitchers_data)
+    statcast_idx = _index_statcast(statcast)
+    identity = _slate_identity(players_data, pitchers_data)
+    # H2H: dated JSON merged with the legacy JS map, loaded once per slate
+    h2h_idx = load_h2h_index(inputs['hitter-vs-pitcher'][0], inputs['hitter-vs-pitcher-js'][0])
+    pitcher_adv_idx = _index_pitcher_advanced(pitcher_adv)
+    pitcher_top_pitches_idx, batter_xslg_by_pitch_idx = _index_pitch_type(pitch_type_data)
+    implied_by_team = _index_implied(implied_data)
+
+    # Optional player HR odds for market blend
+    player_odds_map, _ = _index_player_odds(_load_optional(inputs['player-hr-odds'][0]))
+
+    lineup_entries = _lineup_entries(lineups_data, identity.resolve)
+    lineup_slot_by_player, lineup_slot_by_norm_player, lineup_slot_by_id = _index_lineups(lineup_entries)
+
+    opp_pitcher_by_team = _opp_pitcher_by_team(schedule, identity.resolve)
+
+    park_factors = (ballpark_data or {}).get('ballpark_factors', {})
+    weather_conditions = (ballpark_data or {}).get('weather_conditions', {})
+
+    teams_today = set()
+    for k, v in opp_pitcher_by_team.items():
+        teams_today.add(k)
+        if v.get('opp_team'):
+            teams_today.add(v['opp_team'])
 
+    hitters = players_data.get('players') or []
+    filtered_hitters = [p for p in hitters if 'pitch' not in (p.get('position') or '').lower()]
+
+    # Per-pitcher components are slate-level; build them once instead of per hitter
+    slate = _build_slate_context(opp_pitcher_by_team, pitcher_idx, pitcher_adv_idx,
+                                 pitcher_by_id=_index_pitchers(pitchers_data, by_id=True),
+                                 pitcher_adv_by_id=identity.by_id(pitcher_adv_idx))
+    slate.hitters = filtered_hitters
+    slate.statcast = statcast_idx
+    slate.recent = recent_idx
+    slate.opp_pitcher_by_team = opp_pitcher_by_team
+    slate.schedule = schedule
+    slate.park_factors = park_factors
+    slate.weather_conditions = weather_conditions
+    slate.h2h = h2h_idx
+    slate.pitcher_top_pitches = pitcher_top_pitches_idx
+    slate.batter_xslg_by_pitch = batter_xslg_by_pitch_idx
+    slate.implied_by_team = implied_by_team
+    slate.teams_today = teams_today
+    slate.lineup_slot_by_player = lineup_slot_by_player
+    slate.lineup_slot_by_norm_player = lineup_slot_by_norm_player
+    slate.player_odds_map = player_odds_map
+    slate.statcast_by_id = identity.by_id(statcast_idx)
+    slate.recent_by_id = _index_recent_form(recent_data, by_id=True)
+    slate.pitcher_top_pitches_by_id = identity.by_id(pitcher_top_pitches_idx)
+    slate.batter_xslg_by_id = identity.by_id(batter_xslg_by_pitch_idx)
+    slate.lineup_slot_by_id = lineup_slot_by_id
+    slate.player_odds_by_id = identity.by_id(player_odds_map)
+
+    slate.inputs = inputs
+    slate.lineup_entries = lineup_entries
+    slate.date = _slate_date(inputs, target_date)
+    slate.source_dates = {
+        'players': players_date,
+        'pitchers': pitchers_date,
+        'recent': recent_date,
+        'schedule': schedule_date,
+        'statcast': statcast_date
+    }
+    return slate
+
+
+def _market_scaler_by_team(implied_by_team: Dict[str, float], teams_today: set,
+                           config: ScoringConfig) -> Dict[str, float]:
+    implied_vals_today = [implied_by_team.get(t) for t in teams_today if implied_by_team.get(t) is not None]
+    market_scaler_by_team = {}
+    # Market scaling range (tightened by default)
+    market_lo, market_hi = config.market_scale_min, config.market_scale_max
+    market_lo, market_hi = max(0.9, min(market_lo, market_hi)), max(market_lo, market_hi)
+    # If implied totals provide no real differentiation (all equal), neutralize scaling
+    if implied_vals_today and not (len(set(round(v, 3) for v in implied_vals_today)) == 1):
+        lo = min(implied_vals_today)
+        hi = max(implied_vals_today)
+        span = hi - lo if hi > lo else 1.0
+        for t in teams_today:
+            v = implied_by_team.get(t)
+            if v is None:
+                market_scaler_by_team[t] = 1.0
+            else:
+                norm01 = (v - lo) / span
+                market_scaler_by_team[t] = market_lo + (market_hi - market_lo) * max(0.0, min(1.0, norm01))
+    else:
+        for t in teams_today:
+            market_scaler_by_team[t] = 1.0
+    return market_scaler_by_team
+
+
+def _score_slate(slate: SlateContext, config: ScoringConfig, parts: Optional[list] = None) -> List[dict]:
+    """Score a loaded slate under one config. The slate is not mutated, so one
+    load can be scored under many configs, including from several threads."""
+    scored = dataclasses.replace(
+        slate,
+        market_scaler_by_team=_market_scaler_by_team(slate.implied_by_team, slate.teams_today, config),
+        calibrator=load_calibrator(config.calibration_path),
+    )
+    if config.engine == 'vectorized':
+        results = _score_hitters_vectorized(scored, config, parts)
+    else:
+        results = _score_hitters_loop(scored, config, parts)
     results.sort(key=lambda r: r['hr_score'], reverse=True)
+    return results
 
-    meta_date = schedule_date or players_date or target_date
+
+def _compute_scores(date_str: Optional[str] = None, engine: Optional[str] = None,
+                    config: Optional[ScoringConfig] = None) -> Dict:
+    config = config or config_from_env()
+    if engine:
+        config = config.with_overrides({'engine': engine})
+    slate = _load_slate(date_str)
+    return _scores_doc(slate, _score_slate(slate, config))
+
+
+def _scores_doc(slate: SlateContext, results: List[dict]) -> Dict:
     return {
-        'date': meta_date,
+        'date': slate.date,
         'generated_at': datetime.now().isoformat(),
-        'source_dates': {
-            'players': players_date,
-            'pitchers': pitchers_date,
-            'recent': recent_date,
-            'schedule': schedule_date,
-            'statcast': statcast_date
-        },
+        'source_dates': dict(slate.source_dates),
         'total_players': len(results),
         'players': results
     }
 
 
-def generate(date_str: Optional[str] = None, save: bool = True) -> Dict:
-    data = _compute_scores(date_str)
+# ---------------------------------------------------------------------------
+# Incremental re-scoring
+#
+# A full save also writes data/hr-scores-DATE.state.json: fingerprints of every
+# input file, the resolved lineup rows, each game's park and every hitter's
+# unrounded score parts. During the day usually only lineups, odds or weather
+# change; generate(incremental=True) then recomputes just the multipliers those
+# files feed (PA slot, market blend, park/weather) for the affected hitters and
+# patches hr-scores-DATE.json. Any other change, a different config or a
+# missing/edited state falls back to a full rebuild.
+# ---------------------------------------------------------------------------
+
+STATE_VERSION = 1
+PATCHABLE_INPUTS = ('lineups', 'player-hr-odds', 'ballpark-weather')
+
+
+def _state_path(out_date: str) -> str:
+    return os.path.join(DATA_DIR, f"hr-scores-{out_date}.state.json")
+
+
+def _file_fingerprint(path: Optional[str], prev: Optional[dict] = None) -> Optional[dict]:
+    """{path, mtime_ns, size, sha1}; the hash is reused from prev when path and stat match."""
+    version = file_version(path)
+    if version is None:
+        return None
+    if prev and (prev.get('path'), prev.get('mtime_ns'), prev.get('size')) == version:
+        return prev
+    with open(path, 'rb') as f:
+        digest = hashlib.sha1(f.read()).hexdigest()
+    return {'path': path, 'mtime_ns': version[1], 'size': version[2], 'sha1': digest}
+
+
+def _input_fingerprints(inputs: Dict[str, tuple], config: ScoringConfig,
+                        prev: Optional[Dict[str, Optional[dict]]] = None) -> Dict[str, Optional[dict]]:
+    paths = {kind: path for kind, (path, _) in inputs.items()}
+    paths['identity'] = IDENTITY_FILE
+    paths['calibration'] = config.calibration_path
+    # Code changes invalidate saved score parts too
+    paths['scorer'] = os.path.abspath(__file__)
+    prev = prev or {}
+    return {kind: _file_fingerprint(path, prev.get(kind)) for kind, path in paths.items()}
+
+
+def _changed_inputs(old: Dict[str, Optional[dict]], new: Dict[str, Optional[dict]]) -> set:
+    """Kinds whose content differs (a moved but identical file is unchanged)."""
+    def digest(fp):
+        return fp.get('sha1') if fp else None
+    return {k for k in set(old) | set(new) if digest(old.get(k)) != digest(new.get(k))}
+
+
+def _write_json_atomic(path: str, data, indent: Optional[int] = 2) -> None:
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=indent)
+    os.replace(tmp, path)
+
+
+def _save_state(out_date: str, fmt: str, config: ScoringConfig, fingerprints: Dict[str, Optional[dict]],
+                lineup_entries: List[tuple], park_team_by_team: Dict[str, Optional[str]], parts: List[list]) -> None:
+    state = {
+        'version': STATE_VERSION,
+        'config': config.to_dict(),
+        'format': fmt,
+        'inputs': fingerprints,
+        'output': _file_fingerprint(_scores_path(DATA_DIR, out_date, fmt)),
+        'lineups': [list(e) for e in lineup_entries],
+        'park_team_by_team': park_team_by_team,
+        'hitters': parts,
+    }
+    _write_json_atomic(_state_path(out_date), state, indent=None)
+
+
+def _load_state(out_date: str) -> Optional[dict]:
+    try:
+        with open(_state_path(out_date), 'r', encoding='utf-8') as f:
+            state = json.load(f)
+    except Exception:
+        return None
+    return state if isinstance(state, dict) and state.get('version') == STATE_VERSION else None
+
+
+def _patch_lineups(parts: List[list], old_entries: List[list], lineups_path: Optional[str], slate_identity) -> Tuple[set, List[tuple]]:
+    """Recompute PA multipliers for hitters on teams whose lineup rows changed; returns (patched indexes, entries)."""
+    known = {(t, n): pid for t, n, _, source_id, pid in old_entries if source_id is None}
+
+    def resolve(name, team):
+        if (team, name) in known:
+            return known[(team, name)]
+        return slate_identity().resolve(name, team)
+
+    entries = _lineup_entries(_load_optional(lineups_path), resolve)
+    old_by_team: Dict[str, list] = {}
+    new_by_team: Dict[str, list] = {}
+    for e in old_entries:
+        old_by_team.setdefault(e[0], []).append(tuple(e[1:]))
+    for e in entries:
+        new_by_team.setdefault(e[0], []).append(tuple(e[1:]))
+    teams = {t for t in set(old_by_team) | set(new_by_team) if old_by_team.get(t) != new_by_team.get(t)}
+    # Id lookups cross teams, so hitters named by id in a changed team's rows are affected too
+    pids = {e[3] for t in teams for e in old_by_team.get(t, []) + new_by_team.get(t, []) if e[3] is not None}
+    by_player, by_norm, by_id = _index_lineups(entries)
+    lookup = SlateContext(lineup_slot_by_player=by_player, lineup_slot_by_norm_player=by_norm, lineup_slot_by_id=by_id)
+    patched = set()
+    for i, part in enumerate(parts):
+        name, team, pid = part[0], part[1], part[2]
+        if team not in teams and pid not in pids:
+            continue
+        slot = lookup.lineup_slot_for(pid, team, name)
+        pa_multiplier = PA_MULTIPLIER_BY_SLOT.get(int(slot), 1.0) if slot else 1.0
+        if pa_multiplier != part[6]:
+            part[6] = pa_multiplier
+            patched.add(i)
+    return patched, entries
+
+
+def _patch_market(parts: List[list], odds_path: Optional[str], slate_identity, config: ScoringConfig) -> set:
+    """Refresh each hitter's market probability; only the blended rank mode reads it."""
+    if not config.blended:
+        return set()
+    odds_map, _ = _index_player_odds(_load_optional(odds_path))
+    lookup = SlateContext(player_odds_map=odds_map,
+                          player_odds_by_id=slate_identity().by_id(odds_map) if odds_map else {})
+    patched = set()
+    for i, part in enumerate(parts):
+        p_market = None
+        if odds_map:
+            pm = lookup.market_prob_for(part[2], part[0])
+            if pm is not None and pm > 0.0:
+                p_market = float(pm)
+        if p_market != part[7]:
+            part[7] = p_market
+            patched.add(i)
+    return patched
+
+
+def _patch_parks(parts: List[list], ballpark_path: Optional[str], park_team_by_team: Dict[str, Optional[str]],
+                 config: ScoringConfig) -> set:
+    """Recompute park/weather multipliers per game; hitters in parks whose multiplier moved are patched."""
+    ballpark_data = _load_optional(ballpark_path) or {}
+    park_factors = ballpark_data.get('ballpark_factors', {})
+    weather_conditions = ballpark_data.get('weather_conditions', {})
+    park_mult_by_team = {}
+    patched = set()
+    for i, part in enumerate(parts):
+        team = part[1]
+        if team not in park_mult_by_team:
+            park_mult_by_team[team] = _park_multiplier(park_team_by_team.get(team), park_factors,
+                                                       weather_conditions, config)[1]
+        if park_mult_by_team[team] != part[4]:
+            part[4] = park_mult_by_team[team]
+            patched.add(i)
+    return patched
+
+
+def _patch_row(row: dict, part: list, config: ScoringConfig, calibrator: Optional[dict]) -> None:
+    _, _, _, base, park_mult, market_factor, pa_multiplier, p_market = part
+    hr_score, blend_delta = _finalize_score(base, park_mult, market_factor, pa_multiplier, p_market, config)
+    model_prob_raw = max(0.0, min(1.0, hr_score / 100.0))
+    model_prob_cal = apply_calibration(model_prob_raw, calibrator) if calibrator else model_prob_raw
+    row['hr_score'] = hr_score
+    row['homer_likelihood_score'] = hr_score
+    row['model_prob'] = round(model_prob_cal, 5)
+    row['model_prob_raw'] = round(model_prob_raw, 5) if calibrator else None
+    factors = row.setdefault('factors', {})
+    factors['park_weather_pct'] = round((park_mult - 1.0) * 100.0, 1)
+    factors['market_blend_delta'] = round(blend_delta, 1) if blend_delta else 0.0
+    factors['pa_multiplier_pct'] = round((pa_multiplier - 1.0) * 100.0, 1)
+
+
+def _rescore_incremental(date_str: Optional[str], config: ScoringConfig, fmt: str) -> Optional[Dict]:
+    """Patch the saved scores for a date in place; None when a full rebuild is needed."""
+    target_date = date_str or datetime.now().strftime('%Y-%m-%d')
+    inputs = _resolve_inputs(target_date)
+    out_date = _slate_date(inputs, target_date)
+    state = _load_state(out_date)
+    scores_path = _scores_path(DATA_DIR, out_date, fmt)
+    if state is None or state.get('config') != config.to_dict() or state.get('format') != fmt:
+        return None
+    if _file_fingerprint(scores_path, state.get('output')) != state.get('output'):
+        return None
+    fingerprints = _input_fingerprints(inputs, config, state.get('inputs'))
+    changed = _changed_inputs(state.get('inputs') or {}, fingerprints)
+    if changed - set(PATCHABLE_INPUTS):
+        return None
+    try:
+        data = load_scores(scores_path)
+        parts = state['hitters']
+        rows = {(r.get('name'), r.get('team')): r for r in data.get('players') or []}
+        if len(rows) != len(parts) or any((p[0], p[1]) not in rows for p in parts):
+            return None
+    except Exception:
+        return None
+
+    identity = []
+
+    def slate_identity() -> IdentityMap:
+        # Only needed to id newly seen lineup names or a new odds file; built once on demand
+        if not identity:
+            identity.append(_slate_identity(_load_json(inputs['player-stats'][0]), _load_json(inputs['pitcher-stats'][0])))
+        return identity[0]
+
+    lineup_entries = [tuple(e) for e in state.get('lineups') or []]
+    patched = set()
+    if 'lineups' in changed:
+        lineup_patched, lineup_entries = _patch_lineups(parts, lineup_entries, inputs['lineups'][0], slate_identity)
+        patched |= lineup_patched
+    if 'player-hr-odds' in changed:
+        patched |= _patch_market(parts, inputs['player-hr-odds'][0], slate_identity, config)
+    if 'ballpark-weather' in changed:
+        patched |= _patch_parks(parts, inputs['ballpark-weather'][0], state.get('park_team_by_team') or {}, config)
+
+    if patched:
+        calibrator = load_calibrator(config.calibration_path)
+        for i in patched:
+            _patch_row(rows[(parts[i][0], parts[i][1])], parts[i], config, calibrator)
+        # Same order a full rebuild produces: engine order, stable-sorted by score
+        results = [rows[(p[0], p[1])] for p in parts]
+        results.sort(key=lambda r: r['hr_score'], reverse=True)
+        data['players'] = results
+        data['generated_at'] = datetime.now().isoformat()
+        save_scores(data, DATA_DIR, fmt)
+    if changed:
+        _save_state(out_date, fmt, config, fingerprints, lineup_entries, state.get('park_team_by_team') or {}, parts)
+    print(f"Patched {len(patched)} of {len(parts)} players in {scores_path} "
+          f"(changed: {', '.join(sorted(changed)) or 'none'})")
+    return data
+
+
+def generate(date_str: Optional[str] = None, save: bool = True, engine: Optional[str] = None,
+             config: Optional[ScoringConfig] = None, incremental: bool = False,
+             output_format: Optional[str] = None) -> Dict:
+    """Score a date. config defaults to the environment (scoring_config.from_env);
+    engine, when given, overrides config.engine. With incremental (and save), a
+    saved slate whose only changed inputs are lineups, odds or weather is patched
+    in place instead of rebuilt. output_format is json/compact/gzip (see
+    scores_store; default HR_SCORES_FORMAT or json)."""
+    config = config or config_from_env()
+    if engine:
+        config = config.with_overrides({'engine': engine})
+    fmt = _output_format(output_format)
+    if incremental and save:
+        data = _rescore_incremental(date_str, config, fmt)
+        if data is not None:
+            return data
+    slate = _load_slate(date_str)
+    parts = [] if save else None
+    data = _scores_doc(slate, _score_slate(slate, config, parts))
     if save:
-        out_path = os.path.join(DATA_DIR, f"hr-scores-{data['date']}.json")
-        with open(out_path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2)
+        out_path = save_scores(data, DATA_DIR, fmt)
         print(f"Saved HR scores to {out_path} with {data['total_players']} players")
+        try:
+            park_team_by_team = {t: _park_team(slate.opp_pitcher_by_team, t) for t in slate.opp_pitcher_by_team}
+            _save_state(data['date'], fmt, config, _input_fingerprints(slate.inputs, config), slate.lineup_entries,
+                        park_team_by_team, parts)
+        except Exception as e:
+            print(f"Warning: could not write scoring state for {data['date']}: {e}")
     return data
 
 
+def generate_variants(date_str: Optional[str], configs: List[ScoringConfig], workers: int = 1) -> List[Dict]:
+    """Load a date once and score it under each config (not saved); results follow configs' order."""
+    slate = _load_slate(date_str)
+
+    def run(config: ScoringConfig) -> Dict:
+        return _scores_doc(slate, _score_slate(slate, config))
+
+    if workers > 1 and len(configs) > 1:
+        from concurrent.futures import ThreadPoolExecutor
+        with ThreadPoolExecutor(max_workers=workers) as ex:
+            return list(ex.map(run, configs))
+    return [run(c) for c in configs]
+
+
+def _warm_shared_inputs() -> None:
+    """Parse the season-level inputs every slate shares (identity map, legacy H2H map) into
+    their module caches. Run in the parent before the pool starts, so forked workers inherit
+    the parsed tables, and as the pool initializer for platforms that spawn fresh workers."""
+    load_identity()
+    load_legacy_h2h(os.path.join(DATA_DIR, 'hitter-vs-pitcher.js'))
+
+
+def _date_range(start: str, end: str) -> List[str]:
+    """Inclusive YYYY-MM-DD range."""
+    d0 = datetime.strptime(start, '%Y-%m-%d')
+    d1 = datetime.strptime(end, '%Y-%m-%d')
+    return [(d0 + timedelta(days=i)).strftime('%Y-%m-%d') for i in range((d1 - d0).days + 1)]
+
+
+def generate_many(dates: List[str], config: Optional[ScoringConfig] = None, workers: int = 1, save: bool = True,
+                  incremental: bool = False, output_format: Optional[str] = None) -> List[Optional[Dict]]:
+    """Score many dates, in `workers` processes when > 1. Results follow dates' order;
+    a date that fails to score is reported and returned as None.
+
+    A date without its own schedule would fall back to an earlier slate and score (and
+    save) that slate again, racing any other date that falls back to it; such dates are
+    reported and skipped (None) before anything is scored.
+    """
+    config = config or config_from_env()
+    dates = list(dates)
+    _warm_shared_inputs()
+
+    def collect(date_str: str, result) -> Optional[Dict]:
+        try:
+            return result()
+        except Exception as e:
+            print(f"Warning: could not score {date_str}: {e}")
+            return None
+
+    runnable = []
+    for d in dict.fromkeys(dates):
+        try:
+            schedule_date = _resolve_inputs(d)['schedule'][1]
+        except Exception:
+            # Missing inputs are reported when the date is scored
+            schedule_date = d
+        if schedule_date != d:
+            print(f"Warning: skipping {d}: no schedule for that date (nearest earlier is {schedule_date})")
+            continue
+        runnable.append(d)
+
+    if workers > 1 and len(runnable) > 1:
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=min(workers, len(runnable)), initializer=_warm_shared_inputs) as ex:
+            futures = [ex.submit(generate, d, save=save, config=config, incremental=incremental,
+                                 output_format=output_format) for d in runnable]
+            results = {d: collect(d, f.result) for d, f in zip(runnable, futures)}
+    else:
+        results = {d: collect(d, lambda d=d: generate(d, save=save, config=config, incremental=incremental,
+                                                      output_format=output_format)) for d in runnable}
+    return [results.get(d) for d in dates]
+
+
 if __name__ == '__main__':
     import argparse
     parser = argparse.ArgumentParser(description='Generate deterministic HR scores (self-contained)')
     parser.add_argument('--date', help='Target date YYYY-MM-DD (optional)')
+    parser.add_argument('--dates', help='Comma-separated dates to score in one run')
+    parser.add_argument('--range', nargs=2, metavar=('START', 'END'), help='Score every date from START to END inclusive')
+    parser.add_argument('--workers', type=int, default=1, help='Worker processes for --dates/--range (default 1)')
+    parser.add_argument('--engine', choices=['loop', 'vectorized'],
+                        help='Scoring engine (default: SCORING_ENGINE env or loop)')
+    parser.add_argument('--config', help='JSON file of scoring settings applied over the environment')
+    parser.add_argument('--set', action='append', default=[], metavar='NAME=VALUE',
+                        help='Override one scoring setting, e.g. --set PARK_EXPONENT=1.15 (repeatable)')
+    parser.add_argument('--incremental', action='store_true',
+                        help='Patch the saved scores when only lineups, odds or weather changed since the last run')
+    parser.add_argument('--format', choices=['json', 'compact', 'gzip'],
+                        help='Output format (default: HR_SCORES_FORMAT env or json); compact/gzip add a .npz sidecar')
     args = parser.parse_args()
-    generate(args.date)
+    config = resolve_config(args.config, parse_set_args(args.set))
+    if args.engine:
+        config = config.with_overrides({'engine': args.engine})
+    if args.dates or args.range:
+        dates = [d.strip() for d in (args.dates or '').split(',') if d.strip()]
+        if args.range:
+            dates += _date_range(*args.range)
+        generate_many(dates, config=config, workers=args.workers, incremental=args.incremental,
+                      output_format=args.format)
+    else:
+        generate(args.date, config=config, incremental=args.incremental, output_format=args.format)
@@ -0,0 +1,134 @@
+"""Hitter-vs-pitcher (H2H) index shared by the scorer and the app.
+
+Merges the dated hitter-vs-pitcher-YYYY-MM-DD.json and the legacy
+hitter-vs-pitcher.js into one in-memory map keyed by (batter, pitcher).
+Lookups try MLBAM ids first, then exact names, then normalized names.
+
+Loaded indexes are memoized by file fingerprint (path, mtime, size), so a
+slate or a running server parses each file once until it changes.
+"""
+from __future__ import annotations
+
+import json
+import os
+import re
+from typing import Dict, Optional, Tuple
+
+from file_memo import file_memo
+from identity import norm_name_key as _norm_name_key
+
+
+def _id_key(v) -> Optional[str]:
+    if v is None or v == '':
+        return None
+    try:
+        return str(int(v))
+    except Exception:
+        return None
+
+
+class H2HIndex:
+    """(batter, pitcher) -> { pa, hr, avg, slg } with id and name fallbacks."""
+
+    def __init__(self):
+        self._by_id: Dict[Tuple[str, str], dict] = {}
+        self._by_name: Dict[Tuple[str, str], dict] = {}
+        self._by_norm: Dict[Tuple[str, str], dict] = {}
+
+    def __len__(self) -> int:
+        return len(self._by_name) + len(self._by_id)
+
+    def add(self, batter: Optional[str], pitcher: Optional[str], rec, batter_id=None, pitcher_id=None,
+            overwrite: bool = True) -> None:
+        """Insert a record; with overwrite=False existing keys win (used for lower-priority sources)."""
+        if not rec or not isinstance(rec, dict):
+            return
+        keys = []
+        bid, pid = _id_key(batter_id), _id_key(pitcher_id)
+        if bid and pid:
+            keys.append((self._by_id, (bid, pid)))
+        if batter and pitcher:
+            keys.append((self._by_name, (batter, pitcher)))
+            nb, np_ = _norm_name_key(batter), _norm_name_key(pitcher)
+            if nb and np_:
+                keys.append((self._by_norm, (nb, np_)))
+        for table, k in keys:
+            if overwrite or k not in table:
+                table[k] = rec
+
+    def get(self, batter: Optional[str], pitcher: Optional[str], batter_id=None, pitcher_id=None) -> Optional[dict]:
+        bid, pid = _id_key(batter_id), _id_key(pitcher_id)
+        if bid and pid:
+            rec = self._by_id.get((bid, pid))
+            if rec:
+                return rec
+        if not batter or not pitcher:
+            return None
+        rec = self._by_name.get((batter, pitcher))
+        if rec:
+            return rec
+        return self._by_norm.get((_norm_name_key(batter), _norm_name_key(pitcher)))
+
+
+def _load_h2h_js(path: str) -> Dict[str, Dict[str, dict]]:
+    """Parse the legacy `const hitterVsPitcherData = {...};` file."""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            txt = f.read()
+        marker = 'const hitterVsPitcherData ='
+        i = txt.find(marker)
+        if i == -1:
+            return {}
+        body = txt[i + len(marker):].strip()
+        if body.endswith(';'):
+            body = body[:-1]
+        body = re.sub(r"//.*", "", body)
+        body = re.sub(r"/\*[\s\S]*?\*/", "", body)
+        start = body.find('{')
+        end = body.rfind('}')
+        if start == -1 or end == -1:
+            return {}
+        json_like = body[start:end+1]
+        return json.loads(json_like)
+    except Exception:
+        return {}
+
+
+def _load_h2h_json(path: str) -> dict:
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        return data if isinstance(data, dict) else {}
+    except Exception:
+        return {}
+
+
+# The legacy JS map is undated and shared by every slate; parsed once per file version
+load_legacy_h2h = file_memo(_load_h2h_js, maxsize=1, missing=lambda js_path: {})
+
+
+def build_h2h_index(json_path: Optional[str], js_path: Optional[str] = None) -> H2HIndex:
+    """Build an index from the dated JSON (preferred) and the legacy JS (fallback)."""
+    idx = H2HIndex()
+    if json_path and os.path.exists(json_path):
+        data = _load_h2h_json(json_path)
+        for batter, by_pitcher in (data.get('h2h') or {}).items():
+            for pitcher, rec in (by_pitcher or {}).items():
+                idx.add(batter, pitcher, rec)
+        # Optional id-keyed section: { batter_id: { pitcher_id: rec } }
+        for bid, by_pid in (data.get('h2h_ids') or {}).items():
+            for pid, rec in (by_pid or {}).items():
+                idx.add(None, None, rec, batter_id=bid, pitcher_id=pid)
+    if js_path and os.path.exists(js_path):
+        for batter, by_pitcher in load_legacy_h2h(js_path).items():
+            for pitcher, rec in (by_pitcher or {}).items():
+                idx.add(batter, pitcher, rec, overwrite=False)
+    return idx
+
+
+_load_h2h_index = file_memo(build_h2h_index, maxsize=8, paths=2)
+
+
+def load_h2h_index(json_path: Optional[str], js_path: Optional[str] = None) -> H2HIndex:
+    """Memoized build_h2h_index keyed by both files' (path, mtime, size)."""
+    return _load_h2h_index(json_path, js_path)
@@ -7,19 +7,32 @@ Prefers hr_app/data but will fall back to ../data for compatibility.
 """
 from __future__ import annotations
 
-import os, json, re, unicodedata
+import os, json, re, threading, unicodedata, hashlib, gzip, zlib, base64, bisect, heapq
+from collections import OrderedDict
+from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Optional, Dict
+from typing import Optional, Dict, List
 
 from flask import Flask, jsonify, render_template, request, abort
 import time
-import requests
+from functools import lru_cache
+
+import fetch_engine
+import http_client
+from calibration_stats import get_history
+from data_catalog import get_catalog
+from file_memo import file_version
+from h2h_index import load_h2h_index
+from identity import IDENTITY_FILE, id_key, load_identity
+from live_cache import Refresher, SnapshotStore, content_etag as _content_etag
+from schedule_index import Schedule, load_schedule
+from scores_store import ScoresCache
 
 try:
     # Reuse existing fetcher to avoid duplication
-    from tools.fetch_hr_hitters import fetch_hr_hitters_for_date as _fetch_hr_hitters_for_date
+    from tools.fetch_hr_hitters import fetch_live_hr_hitters as _fetch_live_hr_hitters
 except Exception:
-    _fetch_hr_hitters_for_date = None
+    _fetch_live_hr_hitters = None
 
 APP_DIR = os.path.dirname(os.path.abspath(__file__))
 DATA_DIR_LOCAL = os.path.join(APP_DIR, 'data')
@@ -40,19 +53,7 @@ except Exception:
 
 
 def _latest_hr_scores_path(target_date: Optional[str]) -> Optional[str]:
-    dd = data_dir()
-    if target_date:
-        p = os.path.join(dd, f'hr-scores-{target_date}.json')
-        if os.path.exists(p):
-            return p
-    try:
-        files = [f for f in os.listdir(dd) if f.startswith('hr-scores-') and f.endswith('.json')]
-        if not files:
-            return None
-        files.sort(reverse=True)
-        return os.path.join(dd, files[0])
-    except FileNotFoundError:
-        return None
+    return _pick_data_file('hr-scores-', target_date)
 
 
 def _tz_today_str() -> str:
@@ -65,9 +66,22 @@ def _tz_today_str() -> str:
         return datetime.now().strftime('%Y-%m-%d')
 
 
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.environ.get(name, default))
+    except Exception:
+        return default
+
+
+# Parsed hr-scores documents, shared across requests and threads until the file changes
+_scores_cache = ScoresCache(max_entries=_env_int('SCORES_CACHE_ENTRIES', 16),
+                            max_bytes=_env_int('SCORES_CACHE_MB', 64) * 1024 * 1024)
+
+
 def _load_scores(path: str) -> Dict:
-    with open(path, 'r', encoding='utf-8') as f:
-        return json.load(f)
+    """Parsed scores (any format the generator wrote), from the shared cache.
+    The result is shared: do not mutate it; copy rows before adding fields."""
+    return _scores_cache.get(path)
 
 
 def _load_json(path: str) -> Dict:
@@ -115,20 +129,12 @@ def _norm_team(abbr: str | None) -> str | None:
 
 
 def _pick_data_file(prefix: str, target_date: str | None) -> str | None:
-    dd = data_dir()
-    if target_date:
-        p = os.path.join(dd, f"{prefix}{target_date}.json")
-        if os.path.exists(p):
-            return p
-    # fallback to latest
-    try:
-        files = [f for f in os.listdir(dd) if f.startswith(prefix) and f.endswith('.json')]
-        files.sort(reverse=True)
-        return os.path.join(dd, files[0]) if files else None
-    except FileNotFoundError:
-        return None
+    """Exact date, else the newest earlier file, else the latest (so the UI always has something to show)."""
+    path, _ = get_catalog(data_dir()).pick(prefix, target_date, allow_future=True)
+    return path
 
 
+@lru_cache(maxsize=65536)
 def _norm_name_key(name: str | None) -> str:
     s = unicodedata.normalize('NFKD', str(name or '')).encode('ascii', 'ignore').decode('ascii')
     s = s.strip()
@@ -235,75 +241,32 @@ def _team_abbr_from_schedule_team(team_obj: dict) -> str | None:
     return _norm_team(ab) if ab else None
 
 
-def _find_game_for_team(schedule: dict, team_abbr: str) -> dict | None:
-    games = schedule.get('games') or schedule.get('dates', [{}])[0].get('games', [])
-    for g in games:
-        teams_obj = g.get('teams') or {}
-        home_t = teams_obj.get('home', {}).get('team', {})
-        away_t = teams_obj.get('away', {}).get('team', {})
-        home_abbr = _team_abbr_from_schedule_team(home_t)
-        away_abbr = _team_abbr_from_schedule_team(away_t)
-        if team_abbr == home_abbr or team_abbr == away_abbr:
-            return g
-    return None
-
-
-def _opponent_for_team(schedule: dict, team_abbr: str) -> tuple[str | None, bool | None]:
-    """Return (opponent_abbr, is_home) for this team from the schedule, or (None, None)."""
-    g = _find_game_for_team(schedule, team_abbr)
-    if not g:
-        return None, None
-    teams_obj = g.get('teams') or {}
-    home_t = teams_obj.get('home', {}).get('team', {})
-    away_t = teams_obj.get('away', {}).get('team', {})
-    home_ab = _team_abbr_from_schedule_team(home_t)
-    away_ab = _team_abbr_from_schedule_team(away_t)
-    if team_abbr == home_ab:
-        return away_ab, True
-    if team_abbr == away_ab:
-        return home_ab, False
-    return None, None
-
-
-def _games_for_date(schedule: dict) -> list[dict]:
-    games = schedule.get('games') or schedule.get('dates', [{}])[0].get('games', [])
+def _schedule_path_for(target_date: str | None) -> str:
+    return _pick_data_file('fresh-schedule-', target_date) or os.path.join(data_dir(), 'todays-schedule.json')
+
+
+def _load_schedule_for(target_date: str | None) -> Schedule:
+    """Parsed schedule for the date (memoized per file by schedule_index)."""
+    return load_schedule(_schedule_path_for(target_date), _norm_team)
+
+
+def _games_for_date(schedule: Schedule) -> list[dict]:
     out = []
-    for g in games:
-        game_pk = g.get('gamePk') or g.get('gamePk'.lower())
-        teams_obj = g.get('teams') or {}
-        home_t = teams_obj.get('home', {}).get('team', {})
-        away_t = teams_obj.get('away', {}).get('team', {})
-        home_ab = _team_abbr_from_schedule_team(home_t)
-        away_ab = _team_abbr_from_schedule_team(away_t)
-        if not home_ab or not away_ab or not game_pk:
+    for g in schedule.games:
+        if not g.home or not g.away or not g.game_pk:
             continue
-        out.append({'value': str(game_pk), 'home': home_ab, 'away': away_ab, 'label': f"{home_ab} vs {away_ab}"})
+        out.append({'value': g.game_pk, 'home': g.home, 'away': g.away, 'label': f"{g.home} vs {g.away}"})
     return out
 
 
-def _team_game_states(schedule: dict) -> dict[str, str]:
+def _team_game_states(schedule: Schedule) -> dict[str, str]:
     """Map team abbr -> state code: LIVE | FINAL | SCHEDULED (or PREVIEW)."""
     states: dict[str, str] = {}
-    games = schedule.get('games') or schedule.get('dates', [{}])[0].get('games', [])
-    for g in games:
-        teams_obj = g.get('teams') or {}
-        home_t = teams_obj.get('home', {}).get('team', {})
-        away_t = teams_obj.get('away', {}).get('team', {})
-        home_ab = _team_abbr_from_schedule_team(home_t)
-        away_ab = _team_abbr_from_schedule_team(away_t)
-        st = (g.get('status') or {})
-        abs_state = (st.get('abstractGameState') or st.get('detailedState') or '').strip()
-        code = 'SCHEDULED'
-        if abs_state.lower().startswith('live') or abs_state.lower() in ('in progress', 'in-progress'):
-            code = 'LIVE'
-        elif abs_state.lower().startswith('final'):
-            code = 'FINAL'
-        elif abs_state.lower().startswith('preview'):
-            code = 'SCHEDULED'
-        if home_ab:
-            states[home_ab] = code
-        if away_ab:
-            states[away_ab] = code
+    for g in schedule.games:
+        if g.home:
+            states[g.home] = g.state
+        if g.away:
+            states[g.away] = g.state
     return states
 
 
@@ -319,24 +282,100 @@ def _player_id_map(players_path: str | None) -> dict:
     return out
 
 
-def _filter_sort_limit(data: Dict, team: Optional[str] = None, limit: Optional[int] = None) -> Dict:
-    players = data.get('players', [])
-    if team:
-        players = [p for p in players if p.get('team') == team]
-    players = sorted(players, key=lambda p: p.get('hr_score', 0), reverse=True)
-    if limit is not None:
-        players = players[:limit]
-    out = dict(data)
-    out['players'] = players
-    out['shown_players'] = len(players)
-    return out
+def _player_id_for(p: dict, id_map: dict) -> int | None:
+    """MLBAM id for a score row: the row's own id, the date's player-stats, then the identity map."""
+    pid = id_key(p.get('mlbam_id')) or id_key(id_map.get((p.get('name'), p.get('team'))))
+    if pid is None:
+        pid = load_identity().resolve(p.get('name'), p.get('team'))
+    return pid
+
+
+# Encoded JSON bodies for conditional responses: (etag, accepted encoding) -> (body, applied encoding)
+_ENCODED_BODIES: 'OrderedDict[tuple, tuple]' = OrderedDict()
+_ENCODED_BODIES_MAX = 32
+_ENCODED_BODIES_LOCK = threading.Lock()
+# Bodies smaller than this are sent uncompressed
+_COMPRESS_MIN_BYTES = 1024
+
+
+def _etag_for(*parts) -> str:
+    return hashlib.sha1(repr(parts).encode('utf-8')).hexdigest()[:24]
+
+
+def _preferred_encoding() -> Optional[str]:
+    """gzip or deflate when the client accepts it (gzip on ties), else None."""
+    accept = request.accept_encodings
+    best, best_q = None, 0.0
+    for enc in ('gzip', 'deflate'):
+        q = accept.quality(enc)
+        if q > best_q:
+            best, best_q = enc, q
+    return best
+
+
+def _not_modified(etag: str, last_modified: Optional[float]) -> bool:
+    tags = request.if_none_match
+    if tags:
+        if tags.star_tag:
+            return True
+        # Tags we sent carry an encoding suffix; any representation of this version matches
+        return any(t.split('-', 1)[0] == etag for t in tags.as_set(include_weak=True))
+    since = request.if_modified_since
+    return bool(since and last_modified and int(last_modified) <= since.timestamp())
+
+
+def _conditional_json(build, etag: str, last_modified: Optional[float] = None):
+    """JSON response with a strong ETag, Last-Modified, 304 handling and gzip/deflate.
+
+    etag identifies the payload version (source file fingerprint plus query,
+    or a snapshot's content hash); build() is called only when a body is
+    actually sent, and encoded bodies are reused per (etag, encoding).
+    """
+    encoding = _preferred_encoding()
+    if _not_modified(etag, last_modified):
+        resp = app.response_class(status=304)
+    else:
+        key = (etag, encoding)
+        with _ENCODED_BODIES_LOCK:
+            entry = _ENCODED_BODIES.get(key)
+            if entry is not None:
+                _ENCODED_BODIES.move_to_end(key)
+        if entry is None:
+            body = jsonify(build()).get_data()
+            applied = encoding if encoding and len(body) >= _COMPRESS_MIN_BYTES else None
+            if applied == 'gzip':
+                body = gzip.compress(body, 6, mtime=0)
+            elif applied == 'deflate':
+                body = zlib.compress(body, 6)
+            entry = (body, applied)
+            with _ENCODED_BODIES_LOCK:
+                _ENCODED_BODIES[key] = entry
+                while len(_ENCODED_BODIES) > _ENCODED_BODIES_MAX:
+                    _ENCODED_BODIES.popitem(last=False)
+        resp = app.response_class(entry[0], mimetype=app.json.mimetype)
+        if entry[1]:
+            resp.headers['Content-Encoding'] = entry[1]
+    resp.set_etag(f"{etag}-{encoding}" if encoding else etag)
+    if last_modified:
+        resp.last_modified = int(last_modified)
+    resp.headers['Cache-Control'] = 'no-cache'
+    resp.vary.add('Accept-Encoding')
+    return resp
 
 
 @app.route('/api/hr-scores')
 def api_hr_scores():
-    date = request.args.get('date') or _tz_today_str()
-    team = request.args.get('team')
-    limit = request.args.get('limit')
+    """Scored players for a date, best first.
+    Query: date, limit (1-500), team, plus optional
+      fields=name,team,hr_score,stats.homeRuns   projection (top-level or one nested key)
+      offset=N | cursor=<next_cursor>            pagination
+      min_score=, teams=NYY,BOS, game=<game_pk>, has_odds=1|0   filters
+    With any optional parameter the response also carries total_matches, offset and next_cursor.
+    """
+    args = request.args
+    date = args.get('date') or _tz_today_str()
+    team = args.get('team')
+    limit = args.get('limit')
     limit_i = None
     if limit:
         try:
@@ -344,12 +383,55 @@ def api_hr_scores():
         except Exception:
             limit_i = None
 
-    path = _latest_hr_scores_path(date)
-    if not path:
+    view = _scores_index(date)
+    if view is None:
         return jsonify({'error': 'No hr-scores files found', 'date': date}), 404
-    data = _load_scores(path)
-    filtered = _filter_sort_limit(data, team=team, limit=limit_i)
-    return jsonify(filtered)
+    paged = any(args.get(k) for k in ('fields', 'offset', 'cursor', 'min_score', 'teams', 'game', 'has_odds'))
+    try:
+        offset = _cursor_offset(view, args.get('cursor')) if args.get('cursor') else max(0, int(args.get('offset') or 0))
+        min_score = float(args['min_score']) if args.get('min_score') else None
+        game = str(int(args['game'])) if args.get('game') else None
+    except ValueError as e:
+        return jsonify({'error': str(e) or 'invalid parameter'}), 400
+    has_odds = None
+    if args.get('has_odds'):
+        has_odds = args['has_odds'].strip().lower() in ('1', 'true', 'yes', 'on')
+    fields = _split_list_arg('fields')
+
+    allowed = None
+    if team:
+        allowed = {team}
+    if args.get('teams'):
+        wanted = {t for raw in _split_list_arg('teams') for t in (raw, _norm_team(raw)) if t}
+        allowed = wanted if allowed is None else allowed & wanted
+    if game:
+        wanted = set(view.game_teams.get(game, ()))
+        allowed = wanted if allowed is None else allowed & wanted
+
+    def build():
+        ranks = _match_ranks(view, allowed, min_score, has_odds)
+        page = ranks[offset:offset + limit_i] if limit_i is not None else ranks[offset:]
+        rows = [view.ranked[r] for r in page]
+        out = dict(view.meta)
+        out['players'] = [_project(p, fields) for p in rows] if fields else rows
+        out['shown_players'] = len(rows)
+        if paged:
+            end = offset + len(rows)
+            out['total_matches'] = len(ranks)
+            out['offset'] = offset
+            out['next_cursor'] = _make_cursor(view, end) if end < len(ranks) else None
+        return out
+
+    etag = _etag_for(view.key, date, sorted(args.items(multi=True)))
+    return _conditional_json(build, etag, view.modified)
+
+
+@app.route('/api/cache-stats')
+def api_cache_stats():
+    return jsonify({'scores': _scores_cache.stats(),
+                    'live_refresher': _live_refresher.stats(),
+                    'http': http_client.stats(),
+                    'fetch_engine': fetch_engine.stats()})
 
 
 @app.route('/version')
@@ -358,47 +440,95 @@ def version():
     return jsonify({'ui': 'cards-v1', 'date': datetime.now().isoformat()})
 
 
-@app.route('/')
-def index():
-    # If no date query, use America/Los_Angeles today
-    date = request.args.get('date')
-    tz_today = _tz_today_str()
-    effective_date = date or tz_today
-    team = request.args.get('team')
-    game = request.args.get('game')
-    try:
-        limit = int(request.args.get('limit', '50'))
-    except Exception:
-        limit = 50
+@dataclass
+class IndexView:
+    """Per-date index page data, built once per version of its source files.
 
-    path = _latest_hr_scores_path(effective_date)
-    if not path:
-        abort(404, description='No hr-scores files found. Run generate_hr_scores.py first.')
-    data = _load_scores(path)
+    ``players`` is the full slate sorted by score, each row already carrying
+    the display fields (image, branding, matchup, game state, homered, odds,
+    value and EV). Rows are shared between requests: copy before adding
+    per-request fields such as value tiers.
+    """
+    key: tuple
+    date: Optional[str]
+    generated_at: Optional[str]
+    total_players: Optional[int]
+    players: List[dict] = field(default_factory=list)
+    games: List[dict] = field(default_factory=list)
+    topk_summary: List[dict] = field(default_factory=list)
+
+
+class _DateCache:
+    """Small per-date LRU of derived views; an entry is rebuilt when its source key changes."""
+
+    def __init__(self, max_dates: int = 8):
+        self.max_dates = max_dates
+        self._lock = threading.Lock()
+        self._entries: 'OrderedDict[str, tuple]' = OrderedDict()
+
+    def get(self, date: str, key: tuple, build):
+        with self._lock:
+            entry = self._entries.get(date)
+            if entry is not None and entry[0] == key:
+                self._entries.move_to_end(date)
+                return entry[1]
+        value = build()
+        with self._lock:
+            self._entries[date] = (key, value)
+            self._entries.move_to_end(date)
+            while len(self._entries) > self.max_dates:
+                self._entries.popitem(last=False)
+        return value
+
+
+def _sources_key(sources: Dict[str, Optional[str]], env_names=()) -> tuple:
+    return (tuple(file_version(p) for p in sources.values()), tuple(os.environ.get(k) for k in env_names))
+
+
+_index_views = _DateCache()
+# Env settings baked into the view's rows
+_INDEX_VIEW_ENV = ('HR_PROP_VIG_EST', 'VALUE_BADGE_MIN_PP')
+
+
+def _index_sources(effective_date: str) -> Dict[str, Optional[str]]:
+    """Every file the index view for a date is derived from."""
+    return {
+        'scores': _latest_hr_scores_path(effective_date),
+        'schedule': _schedule_path_for(effective_date),
+        'players': _pick_data_file('player-stats-', effective_date),
+        'hr_hitters': os.path.join(data_dir(), f"hr-hitters-{effective_date}.json") if effective_date else None,
+        'odds': _pick_data_file('player-hr-odds-', effective_date),
+        'identity': IDENTITY_FILE,
+    }
+
+
+def _index_view(effective_date: str) -> Optional[IndexView]:
+    """Cached view for the date, rebuilt when any source file (or baked-in setting) changes; None without scores."""
+    sources = _index_sources(effective_date)
+    if not sources['scores']:
+        return None
+    key = _sources_key(sources, _INDEX_VIEW_ENV)
+    return _index_views.get(effective_date, key, lambda: _build_index_view(effective_date, sources, key))
+
+
+def _build_index_view(effective_date: str, sources: Dict[str, Optional[str]], key: tuple) -> IndexView:
+    data = _load_scores(sources['scores'])
 
     # Load schedule and build games list for the selected date
-    dd = data_dir()
-    sched_path = _pick_data_file('fresh-schedule-', effective_date) or os.path.join(dd, 'todays-schedule.json')
-    schedule = _load_json(sched_path) if sched_path and os.path.exists(sched_path) else {}
-    games = _games_for_date(schedule) if schedule else []
-    team_states = _team_game_states(schedule) if schedule else {}
-    # Determine selected date (explicit query param or the data file's date)
-    today_str = tz_today
-    selected_date = date or data.get('date') or tz_today
-    is_today = (selected_date == today_str)
+    schedule = _load_schedule_for(effective_date)
+    games = _games_for_date(schedule)
+    team_states = _team_game_states(schedule)
 
     # Build a full-slate sorted list for top-K metrics BEFORE any filtering
     players_all_sorted = sorted(list(data.get('players', [])), key=lambda p: p.get('hr_score', 0), reverse=True)
     # Player id map and ground truth homers for the date
-    players_path = _pick_data_file('player-stats-', effective_date)
-    id_map = _player_id_map(players_path)
+    id_map = _player_id_map(sources['players'])
     hr_hitters = {}
     try:
-        if effective_date:
-            exact_hr_path = os.path.join(dd, f"hr-hitters-{effective_date}.json")
-            if os.path.exists(exact_hr_path):
-                hr_json = _load_json(exact_hr_path)
-                hr_hitters = hr_json.get('hitters') or {}
+        exact_hr_path = sources['hr_hitters']
+        if exact_hr_path and os.path.exists(exact_hr_path):
+            hr_json = _load_json(exact_hr_path)
+            hr_hitters = hr_json.get('hitters') or {}
     except Exception:
         hr_hitters = {}
 
@@ -430,59 +560,25 @@ def index():
         return out
     topk_summary = _topk_summary(players_all_sorted) if hr_hitters else []
 
-    # Optional game filter: restrict players to the selected game's teams
-    if game and games:
-        try:
-            game_pk = str(int(game))
-        except Exception:
-            game_pk = None
-        if game_pk:
-            match = next((g for g in games if g['value'] == game_pk), None)
-            if match:
-                allowed = {match['home'], match['away']}
-                # Pre-filter players by game teams
-                data = dict(data)
-                data['players'] = [p for p in data.get('players', []) if p.get('team') in allowed]
-
     # Load player HR odds for the effective date
     odds_map, odds_source = _load_player_hr_odds(effective_date)
 
-    filtered = _filter_sort_limit(data, team=team, limit=limit)
-
-    team_codes = sorted(list({p.get('team') for p in data.get('players', []) if p.get('team')}))
-
-    # Attach image URLs and team branding for the shown players
-    # schedule is already loaded above
-    # HR hitters already loaded above for summary
     # Value threshold (percentage points) for showing a badge
     try:
         value_thresh_pp = float(os.environ.get('VALUE_BADGE_MIN_PP', '1.5'))
     except Exception:
         value_thresh_pp = 1.5
-    # Strong tier threshold (optional env), default 3.0 or at least 1 above base
     try:
-        strong_value_thresh_pp = float(os.environ.get('VALUE_BADGE_STRONG_PP', '3.0'))
+        vig_est = float(os.environ.get('HR_PROP_VIG_EST', '0.03'))
     except Exception:
-        strong_value_thresh_pp = 3.0
-    if strong_value_thresh_pp < value_thresh_pp + 0.5:
-        strong_value_thresh_pp = max(value_thresh_pp + 0.5, strong_value_thresh_pp)
-    # Dynamic percentile-based thresholds (optional)
-    value_dynamic_enabled = (os.environ.get('VALUE_BADGE_DYNAMIC', '0').lower() in ('1','true','yes'))
-    try:
-        value_pctl = float(os.environ.get('VALUE_BADGE_VALUE_PCTL', '0.75'))  # 75th percentile
-    except Exception:
-        value_pctl = 0.75
-    try:
-        strong_pctl = float(os.environ.get('VALUE_BADGE_STRONG_PCTL', '0.9'))  # 90th percentile
-    except Exception:
-        strong_pctl = 0.9
-    try:
-        min_model_prob_for_value = float(os.environ.get('VALUE_BADGE_MIN_MODEL_PROB', '0.05'))  # raised default gate
-    except Exception:
-        min_model_prob_for_value = 0.05
+        vig_est = 0.03
 
-    for p in filtered.get('players', []):
-        pid = id_map.get((p.get('name'), p.get('team')))
+    # Attach image URLs, team branding, matchup and odds value to copies of the cached score rows
+    rows = []
+    for p in players_all_sorted:
+        p = dict(p)
+        rows.append(p)
+        pid = _player_id_for(p, id_map)
         if pid:
             p['image_url'] = f"https://img.mlbstatic.com/mlb-photos/image/upload/w_256,q_auto:best/v1/people/{pid}/headshot/silo/current"
             p['mlbam_id'] = int(pid)
@@ -502,7 +598,7 @@ def index():
         else:
             p['homered'] = False
         # Opponent and matchup text
-        opp, is_home = _opponent_for_team(schedule, t) if t and schedule else (None, None)
+        opp, is_home = schedule.opponent(t)
         p['opponent_team'] = opp
         if opp:
             p['matchup'] = f"{t} vs {opp}" if is_home else f"{t} @ {opp}"
@@ -512,17 +608,13 @@ def index():
         p['game_state'] = team_states.get(t) if t else None
         # Attach odds if available
         try:
-            key = _norm_name_key(p.get('name'))
-            om = odds_map.get(key)
+            key_n = _norm_name_key(p.get('name'))
+            om = odds_map.get(key_n)
             if om:
                 p['odds_prob'] = om.get('best_prob')
                 p['odds_american'] = om.get('best_american')
                 p['odds_source'] = odds_source
                 # Vig adjustment heuristic: reduce market prob by vig / sqrt(n_offers)
-                try:
-                    vig_est = float(os.environ.get('HR_PROP_VIG_EST', '0.03'))
-                except Exception:
-                    vig_est = 0.03
                 offer_count = len(om.get('offers', [])) if isinstance(om.get('offers'), list) else 1
                 eff_vig = vig_est / max(1.0, offer_count ** 0.5)
                 p_market_raw = om.get('best_prob')
@@ -577,9 +669,83 @@ def index():
         except Exception:
             pass
 
+    return IndexView(key=key, date=data.get('date'), generated_at=data.get('generated_at'),
+                     total_players=data.get('total_players'), players=rows, games=games,
+                     topk_summary=topk_summary)
+
+
+@app.route('/')
+def index():
+    # If no date query, use America/Los_Angeles today
+    date = request.args.get('date')
+    tz_today = _tz_today_str()
+    effective_date = date or tz_today
+    team = request.args.get('team')
+    game = request.args.get('game')
+    try:
+        limit = int(request.args.get('limit', '50'))
+    except Exception:
+        limit = 50
+
+    view = _index_view(effective_date)
+    if view is None:
+        abort(404, description='No hr-scores files found. Run generate_hr_scores.py first.')
+    games = view.games
+    # Determine selected date (explicit query param or the data file's date)
+    today_str = tz_today
+    selected_date = date or view.date or tz_today
+    is_today = (selected_date == today_str)
+
+    # Optional game filter: restrict players to the selected game's teams
+    players = view.players
+    if game and games:
+        try:
+            game_pk = str(int(game))
+        except Exception:
+            game_pk = None
+        if game_pk:
+            match = next((g for g in games if g['value'] == game_pk), None)
+            if match:
+                allowed = {match['home'], match['away']}
+                players = [p for p in players if p.get('team') in allowed]
+
+    team_codes = sorted(list({p.get('team') for p in players if p.get('team')}))
+
+    # View rows are already sorted by score; tiers below are per request, so set them on copies
+    if team:
+        players = [p for p in players if p.get('team') == team]
+    shown_players = [dict(p) for p in players[:limit]]
+
+    # Value threshold (percentage points) for showing a badge
+    try:
+        value_thresh_pp = float(os.environ.get('VALUE_BADGE_MIN_PP', '1.5'))
+    except Exception:
+        value_thresh_pp = 1.5
+    # Strong tier threshold (optional env), default 3.0 or at least 1 above base
+    try:
+        strong_value_thresh_pp = float(os.environ.get('VALUE_BADGE_STRONG_PP', '3.0'))
+    except Exception:
+        strong_value_thresh_pp = 3.0
+    if strong_value_thresh_pp < value_thresh_pp + 0.5:
+        strong_value_thresh_pp = max(value_thresh_pp + 0.5, strong_value_thresh_pp)
+    # Dynamic percentile-based thresholds (optional)
+    value_dynamic_enabled = (os.environ.get('VALUE_BADGE_DYNAMIC', '0').lower() in ('1','true','yes'))
+    try:
+        value_pctl = float(os.environ.get('VALUE_BADGE_VALUE_PCTL', '0.75'))  # 75th percentile
+    except Exception:
+        value_pctl = 0.75
+    try:
+        strong_pctl = float(os.environ.get('VALUE_BADGE_STRONG_PCTL', '0.9'))  # 90th percentile
+    except Exception:
+        strong_pctl = 0.9
+    try:
+        min_model_prob_for_value = float(os.environ.get('VALUE_BADGE_MIN_MODEL_PROB', '0.05'))  # raised default gate
+    except Exception:
+        min_model_prob_for_value = 0.05
+
     # Dynamic threshold adjustment & badge assignment
     if value_dynamic_enabled:
-        vals = [p.get('value_pp') for p in filtered.get('players', []) if isinstance(p.get('value_pp'), (int,float))]
+        vals = [p.get('value_pp') for p in shown_players if isinstance(p.get('value_pp'), (int,float))]
         if len(vals) >= 8:  # need a reasonable sample
             sorted_vals = sorted(vals)
             def pct(vs, q):
@@ -600,7 +766,7 @@ def index():
             strong_value_thresh_pp = value_thresh_pp + 0.25
 
     # Clear any prior tiers before capped assignment
-    for p in filtered.get('players', []):
+    for p in shown_players:
         p['value_tier'] = None
 
     # Additional gating: limit counts & enforce absolute floors to avoid badge saturation
@@ -623,7 +789,7 @@ def index():
 
     # Collect qualified players
     qualified = []
-    for p in filtered.get('players', []):
+    for p in shown_players:
         vpp = p.get('value_pp')
         mp = p.get('model_prob')
         if mp is None:
@@ -662,31 +828,31 @@ def index():
                 total_assigned += 1
 
     # Any others set to None explicitly
-    for p in filtered.get('players', []):
+    for p in shown_players:
         if p.get('value_tier') not in ('value','strong'):
             p['value_tier'] = None
 
     try:
         # Lightweight debug summary (prints once per request)
-        strong_cnt = sum(1 for p in filtered.get('players', []) if p.get('value_tier')=='strong')
-        value_cnt = sum(1 for p in filtered.get('players', []) if p.get('value_tier')=='value')
+        strong_cnt = sum(1 for p in shown_players if p.get('value_tier')=='strong')
+        value_cnt = sum(1 for p in shown_players if p.get('value_tier')=='value')
         print(f"[VALUE_BADGES] strong={strong_cnt} value={value_cnt} thresh_val={value_thresh_pp} thresh_strong={strong_value_thresh_pp}")
     except Exception:
         pass
 
     return render_template('hr_scores.html',
-                           date=filtered.get('date'),
-                           generated_at=filtered.get('generated_at'),
-                           total=filtered.get('total_players'),
-                           shown=filtered.get('shown_players'),
+                           date=view.date,
+                           generated_at=view.generated_at,
+                           total=view.total_players,
+                           shown=len(shown_players),
                            limit=limit,
                            game=game,
                            team=team,
                            team_codes=team_codes,
                games=games,
                is_today=is_today,
-               players=filtered.get('players', []),
-               topk_summary=topk_summary,
+               players=shown_players,
+               topk_summary=view.topk_summary,
                value_thresh_pp=value_thresh_pp,
                strong_value_thresh_pp=strong_value_thresh_pp,
                value_dynamic_enabled=value_dynamic_enabled,
@@ -697,30 +863,93 @@ def index():
                value_badge_abs_min_value=abs_min_value)
 
 
-@app.route('/api/player-detail')
-def api_player_detail():
-    date = request.args.get('date') or _tz_today_str()
-    name = request.args.get('name')
-    team = request.args.get('team')
-    if not name:
-        return jsonify({'error': 'name is required'}), 400
+@dataclass
+class PlayerIndex:
+    """Per-date player-detail payloads, joined once per version of their source files.
 
-    scores_path = _latest_hr_scores_path(date)
-    if not scores_path:
-        return jsonify({'error': 'No hr-scores files found', 'date': date}), 404
-    scores = _load_scores(scores_path)
-    # find player row
-    candidates = [p for p in scores.get('players', []) if p.get('name') == name]
-    if team:
-        candidates = [p for p in candidates if p.get('team') == team]
-    if not candidates:
-        return jsonify({'error': 'player not found'}), 404
-    player = candidates[0]
+    Payloads are looked up by (name, team), by name alone (first row in file
+    order, as the endpoint always resolved it) and by MLBAM id; ``ranked``
+    lists them by score. They are shared between requests and must not be
+    mutated.
+    """
+    key: tuple
+    ranked: List[dict] = field(default_factory=list)
+    by_name_team: Dict[tuple, dict] = field(default_factory=dict)
+    by_name: Dict[str, dict] = field(default_factory=dict)
+    by_id: Dict[int, dict] = field(default_factory=dict)
+
+    def find(self, name: Optional[str] = None, team: Optional[str] = None, pid=None) -> Optional[dict]:
+        if pid is not None:
+            detail = self.by_id.get(id_key(pid))
+            if detail is not None or not name:
+                return detail
+        if team:
+            return self.by_name_team.get((name, team))
+        return self.by_name.get(name)
+
+
+_player_indexes = _DateCache()
+
+
+def _player_index_sources(date: str) -> Dict[str, Optional[str]]:
+    """Every file the detail payloads for a date are derived from."""
+    dd = data_dir()
+    return {
+        'scores': _latest_hr_scores_path(date),
+        'schedule': _schedule_path_for(date),
+        'players': _pick_data_file('player-stats-', date),
+        'ballpark': _pick_data_file('ballpark-weather-', date),
+        'h2h': _pick_data_file('hitter-vs-pitcher-', date),
+        'h2h_js': os.path.join(dd, 'hitter-vs-pitcher.js'),
+        'odds': _pick_data_file('player-hr-odds-', date),
+        'identity': IDENTITY_FILE,
+    }
+
+
+def _player_index(date: str) -> Optional[PlayerIndex]:
+    """Cached detail index for the date, rebuilt when any source file changes; None without scores."""
+    sources = _player_index_sources(date)
+    if not sources['scores']:
+        return None
+    key = _sources_key(sources)
+    return _player_indexes.get(date, key, lambda: _build_player_index(date, sources, key))
+
+
+def _build_player_index(date: str, sources: Dict[str, Optional[str]], key: tuple) -> PlayerIndex:
+    scores = _load_scores(sources['scores'])
+    id_map = _player_id_map(sources['players'])
+    schedule = _load_schedule_for(date)
+    bw_path = sources['ballpark']
+    ballpark = _load_json(bw_path) if bw_path and os.path.exists(bw_path) else {}
+    try:
+        h2h_idx = load_h2h_index(sources['h2h'], sources['h2h_js'])
+    except Exception:
+        h2h_idx = None
+    try:
+        odds_map, odds_source = _load_player_hr_odds(date)
+    except Exception:
+        odds_map, odds_source = {}, None
 
-    # image id
-    players_path = _pick_data_file('player-stats-', date)
-    id_map = _player_id_map(players_path)
-    pid = id_map.get((player.get('name'), player.get('team')))
+    index = PlayerIndex(key=key)
+    for player in scores.get('players', []):
+        name = player.get('name')
+        team = player.get('team')
+        if (name, team) in index.by_name_team:
+            continue
+        pid = _player_id_for(player, id_map)
+        detail = _player_detail(scores, player, pid, schedule, ballpark, h2h_idx, odds_map, odds_source)
+        index.by_name_team[(name, team)] = detail
+        index.by_name.setdefault(name, detail)
+        if pid is not None:
+            index.by_id.setdefault(pid, detail)
+    index.ranked = sorted(index.by_name_team.values(), key=lambda d: d.get('hr_score') or 0, reverse=True)
+    return index
+
+
+def _player_detail(scores: dict, player: dict, pid: Optional[int], schedule: Schedule, ballpark: dict,
+                   h2h_idx, odds_map: dict, odds_source: Optional[str]) -> dict:
+    """Modal payload for one score row, joined with park, weather, H2H and odds."""
+    name = player.get('name')
     image_url = (
         f"https://img.mlbstatic.com/mlb-photos/image/upload/w_512,q_auto:best/v1/people/{pid}/headshot/silo/current"
         if pid else
@@ -728,34 +957,21 @@ def api_player_detail():
     )
 
     # schedule + ballpark/weather
-    dd = data_dir()
-    sched_path = _pick_data_file('fresh-schedule-', date) or os.path.join(dd, 'todays-schedule.json')
-    schedule = _load_json(sched_path) if sched_path and os.path.exists(sched_path) else {}
-    game = _find_game_for_team(schedule, player.get('team')) if schedule else None
-    home_abbr = None
     opp_pitcher = player.get('opposing_pitcher')
     t = _norm_team(player.get('team'))
     # Opponent team code for modal display
-    opp_team, _is_home = _opponent_for_team(schedule, t) if t and schedule else (None, None)
-    if game:
-        teams_obj = game.get('teams') or {}
-        home_abbr = _team_abbr_from_schedule_team(teams_obj.get('home', {}).get('team', {}))
-    park_team = home_abbr
-    park_key = f"{park_team}_park" if park_team else None
-    bw_path = _pick_data_file('ballpark-weather-', date)
-    ballpark = _load_json(bw_path) if bw_path and os.path.exists(bw_path) else {}
+    opp_team, _is_home = schedule.opponent(t)
+    home_abbr = schedule.home_team(t)
+    park_key = schedule.park_key(t)
     pf = (ballpark.get('ballpark_factors') or {}).get(park_key or '', {})
     wc = (ballpark.get('weather_conditions') or {}).get(park_key or '', {})
 
-    # hitter vs pitcher
+    # hitter vs pitcher (shared index: dated JSON + legacy JS, id and normalized-name fallbacks)
     h2h = {}
     try:
-        h2h_path = _pick_data_file('hitter-vs-pitcher-', date)
-        if h2h_path and os.path.exists(h2h_path):
-            h2h_json = _load_json(h2h_path)
-            rec = ((h2h_json.get('h2h') or {}).get(name) or {}).get(opp_pitcher)
-            if isinstance(rec, dict):
-                h2h = rec
+        rec = h2h_idx.get(name, opp_pitcher, batter_id=pid) if h2h_idx is not None else None
+        if isinstance(rec, dict):
+            h2h = rec
     except Exception:
         h2h = {}
 
@@ -766,38 +982,29 @@ def api_player_detail():
     # Player odds (best + offers)
     odds_best = None
     odds_offers = []
-    try:
-        odds_map, odds_source = _load_player_hr_odds(date)
-        key = _norm_name_key(player.get('name'))
-        om = odds_map.get(key)
-        if om:
-            odds_best = {
-                'best_prob': om.get('best_prob'),
-                'best_american': om.get('best_american'),
-                'source': odds_source
-            }
-            odds_offers = om.get('offers') or []
-            # Compute value details for modal
-            try:
-                p_model = max(0.0, min(1.0, (player.get('hr_score') or 0) / 100.0))
-                p_market = float(om.get('best_prob')) if om.get('best_prob') is not None else None
-                fair_amer = _prob_to_american(p_model)
-                value_pp = ((p_model - p_market) * 100.0) if p_market is not None else None
-            except Exception:
-                fair_amer = None
-                value_pp = None
-        else:
+    fair_amer = None
+    value_pp = None
+    om = odds_map.get(_norm_name_key(name))
+    if om:
+        odds_best = {
+            'best_prob': om.get('best_prob'),
+            'best_american': om.get('best_american'),
+            'source': odds_source
+        }
+        odds_offers = om.get('offers') or []
+        # Compute value details for modal
+        try:
+            p_model = max(0.0, min(1.0, (player.get('hr_score') or 0) / 100.0))
+            p_market = float(om.get('best_prob')) if om.get('best_prob') is not None else None
+            fair_amer = _prob_to_american(p_model)
+            value_pp = ((p_model - p_market) * 100.0) if p_market is not None else None
+        except Exception:
             fair_amer = None
             value_pp = None
-    except Exception:
-        odds_best = None
-        odds_offers = []
-        fair_amer = None
-        value_pp = None
 
-    detail = {
+    return {
         'date': scores.get('date'),
-        'name': player.get('name'),
+        'name': name,
         'team': player.get('team'),
         'position': player.get('position'),
         'image_url': image_url,
@@ -834,9 +1041,197 @@ def api_player_detail():
         },
         'h2h': h2h
     }
+
+
+@dataclass
+class ScoresIndex:
+    """Per-date hr-scores rows pre-sorted by score and partitioned for /api/hr-scores.
+
+    ``ranked`` holds the cached rows best first; the partitions hold ranks
+    (positions in ``ranked``) in ascending order, so a filtered page walks
+    only the rows it can return. Rows are shared and must not be mutated.
+    """
+    key: tuple
+    modified: Optional[float]
+    meta: Dict = field(default_factory=dict)
+    ranked: List[dict] = field(default_factory=list)
+    # Negated scores, ascending, for bisecting min_score
+    neg_scores: List[float] = field(default_factory=list)
+    by_team: Dict[str, List[int]] = field(default_factory=dict)
+    with_odds: List[int] = field(default_factory=list)
+    game_teams: Dict[str, tuple] = field(default_factory=dict)
+
+
+_scores_indexes = _DateCache()
+
+
+def _scores_index(date: str) -> Optional[ScoresIndex]:
+    """Cached sorted/partitioned rows for the date, rebuilt when the scores, schedule or odds change."""
+    sources = {
+        'scores': _latest_hr_scores_path(date),
+        'schedule': _schedule_path_for(date),
+        'odds': _pick_data_file('player-hr-odds-', date),
+    }
+    if not sources['scores']:
+        return None
+    key = _sources_key(sources)
+    return _scores_indexes.get(date, key, lambda: _build_scores_index(date, sources, key))
+
+
+def _build_scores_index(date: str, sources: Dict[str, Optional[str]], key: tuple) -> ScoresIndex:
+    data = _load_scores(sources['scores'])
+    ranked = sorted(data.get('players', []), key=lambda p: p.get('hr_score') or 0, reverse=True)
+    odds_map, _src = _load_player_hr_odds(date)
+    view = ScoresIndex(
+        key=key,
+        modified=max((v[1] / 1e9 for v in key[0] if v), default=None),
+        meta={k: v for k, v in data.items() if k != 'players'},
+        ranked=ranked,
+        neg_scores=[-(p.get('hr_score') or 0) for p in ranked],
+    )
+    for r, p in enumerate(ranked):
+        view.by_team.setdefault(p.get('team'), []).append(r)
+        if odds_map and _norm_name_key(p.get('name')) in odds_map:
+            view.with_odds.append(r)
+    view.game_teams = {g['value']: (g['home'], g['away']) for g in _games_for_date(_load_schedule_for(date))}
+    return view
+
+
+def _match_ranks(view: ScoresIndex, teams: Optional[set], min_score: Optional[float],
+                 has_odds: Optional[bool]) -> List[int]:
+    """Ranks of the rows passing the filters, best first."""
+    cutoff = len(view.ranked) if min_score is None else bisect.bisect_right(view.neg_scores, -min_score)
+    if teams is not None:
+        ranks = heapq.merge(*(view.by_team.get(t, ()) for t in teams))
+    elif has_odds:
+        ranks, has_odds = iter(view.with_odds), None
+    else:
+        ranks = iter(range(cutoff))
+    out = []
+    odds = set(view.with_odds) if has_odds is not None else None
+    for r in ranks:
+        if r >= cutoff:
+            break
+        if odds is None or (r in odds) == has_odds:
+            out.append(r)
+    return out
+
+
+def _project(row: dict, fields: List[str]) -> dict:
+    """Copy of the requested fields; 'stats.homeRuns' selects one key of a nested dict."""
+    whole = {f for f in fields if '.' not in f}
+    out = {}
+    for f in fields:
+        head, _, sub = f.partition('.')
+        if head not in row:
+            continue
+        if not sub:
+            out[head] = row[head]
+        elif head not in whole and isinstance(row[head], dict) and sub in row[head]:
+            out.setdefault(head, {})[sub] = row[head][sub]
+    return out
+
+
+def _view_tag(view: ScoresIndex) -> str:
+    return _etag_for(view.key)[:12]
+
+
+def _make_cursor(view: ScoresIndex, offset: int) -> str:
+    return base64.urlsafe_b64encode(f"{_view_tag(view)}:{offset}".encode('ascii')).decode('ascii').rstrip('=')
+
+
+def _cursor_offset(view: ScoresIndex, cursor: str) -> int:
+    """Offset encoded in a cursor; ValueError when malformed or issued for another version of the data."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)).decode('ascii')
+        tag, _, offset = raw.partition(':')
+        offset = int(offset)
+    except Exception:
+        raise ValueError('invalid cursor')
+    if tag != _view_tag(view):
+        raise ValueError('stale cursor: the scores changed, restart from offset 0')
+    return max(0, offset)
+
+
+@app.route('/api/player-detail')
+def api_player_detail():
+    """Modal payload for one player. Query: ?name=...&team=... or ?id=<mlbam id>, optional date."""
+    date = request.args.get('date') or _tz_today_str()
+    name = request.args.get('name')
+    team = request.args.get('team')
+    pid = request.args.get('id')
+    if not name and not pid:
+        return jsonify({'error': 'name is required'}), 400
+
+    index = _player_index(date)
+    if index is None:
+        return jsonify({'error': 'No hr-scores files found', 'date': date}), 404
+    detail = index.find(name, team, pid)
+    if detail is None:
+        return jsonify({'error': 'player not found'}), 404
     return jsonify(detail)
 
 
+# Upper bound on players per /api/player-details response
+PLAYER_DETAILS_MAX = 500
+
+
+def _split_list_arg(name: str) -> List[str]:
+    """Comma-separated values of a query arg that may also be repeated."""
+    out = []
+    for raw in request.args.getlist(name):
+        out.extend(v.strip() for v in raw.split(',') if v.strip())
+    return out
+
+
+@app.route('/api/player-details')
+def api_player_details():
+    """Detail payloads for many players in one response, for client prefetch.
+    Query: ?date=YYYY-MM-DD and one of
+      names=Name|TEAM,Name,...  (team optional; same matching as /api/player-detail)
+      ids=<mlbam id>,...
+      top=N                     (highest scores first)
+    Response: { date, players: [detail, ...], missing: [requested entries not found] }
+    """
+    date = request.args.get('date') or _tz_today_str()
+    names = _split_list_arg('names')
+    ids = _split_list_arg('ids')
+    top = request.args.get('top')
+    if not names and not ids and not top:
+        return jsonify({'error': 'names, ids or top is required'}), 400
+    try:
+        top_n = max(0, min(PLAYER_DETAILS_MAX, int(top))) if top else 0
+    except Exception:
+        return jsonify({'error': 'top must be an integer'}), 400
+
+    index = _player_index(date)
+    if index is None:
+        return jsonify({'error': 'No hr-scores files found', 'date': date}), 404
+    players = list(index.ranked[:top_n])
+    missing = []
+    for entry in names:
+        name, _, team = entry.partition('|')
+        detail = index.find(name.strip(), team.strip() or None)
+        if detail is None:
+            missing.append(entry)
+        else:
+            players.append(detail)
+    for pid in ids:
+        detail = index.find(pid=pid)
+        if detail is None:
+            missing.append(pid)
+        else:
+            players.append(detail)
+    # Keep request order, drop repeats, cap the payload
+    seen = set()
+    unique = []
+    for d in players:
+        if id(d) not in seen:
+            seen.add(id(d))
+            unique.append(d)
+    return jsonify({'date': date, 'players': unique[:PLAYER_DETAILS_MAX], 'missing': missing})
+
+
 @app.route('/api/odds-diff')
 def api_odds_diff():
     """Diagnostics: list players without matched odds and odds names without a matching player for a date.
@@ -869,53 +1264,6 @@ def api_odds_diff():
     })
 
 
-# Simple in-process cache for live HR lookups to avoid heavy repeated queries
-_LIVE_HR_CACHE: dict[str, dict] = {}
-_LIVE_HR_TTL_SEC = 90
-
-def _fetch_hr_hitters_from_statsapi(date: str) -> dict:
-    """Fallback: scan MLB StatsAPI game feeds for home_run events for the date."""
-    try:
-        sched_url = f"https://statsapi.mlb.com/api/v1/schedule?sportId=1&date={date}"
-        rs = requests.get(sched_url, timeout=12)
-        dates = (rs.json().get('dates') or []) if rs.status_code == 200 else []
-        games = dates[0].get('games', []) if dates else []
-    except Exception:
-        games = []
-    hitters: dict[str, dict] = {}
-    for g in games:
-        game_pk = g.get('gamePk')
-        if not game_pk:
-            continue
-        try:
-            feed_url = f"https://statsapi.mlb.com/api/v1.1/game/{game_pk}/feed/live"
-            rf = requests.get(feed_url, timeout=12)
-            if rf.status_code != 200:
-                continue
-            feed = rf.json()
-        except Exception:
-            continue
-        plays = (((feed.get('liveData') or {}).get('plays') or {}).get('allPlays')) or []
-        for p in plays:
-            res = (p.get('result') or {})
-            et = (res.get('eventType') or '').lower()
-            ev = (res.get('event') or '').lower()
-            if et == 'home_run' or 'home run' in ev:
-                matchup = p.get('matchup') or {}
-                batter = matchup.get('batter') or {}
-                pid = batter.get('id')
-                name = batter.get('fullName') or batter.get('lastFirstName')
-                if not pid:
-                    continue
-                key = str(pid)
-                rec = hitters.get(key)
-                if not rec:
-                    hitters[key] = {'name': name, 'hr': 1}
-                else:
-                    rec['hr'] = int(rec.get('hr') or 0) + 1
-    return {'date': date, 'hitters': hitters}
-
-
 @app.route('/api/calibration-stats')
 def api_calibration_stats():
     """Return calibration diagnostics (reliability curve & Brier scores).
@@ -925,8 +1273,6 @@ def api_calibration_stats():
       total, homers, overall_pred_mean, overall_obs_rate,
       brier_calibrated, brier_raw, bins (calibrated), raw_bins (raw), calibration
     """
-    import csv
-    from statistics import mean
     days_param = request.args.get('days')
     try:
         days_filter = int(days_param) if days_param else None
@@ -935,150 +1281,84 @@ def api_calibration_stats():
     hist_path = os.path.join(data_dir(), 'historical-hr-events.csv')
     if not os.path.exists(hist_path):
         return jsonify({'error': 'no data'}), 404
-    rows = []
-    with open(hist_path, 'r', encoding='utf-8') as f:
-        r = csv.DictReader(f)
-        for row in r:
-            try:
-                d = row.get('date')
-                p_cal = row.get('model_prob')
-                p_raw = row.get('model_prob_raw')
-                p_cal = float(p_cal) if p_cal not in (None, '', 'None') else None
-                p_raw = float(p_raw) if p_raw not in (None, '', 'None') else None
-                y = int(row.get('homered'))
-                rows.append({'date': d, 'p': p_cal, 'p_raw': p_raw, 'y': y})
-            except Exception:
-                continue
-    if not rows:
+    history = get_history(hist_path)
+    if not len(history):
         return jsonify({'error': 'no data'}), 404
-    if days_filter:
-        try:
-            from datetime import datetime, timedelta
-            cutoff = datetime.utcnow().date() - timedelta(days=days_filter)
-            rows = [r for r in rows if r['date'] and datetime.strptime(r['date'], '%Y-%m-%d').date() >= cutoff]
-        except Exception:
-            pass
-    if not rows:
+    stats = history.stats(days_filter)
+    if stats is None:
         return jsonify({'error': 'no data after filter'}), 404
 
-    def build_bins(key: str):
-        data = [r for r in rows if r[key] is not None]
-        if not data:
-            return None
-        data.sort(key=lambda x: x[key])
-        k = 10
-        # Use equal-count bins
-        n = len(data)
-        base = max(1, n // k)
-        bins = []
-        idx = 0
-        for i in range(k):
-            start = idx
-            # Distribute remainder across first bins
-            extra = 1 if i < (n % k) else 0
-            end = min(n, start + base + extra)
-            chunk = data[start:end]
-            idx = end
-            if not chunk:
-                continue
-            p_vals = [c[key] for c in chunk]
-            y_vals = [c['y'] for c in chunk]
-            pm = mean(p_vals)
-            ym = mean(y_vals)
-            bins.append({
-                'idx': i + 1,
-                'count': len(chunk),
-                'p_lo': round(min(p_vals), 5),
-                'p_hi': round(max(p_vals), 5),
-                'pred_mean': round(pm, 5),
-                'obs_rate': round(ym, 5),
-                'abs_error': round(abs(pm - ym), 5)
-            })
-        return bins
-
-    def brier(key: str):
-        arr = [(r[key] - r['y']) ** 2 for r in rows if r[key] is not None]
-        return (sum(arr) / len(arr)) if arr else None
-
     # Lazy import calibration loader
     try:
         from calibration import load_calibrator
         calib = load_calibrator(os.path.join(data_dir(), 'model_calibration.json'))
     except Exception:
         calib = None
-    try:
-        overall_pred_mean = mean([r['p'] for r in rows if r['p'] is not None]) if any(r['p'] is not None for r in rows) else None
-    except Exception:
-        overall_pred_mean = None
-    resp = {
-        'total': len(rows),
-        'homers': int(sum(r['y'] for r in rows)),
-        'overall_pred_mean': round(overall_pred_mean, 5) if overall_pred_mean is not None else None,
-        'overall_obs_rate': round(sum(r['y'] for r in rows) / len(rows), 5),
-        'brier_calibrated': (lambda v: round(v, 5) if v is not None else None)(brier('p')),
-        'brier_raw': (lambda v: round(v, 5) if v is not None else None)(brier('p_raw')),
-        'bins': build_bins('p'),
-        'raw_bins': build_bins('p_raw'),
-        'calibration': calib or None
-    }
+    resp = dict(stats)
+    resp['calibration'] = calib or None
     return jsonify(resp)
 
 
 @app.route('/api/live-hr-hitters')
 def api_live_hr_hitters():
     """Return hitters who have homered for the given date.
-    - If fetcher is available, compute for the requested date (cached ~90s).
-    - Else, try to load hr-hitters-<date>.json from data.
+    - If the fetcher is available, serve the shared snapshot the background refresher keeps
+      (about every 90s while the date is being polled); requests never fetch upstream.
+    - Until the first snapshot lands (or without the fetcher), load hr-hitters-<date>.json from data.
     Response: { date, hitters: { <mlbam_id>: { name, hr } } }
     """
     date = request.args.get('date') or _tz_today_str()
-    # live path for any requested date if fetcher exists
-    if _fetch_hr_hitters_for_date is not None:
-        entry = _LIVE_HR_CACHE.get(date)
-        now = time.time()
-        if not entry or (now - entry.get('ts', 0)) > _LIVE_HR_TTL_SEC:
-            try:
-                out = _fetch_hr_hitters_for_date(date) or {'date': date, 'hitters': {}}
-                # Fallback to StatsAPI if empty
-                if not out.get('hitters'):
-                    out = _fetch_hr_hitters_from_statsapi(date)
-            except Exception:
-                # Try StatsAPI as a fallback path
-                try:
-                    out = _fetch_hr_hitters_from_statsapi(date)
-                except Exception:
-                    out = {'date': date, 'hitters': {}}
-            _LIVE_HR_CACHE[date] = {'ts': now, 'data': out}
-        return jsonify(_LIVE_HR_CACHE[date]['data'])
+    load, etag, modified = _live_hr_source(date)
+    return _conditional_json(load, etag, modified)
+
+
+# Parsed hr-hitters-<date>.json by file version; live streams re-read the source every few seconds
+_hr_hitters_files = _DateCache()
+
 
+def _live_hr_source(date: str) -> tuple:
+    """(load() -> payload, etag, last-modified) for the date's HR hitters: the shared live
+    snapshot, else the saved hr-hitters-<date>.json, else an empty list."""
+    entry = _live_snapshot('live-hr', date)
+    if entry is not None:
+        return (lambda: entry['data']), entry['etag'], entry['modified']
     # historical/static path
     try:
-        dd = data_dir()
-        p = os.path.join(dd, f'hr-hitters-{date}.json')
-        if os.path.exists(p):
-            return jsonify(_load_json(p))
+        p = os.path.join(data_dir(), f'hr-hitters-{date}.json')
+        version = file_version(p)
+        if version:
+            load = lambda: _hr_hitters_files.get(date, version, lambda: _load_json(p))
+            return load, _etag_for(version), version[1] / 1e9
     except Exception:
         pass
-    return jsonify({'date': date, 'hitters': {}})
+    empty = {'date': date, 'hitters': {}}
+    return (lambda: empty), _content_etag(empty), None
 
 
-_GAME_STATE_CACHE: dict[str, dict] = {}
 _GAME_STATE_TTL_SEC = 60
 
 
 @app.route('/api/game-states')
 def api_game_states():
     """Return per-team game state for a date using live MLB StatsAPI schedule.
-    Response: { date, teams: { ABBR: 'LIVE'|'FINAL'|'SCHEDULED' } }
+    Served from the shared snapshot the background refresher keeps; until the
+    first refresh for a date lands the teams map is empty.
+    Response: { date, teams: { ABBR: { state, label, score_label } } }
     """
     date = request.args.get('date') or _tz_today_str()
-    entry = _GAME_STATE_CACHE.get(date)
-    now = time.time()
-    if entry and (now - entry.get('ts', 0)) <= _GAME_STATE_TTL_SEC:
-        return jsonify(entry['data'])
+    entry = _live_snapshot('game-states', date)
+    if entry is None:
+        empty = {'date': date, 'teams': {}}
+        return _conditional_json(lambda: empty, _content_etag(empty))
+    return _conditional_json(lambda: entry['data'], entry['etag'], entry['modified'])
+
+
+def _fetch_game_states(date: str) -> dict:
+    """Per-team state, label and score line for the date from the StatsAPI schedule (with linescore)."""
     try:
         url = f"https://statsapi.mlb.com/api/v1/schedule?sportId=1&date={date}&hydrate=linescore"
-        r = requests.get(url, timeout=15)
+        with fetch_engine.lane('live'):
+            r = http_client.get(url, timeout=15, ttl=0)
         sched = r.json() if r.status_code == 200 else {}
     except Exception:
         sched = {}
@@ -1156,9 +1436,118 @@ def api_game_states():
             out_map[home_ab] = {'state': code, 'label': label or code.title(), 'score_label': score_label}
         if away_ab:
             out_map[away_ab] = {'state': code, 'label': label or code.title(), 'score_label': score_label}
-    data = {'date': date, 'teams': out_map}
-    _GAME_STATE_CACHE[date] = {'ts': now, 'data': data}
-    return jsonify(data)
+    return {'date': date, 'teams': out_map}
+
+
+# Live HR hitters and game states: refreshed in the background, shared by every worker through the snapshot store
+_LIVE_HR_TTL_SEC = 90
+_live_store = SnapshotStore()
+_live_fetchers = {'game-states': (_fetch_game_states, _GAME_STATE_TTL_SEC)}
+if _fetch_live_hr_hitters is not None:
+    # The StatsAPI scanner's cursors are kept in the store too, so any worker holding the lease resumes the scan
+    _live_fetchers['live-hr'] = (lambda date: _fetch_live_hr_hitters(date, store=_live_store), _LIVE_HR_TTL_SEC)
+_live_refresher = Refresher(_live_store, _live_fetchers)
+# LIVE_REFRESHER=0 leaves refreshing to a standalone `python live_cache.py` process
+_LIVE_REFRESHER_ENABLED = os.environ.get('LIVE_REFRESHER', '1').strip().lower() not in ('0', 'false', 'no', 'off')
+
+
+def _live_snapshot(kind: str, date: str) -> Optional[dict]:
+    """Latest shared snapshot for the date (None until the first fetch lands); never fetches upstream."""
+    if kind not in _live_refresher.fetchers:
+        return None
+    if _LIVE_REFRESHER_ENABLED:
+        _live_refresher.start()
+    _live_refresher.want(kind, date)
+    try:
+        return _live_store.get(kind, date)
+    except Exception:
+        return None
+
+
+# /api/live/stream: seconds between snapshot checks, between keep-alive comments,
+# and before the server ends a stream (EventSource reconnects on its own)
+_SSE_POLL_SEC = 2.0
+_SSE_HEARTBEAT_SEC = 15.0
+_SSE_MAX_SEC = _env_int('LIVE_STREAM_MAX_SEC', 1800)
+# Open streams per worker process. Each holds a gunicorn thread, so the rest stay free for
+# ordinary requests; over the limit the stream answers 503 and the page polls the snapshot.
+_SSE_MAX_STREAMS = max(0, _env_int('LIVE_STREAM_MAX_PER_WORKER', 4))
+_sse_slots = threading.BoundedSemaphore(_SSE_MAX_STREAMS) if _SSE_MAX_STREAMS else None
+
+
+def _live_state(date: str) -> dict:
+    """Combined live HR hitters and game states for the date, from the shared snapshots only."""
+    load, hr_etag, _modified = _live_hr_source(date)
+    gs = _live_snapshot('game-states', date)
+    hitters = (load() or {}).get('hitters') or {}
+    teams = ((gs or {}).get('data') or {}).get('teams') or {}
+    return {'date': date, 'version': f"{hr_etag}.{gs['etag'] if gs else '-'}", 'hitters': hitters, 'teams': teams}
+
+
+def _changed(old: dict, new: dict) -> tuple:
+    return {k: v for k, v in new.items() if old.get(k) != v}, [k for k in old if k not in new]
+
+
+def _sse(event: str, data: dict, event_id: Optional[str] = None) -> str:
+    head = f"id: {event_id}\n" if event_id else ''
+    return f"{head}event: {event}\ndata: {json.dumps(data, separators=(',', ':'))}\n\n"
+
+
+@app.route('/api/live/snapshot')
+def api_live_snapshot():
+    """Live HR hitters and game states in one response, for clients without SSE.
+    Response: { date, version, hitters: { <mlbam_id>: { name, hr } }, teams: { ABBR: { state, label, score_label } } }
+    """
+    date = request.args.get('date') or _tz_today_str()
+    state = _live_state(date)
+    return _conditional_json(lambda: state, _etag_for(state['version']))
+
+
+@app.route('/api/live/stream')
+def api_live_stream():
+    """Server-Sent Events for a date's live HR hitters and game states.
+    Sends `snapshot` (same shape as /api/live/snapshot) on connect, then `delta`
+    events { version, hitters, removed_hitters, teams, removed_teams } holding
+    only what changed. Reads the shared snapshots the background refresher keeps.
+    """
+    date = request.args.get('date') or _tz_today_str()
+    if _sse_slots is None or not _sse_slots.acquire(blocking=False):
+        return (jsonify({'error': 'too many live streams on this worker; poll /api/live/snapshot'}), 503,
+                {'Retry-After': '60'})
+
+    def events():
+        yield 'retry: 5000\n\n'
+        started = last_sent = time.time()
+        state = _live_state(date)
+        yield _sse('snapshot', state, state['version'])
+        while time.time() - started < _SSE_MAX_SEC:
+            time.sleep(_SSE_POLL_SEC)
+            new = _live_state(date)
+            if new['version'] != state['version']:
+                hitters, removed_hitters = _changed(state['hitters'], new['hitters'])
+                teams, removed_teams = _changed(state['teams'], new['teams'])
+                state = new
+                if hitters or removed_hitters or teams or removed_teams:
+                    yield _sse('delta', {'version': new['version'], 'hitters': hitters, 'removed_hitters': removed_hitters,
+                                         'teams': teams, 'removed_teams': removed_teams}, new['version'])
+                    last_sent = time.time()
+                    continue
+            if time.time() - last_sent >= _SSE_HEARTBEAT_SEC:
+                yield ': keep-alive\n\n'
+                last_sent = time.time()
+
+    released = threading.Lock()
+
+    def release():
+        # close() runs when the stream ends or the client goes away; the slot is freed once
+        if released.acquire(blocking=False):
+            _sse_slots.release()
+
+    resp = app.response_class(events(), mimetype='text/event-stream')
+    resp.call_on_close(release)
+    resp.headers['Cache-Control'] = 'no-cache'
+    resp.headers['X-Accel-Buffering'] = 'no'
+    return resp
 
 
 def main():
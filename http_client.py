@@ -0,0 +1,305 @@
+"""Shared HTTP client for the fetch tools and the app.
+
+Every outbound GET goes through get() (or get_json()), which
+
+- reuses one pooled requests.Session per host, so the ~1,000 StatsAPI calls
+  of a run share a handful of keep-alive connections instead of opening a
+  TCP/TLS connection each; pools hold POOL_MAXSIZE connections
+  (HTTP_POOL_MAXSIZE, default 16: the widest ThreadPoolExecutor in tools/);
+- retries connection errors and 429/5xx responses with jittered exponential
+  backoff (Retry-After is honoured, capped at MAX_BACKOFF_SEC);
+- bounds each call by a deadline covering every attempt and backoff sleep;
+- counts requests, retries, errors, bytes and latency per host (stats()).
+
+Other statuses are returned as-is, so callers keep their own status checks.
+
+200 responses from endpoints listed in CACHE_TTLS are also kept on disk
+(HTTP_CACHE_DIR, default data/.http-cache). Bodies are content-addressed
+(blobs/<sha256 of body>) and each request URL has a small index entry pointing
+at its body plus the ETag/Last-Modified it came with. Within the endpoint's
+TTL the cached body is returned without a request; after it, the request is
+revalidated with If-None-Match/If-Modified-Since and a 304 renews the entry.
+Offline mode (--offline in the tools, or HTTP_OFFLINE=1) serves only from the
+cache, whatever the entry's age, and raises requests.ConnectionError for
+anything not cached. The directory can be deleted at any time.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import random
+import re
+import threading
+import time
+from typing import Any, Dict, Optional
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+import fetch_engine
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+CACHE_DIR = os.environ.get('HTTP_CACHE_DIR') or os.path.join(APP_DIR, 'data', '.http-cache')
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return max(1, int(os.environ.get(name, default)))
+    except Exception:
+        return default
+
+
+POOL_MAXSIZE = _env_int('HTTP_POOL_MAXSIZE', 16)
+RETRIES = 3
+RETRY_STATUSES = frozenset((429, 500, 502, 503, 504))
+BACKOFF_BASE_SEC = 0.5
+MAX_BACKOFF_SEC = 8.0
+
+_DAY = 86400
+# (URL pattern, seconds a cached 200 is served without asking); first match wins, unlisted URLs are not cached.
+CACHE_TTLS = tuple((re.compile(pattern), ttl) for pattern, ttl in (
+    # Team and people metadata barely change within a season
+    (r'statsapi\.mlb\.com/api/v1/teams/\d+/?(\?|$)', 30 * _DAY),
+    (r'statsapi\.mlb\.com/api/v1/people\?personIds=', 30 * _DAY),
+    (r'statsapi\.mlb\.com/api/v1/teams/\d+/roster', 3600),
+    # Probable pitchers and postponements move during the day
+    (r'statsapi\.mlb\.com/api/v1/schedule', 600),
+    # Season, date-range and head-to-head stats change once games finish
+    (r'statsapi\.mlb\.com/api/v1/(stats\?|people/\d+/stats|people/\d+\?hydrate=stats|teams/\d+/stats)', 6 * 3600),
+    (r'api\.openweathermap\.org/', 1800),
+    (r'fangraphs\.com/guts\.aspx|baseball-reference\.com/leagues/majors/\d+-park-factors', _DAY),
+))
+
+
+def _env_flag(name: str) -> bool:
+    return str(os.environ.get(name, '')).strip().lower() in ('1', 'true', 'yes', 'on')
+
+
+_OFFLINE = _env_flag('HTTP_OFFLINE')
+
+_SESSIONS: Dict[str, requests.Session] = {}
+_STATS: Dict[str, Dict[str, float]] = {}
+_LOCK = threading.Lock()
+
+
+def _session(host: str) -> requests.Session:
+    with _LOCK:
+        s = _SESSIONS.get(host)
+        if s is None:
+            s = requests.Session()
+            # Retries are done here (with backoff and deadline), not by urllib3
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=POOL_MAXSIZE, max_retries=0)
+            s.mount('https://', adapter)
+            s.mount('http://', adapter)
+            _SESSIONS[host] = s
+        return s
+
+
+def _zero_counters() -> Dict[str, float]:
+    return {'requests': 0, 'retries': 0, 'errors': 0, 'bytes': 0, 'latency_sec': 0.0, 'max_latency_sec': 0.0,
+            'cache_hits': 0, 'revalidated': 0}
+
+
+def _count(host: str, **deltas: float) -> None:
+    with _LOCK:
+        st = _STATS.get(host)
+        if st is None:
+            st = _STATS[host] = _zero_counters()
+        for key, value in deltas.items():
+            if key == 'max_latency_sec':
+                st[key] = max(st[key], value)
+            else:
+                st[key] += value
+
+
+def _backoff(attempt: int, response: Optional[requests.Response]) -> float:
+    """Full-jitter exponential delay before retry number attempt (1-based); Retry-After wins when given."""
+    if response is not None:
+        try:
+            return min(MAX_BACKOFF_SEC, max(0.0, float(response.headers.get('Retry-After'))))
+        except Exception:
+            pass
+    return random.uniform(0, min(MAX_BACKOFF_SEC, BACKOFF_BASE_SEC * (2 ** attempt)))
+
+
+def get(url: str, params: Optional[dict] = None, timeout: float = 20, retries: int = RETRIES,
+        deadline: Optional[float] = None, ttl: Optional[float] = None, **kwargs: Any) -> requests.Response:
+    """GET url through the host's pooled session, or from the disk cache.
+
+    timeout bounds each attempt; deadline (seconds, default 3 * timeout) bounds
+    the whole call including retries. Returns the last response (which may be a
+    429/5xx once retries or time run out); raises the last exception when no
+    attempt got a response. ttl overrides the CACHE_TTLS lookup (0 = never
+    cache, for live data). Extra kwargs (headers, proxies, ...) go to requests.
+    """
+    full_url = requests.Request('GET', url, params=params).prepare().url
+    ttl = cache_ttl(full_url) if ttl is None else ttl
+    if not ttl and not _OFFLINE:
+        return _fetch(full_url, timeout, retries, deadline, **kwargs)
+    host = urlsplit(full_url).netloc.lower()
+    key = hashlib.sha256(full_url.encode('utf-8')).hexdigest()
+    entry = _cache_load(key) if ttl else None
+    if entry is not None and (_OFFLINE or time.time() - entry['fetched'] < ttl):
+        _count(host, cache_hits=1)
+        return _cached_response(full_url, entry)
+    if _OFFLINE:
+        raise requests.ConnectionError(f"offline and not cached: {urlsplit(full_url).path}")
+    headers = dict(kwargs.pop('headers', None) or {})
+    if entry is not None:
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+    r = _fetch(full_url, timeout, retries, deadline, headers=headers, **kwargs)
+    if r.status_code == 304 and entry is not None:
+        _count(host, revalidated=1)
+        entry['fetched'] = time.time()
+        r = _cached_response(full_url, entry)
+    elif r.status_code == 200:
+        entry = _cache_entry(full_url, r)
+    else:
+        return r
+    try:
+        _cache_store(key, entry)
+    except OSError:
+        pass
+    return r
+
+
+def cache_ttl(url: str) -> float:
+    """Seconds a cached 200 for url stays fresh; 0 when the endpoint is not cached."""
+    for pattern, ttl in CACHE_TTLS:
+        if pattern.search(url):
+            return ttl
+    return 0
+
+
+def set_offline(offline: bool = True) -> None:
+    """Serve only from the disk cache; inherited by tools started from this process."""
+    global _OFFLINE
+    _OFFLINE = bool(offline)
+    os.environ['HTTP_OFFLINE'] = '1' if offline else '0'
+
+
+def _cache_path(kind: str, digest: str) -> str:
+    return os.path.join(CACHE_DIR, kind, digest[:2], digest)
+
+
+def _write_atomic(path: str, payload: bytes) -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp, 'wb') as f:
+        f.write(payload)
+    os.replace(tmp, path)
+
+
+def _cache_load(key: str) -> Optional[dict]:
+    """Index entry for a request key with its body attached; None when missing or unreadable."""
+    try:
+        with open(_cache_path('index', key), 'rb') as f:
+            entry = json.loads(f.read())
+        with open(_cache_path('blobs', entry['body']), 'rb') as f:
+            entry['content'] = f.read()
+        return entry
+    except Exception:
+        return None
+
+
+def _cache_entry(url: str, r: requests.Response) -> dict:
+    return {'path': urlsplit(url).path, 'fetched': time.time(), 'content': r.content,
+            'body': hashlib.sha256(r.content).hexdigest(),
+            'content_type': r.headers.get('Content-Type'), 'etag': r.headers.get('ETag'),
+            'last_modified': r.headers.get('Last-Modified')}
+
+
+def _cache_store(key: str, entry: dict) -> None:
+    blob = _cache_path('blobs', entry['body'])
+    if not os.path.exists(blob):
+        _write_atomic(blob, entry['content'])
+    # Only the path is recorded: query strings can carry API keys
+    meta = {k: v for k, v in entry.items() if k != 'content'}
+    _write_atomic(_cache_path('index', key), json.dumps(meta).encode('utf-8'))
+
+
+def _cached_response(url: str, entry: dict) -> requests.Response:
+    r = requests.Response()
+    r.status_code = 200
+    r.url = url
+    r._content = entry['content']
+    r.headers = CaseInsensitiveDict({k: v for k, v in (('Content-Type', entry.get('content_type')),
+                                                       ('ETag', entry.get('etag')),
+                                                       ('Last-Modified', entry.get('last_modified'))) if v})
+    r.encoding = get_encoding_from_headers(r.headers)
+    return r
+
+
+def _fetch(url: str, timeout: float, retries: int, deadline: Optional[float], **kwargs: Any) -> requests.Response:
+    host = urlsplit(url).netloc.lower()
+    session = _session(host)
+    end = time.monotonic() + (deadline if deadline is not None else 3 * timeout)
+    lane_deadline = fetch_engine.current_deadline()
+    if lane_deadline is not None:
+        end = min(end, lane_deadline)
+    attempt = 0
+    while True:
+        remaining = end - time.monotonic()
+        if remaining <= 0:
+            raise requests.Timeout(f"deadline exceeded for {url}")
+        started = time.monotonic()
+        response, error = None, None
+        try:
+            # Waits for a global slot and a host token; queueing counts against the deadline
+            with fetch_engine.slot(host):
+                started = time.monotonic()
+                response = session.get(url, timeout=max(0.1, min(timeout, end - started)), **kwargs)
+                size = len(response.content)
+        except Exception as e:
+            error, size = e, 0
+        elapsed = time.monotonic() - started
+        _count(host, requests=1, bytes=size, latency_sec=elapsed, max_latency_sec=elapsed,
+               errors=1 if error is not None else 0)
+        if error is None and response.status_code not in RETRY_STATUSES:
+            return response
+        attempt += 1
+        delay = _backoff(attempt, response)
+        if attempt > retries or time.monotonic() + delay >= end:
+            if response is not None:
+                return response
+            raise error
+        _count(host, retries=1)
+        time.sleep(delay)
+
+
+def get_json(url: str, params: Optional[dict] = None, timeout: float = 20, **kwargs: Any) -> Any:
+    """Parsed JSON body of a 200 response; raises requests.HTTPError for any other status."""
+    r = get(url, params=params, timeout=timeout, **kwargs)
+    if r.status_code != 200:
+        raise requests.HTTPError(f"HTTP {r.status_code} for {url}", response=r)
+    return r.json()
+
+
+def stats() -> Dict[str, Dict[str, float]]:
+    """Per-host counters plus a 'total' row; latencies in seconds."""
+    with _LOCK:
+        hosts = {h: dict(st) for h, st in _STATS.items()}
+    total = _zero_counters()
+    for st in hosts.values():
+        for key, value in st.items():
+            total[key] = max(total[key], value) if key == 'max_latency_sec' else total[key] + value
+    for st in list(hosts.values()) + [total]:
+        st['mean_latency_sec'] = round(st['latency_sec'] / st['requests'], 4) if st['requests'] else None
+        st['latency_sec'] = round(st['latency_sec'], 3)
+        st['max_latency_sec'] = round(st['max_latency_sec'], 3)
+    return {'hosts': hosts, 'total': total}
+
+
+def summary() -> str:
+    """One-line counters for tool logs."""
+    t = stats()['total']
+    return (f"{t['requests']} requests, {t['retries']} retries, {t['errors']} errors, "
+            f"{t['bytes'] / 1e6:.1f} MB, mean {t['mean_latency_sec'] or 0:.3f}s; "
+            f"{t['cache_hits']} cache hits, {t['revalidated']} revalidated")
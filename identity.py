@@ -0,0 +1,286 @@
+"""Cross-source player identity keyed by MLBAM id.
+
+Every data source spells names a little differently (accents, Jr./II
+suffixes, "Last, First", "Name/Team"). This module keeps one record per
+MLBAM id with its display name, latest team, role and a precomputed set of
+normalized aliases, so callers can join any name-keyed source to an id once
+and then look rows up by id.
+
+Persisted at data/player-identity.json:
+  { "updated": "...", "people": { "<id>": { "name", "team", "type", "aliases": [...] } } }
+
+The fetchers merge each day's player/pitcher lists into it incrementally.
+Loaded maps are memoized by file (path, mtime, size); name resolution is
+memoized per map.
+"""
+from __future__ import annotations
+
+import json
+import os
+import re
+import unicodedata
+from datetime import datetime
+from functools import lru_cache
+from typing import Dict, Iterable, Optional, Set
+
+from file_memo import file_memo
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+DATA_DIR = os.path.join(APP_DIR, 'data')
+IDENTITY_FILE = os.path.join(DATA_DIR, 'player-identity.json')
+
+
+@lru_cache(maxsize=65536)
+def norm_name_key(n: Optional[str]) -> str:
+    """Normalize a name for cross-source matching.
+    - Strip anything after '/' (e.g., "Name/Team") and a trailing "(TEAM)".
+    - ASCII-fold, lowercase, punctuation to spaces, compress spaces.
+    - Drop a trailing jr/sr/roman suffix.
+    """
+    if not n:
+        return ''
+    s = unicodedata.normalize('NFKD', str(n)).encode('ascii', 'ignore').decode('ascii')
+    s = s.strip()
+    if '/' in s:
+        s = s.split('/', 1)[0].strip()
+    s = re.sub(r"\s*\([A-Z]{2,4}\)$", '', s)
+    s = s.lower()
+    s = re.sub(r"[\.'’`-]", ' ', s)
+    s = re.sub(r"\s+", ' ', s).strip()
+    s = re.sub(r"\s+(jr|sr|ii|iii|iv|v)\b\.?$", '', s)
+    return s
+
+
+@lru_cache(maxsize=65536)
+def norm_name_simple(n: Optional[str]) -> str:
+    """Looser key: ASCII-fold, drop suffixes anywhere and all punctuation."""
+    if not n:
+        return ''
+    s = unicodedata.normalize('NFKD', str(n)).encode('ascii', 'ignore').decode('ascii')
+    s = s.lower().strip()
+    s = re.sub(r"\b(jr|sr|ii|iii|iv|v)\b", "", s)
+    s = re.sub(r"[^a-z0-9\s]", "", s)
+    s = re.sub(r"\s+", " ", s)
+    return s.strip()
+
+
+def alias_keys(name: Optional[str]) -> Set[str]:
+    """All normalized spellings a source might use for this name."""
+    if not name:
+        return set()
+    keys = {norm_name_key(name), norm_name_simple(name)}
+    if ',' in name:
+        last, _, first = name.partition(',')
+        swapped = f"{first.strip()} {last.strip()}"
+        keys.update((norm_name_key(swapped), norm_name_simple(swapped)))
+    keys.discard('')
+    return keys
+
+
+def id_key(v) -> Optional[int]:
+    if v is None or v == '':
+        return None
+    try:
+        return int(v)
+    except Exception:
+        return None
+
+
+class IdentityMap:
+    """MLBAM id -> person, with exact-name and alias indexes for resolution."""
+
+    def __init__(self, people: Optional[Dict] = None):
+        self.people: Dict[int, dict] = {}
+        self._by_name: Dict[str, Set[int]] = {}
+        self._by_alias: Dict[str, Set[int]] = {}
+        self._resolved: Dict[tuple, Optional[int]] = {}
+        for pid, rec in (people or {}).items():
+            rec = rec or {}
+            self.add(pid, rec.get('name'), team=rec.get('team'), role=rec.get('type'),
+                     aliases=rec.get('aliases') or ())
+
+    def __len__(self) -> int:
+        return len(self.people)
+
+    def __contains__(self, pid) -> bool:
+        return id_key(pid) in self.people
+
+    def copy(self) -> 'IdentityMap':
+        return IdentityMap(self.to_json()['people'])
+
+    def add(self, pid, name: Optional[str], team: Optional[str] = None, role: Optional[str] = None,
+            aliases: Iterable[str] = ()) -> bool:
+        """Insert or update a person; returns True when anything changed."""
+        pid = id_key(pid)
+        if pid is None or not name:
+            return False
+        rec = self.people.get(pid)
+        changed = rec is None
+        if rec is None:
+            rec = self.people[pid] = {'name': name, 'team': team, 'type': role, 'aliases': set()}
+        if name != rec['name']:
+            # Keep the previous spelling reachable as an alias
+            rec['aliases'].update(alias_keys(rec['name']))
+            self._by_name.setdefault(rec['name'], set()).add(pid)
+            rec['name'] = name
+            changed = True
+        if team and team != rec.get('team'):
+            rec['team'] = team
+            changed = True
+        if role and rec.get('type') != role and rec.get('type') != 'two-way':
+            rec['type'] = 'two-way' if rec.get('type') else role
+            changed = True
+        new_aliases = alias_keys(name) | {a for a in aliases if a}
+        if not new_aliases <= rec['aliases']:
+            rec['aliases'].update(new_aliases)
+            changed = True
+        self._by_name.setdefault(name, set()).add(pid)
+        for a in rec['aliases']:
+            self._by_alias.setdefault(a, set()).add(pid)
+        if changed:
+            self._resolved.clear()
+        return changed
+
+    def add_records(self, records: Iterable[dict], role: Optional[str] = None, norm_team=None) -> int:
+        """Merge source rows carrying `mlbam_id`/`id` and `name`; returns the number changed."""
+        n = 0
+        for r in records or []:
+            if not isinstance(r, dict):
+                continue
+            team = r.get('team')
+            if team and norm_team:
+                team = norm_team(team)
+            r_role = 'pitcher' if 'pitch' in (r.get('position') or '').lower() else role
+            if self.add(r.get('mlbam_id') or r.get('id'), r.get('name') or r.get('fullName'), team=team, role=r_role):
+                n += 1
+        return n
+
+    def name_for(self, pid) -> Optional[str]:
+        rec = self.people.get(id_key(pid))
+        return rec['name'] if rec else None
+
+    def team_for(self, pid) -> Optional[str]:
+        rec = self.people.get(id_key(pid))
+        return rec.get('team') if rec else None
+
+    def _pick(self, ids: Optional[Set[int]], team: Optional[str]) -> Optional[int]:
+        if not ids:
+            return None
+        if len(ids) == 1:
+            return next(iter(ids))
+        if team:
+            on_team = [i for i in ids if self.people[i].get('team') == team]
+            if len(on_team) == 1:
+                return on_team[0]
+        return None
+
+    def resolve(self, name: Optional[str], team: Optional[str] = None) -> Optional[int]:
+        """Name (any source spelling) -> MLBAM id; None when unknown or ambiguous."""
+        if not name:
+            return None
+        key = (name, team)
+        try:
+            return self._resolved[key]
+        except KeyError:
+            pass
+        pid = self._pick(self._by_name.get(name), team)
+        if pid is None:
+            for a in sorted(alias_keys(name)):
+                pid = self._pick(self._by_alias.get(a), team)
+                if pid is not None:
+                    break
+        self._resolved[key] = pid
+        return pid
+
+    def by_id(self, index: Dict[str, object], team_of=None) -> Dict[int, object]:
+        """Re-key a name-keyed index by id; names that do not resolve are dropped."""
+        out: Dict[int, object] = {}
+        for name, value in (index or {}).items():
+            pid = self.resolve(name, team_of(value) if team_of else None)
+            if pid is not None and pid not in out:
+                out[pid] = value
+        return out
+
+    def to_json(self) -> dict:
+        people = {}
+        for pid in sorted(self.people):
+            rec = self.people[pid]
+            people[str(pid)] = {
+                'name': rec['name'],
+                'team': rec.get('team'),
+                'type': rec.get('type'),
+                'aliases': sorted(rec['aliases']),
+            }
+        return {'people': people}
+
+
+def _read(path: str) -> IdentityMap:
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        return IdentityMap((data or {}).get('people') or {})
+    except Exception:
+        return IdentityMap()
+
+
+_load_identity = file_memo(_read, maxsize=4, missing=lambda path: IdentityMap())
+
+
+def load_identity(path: Optional[str] = None) -> IdentityMap:
+    """Persisted identity map, parsed once per file version. Treat as read-only; copy() to extend."""
+    return _load_identity(path or IDENTITY_FILE)
+
+
+def save_identity(ident: IdentityMap, path: Optional[str] = None) -> str:
+    path = path or IDENTITY_FILE
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    data = ident.to_json()
+    data['updated'] = datetime.now().isoformat(timespec='seconds')
+    tmp = path + '.tmp'
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=1, sort_keys=True)
+    os.replace(tmp, path)
+    return path
+
+
+def update_identity(batters: Iterable[dict] = (), pitchers: Iterable[dict] = (), path: Optional[str] = None,
+                    norm_team=None) -> int:
+    """Merge fetched rows into the persisted map; writes only when something changed."""
+    ident = _read(path or IDENTITY_FILE) if os.path.exists(path or IDENTITY_FILE) else IdentityMap()
+    changed = ident.add_records(batters, role='batter', norm_team=norm_team)
+    changed += ident.add_records(pitchers, role='pitcher', norm_team=norm_team)
+    if changed:
+        save_identity(ident, path)
+    return changed
+
+
+def rebuild_from_data(data_dir: str = DATA_DIR, path: Optional[str] = None) -> IdentityMap:
+    """Seed the map from every player-stats/pitcher-stats file on disk (oldest first)."""
+    from data_catalog import get_catalog
+    catalog = get_catalog(data_dir)
+    ident = IdentityMap()
+    files = [(d, kind) for kind in ('player-stats', 'pitcher-stats') for d in catalog.dates(kind)]
+    for d, kind in sorted(files):
+        try:
+            with open(catalog.path_for(kind, d), 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except Exception:
+            continue
+        if kind == 'player-stats':
+            ident.add_records(data.get('players') or [], role='batter')
+        else:
+            ident.add_records(data.get('pitchers') or [], role='pitcher')
+    save_identity(ident, path)
+    return ident
+
+
+if __name__ == '__main__':
+    import argparse
+    ap = argparse.ArgumentParser(description='Maintain data/player-identity.json')
+    ap.add_argument('--rebuild', action='store_true', help='Rebuild from all player/pitcher stats files in data/')
+    args = ap.parse_args()
+    if args.rebuild:
+        ident = rebuild_from_data()
+        print(f"Wrote {IDENTITY_FILE} with {len(ident)} people")
+    else:
+        print(f"{IDENTITY_FILE}: {len(load_identity())} people")
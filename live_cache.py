@@ -0,0 +1,255 @@
+"""Live-data snapshots shared by every app worker, kept fresh in the background.
+
+Requests for live data (today's HR hitters, ...) never fetch upstream
+themselves. They read the latest snapshot from a small SQLite file
+(LIVE_CACHE_DB, default data/live-cache.sqlite) that every gunicorn worker
+shares, and register interest in the (kind, date). In each worker a
+Refresher runs one thread per kind, refreshing the dates that were asked for
+recently, so a slow fetch of one kind (a full day of Statcast for live HRs)
+does not hold up the others; a per-(kind, date) lease in the same file makes
+sure only one worker fetches each date per interval. Dates nobody asked for
+within idle_sec are dropped.
+
+Snapshots carry a content hash (etag) and a 'modified' time that only moves
+when a refetch changes the content.
+
+Run standalone (with LIVE_REFRESHER=0 in the app) to keep dates fresh from
+one process:  python live_cache.py --date 2025-09-05
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Callable, Dict, Optional, Tuple
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+DATA_DIR = os.path.join(APP_DIR, 'data')
+DEFAULT_DB = os.path.join(DATA_DIR, 'live-cache.sqlite')
+
+_SCHEMA = (
+    'CREATE TABLE IF NOT EXISTS snapshots (kind TEXT NOT NULL, date TEXT NOT NULL, etag TEXT NOT NULL, '
+    'modified REAL NOT NULL, fetched REAL NOT NULL, payload TEXT NOT NULL, PRIMARY KEY (kind, date))',
+    'CREATE TABLE IF NOT EXISTS leases (kind TEXT NOT NULL, date TEXT NOT NULL, owner TEXT NOT NULL, '
+    'expires REAL NOT NULL, PRIMARY KEY (kind, date))',
+)
+
+
+def content_etag(data) -> str:
+    return hashlib.sha1(json.dumps(data, sort_keys=True, default=str).encode('utf-8')).hexdigest()[:24]
+
+
+class SnapshotStore:
+    """(kind, date) -> latest snapshot, in a SQLite file shared across processes."""
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or os.environ.get('LIVE_CACHE_DB') or DEFAULT_DB
+        self._local = threading.local()
+        # Parsed payloads by (kind, date), reused while the stored etag is unchanged
+        self._parsed: Dict[Tuple[str, str], dict] = {}
+        self._lock = threading.Lock()
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+            try:
+                conn.execute('PRAGMA journal_mode=WAL')
+            except sqlite3.DatabaseError:
+                pass
+            for stmt in _SCHEMA:
+                conn.execute(stmt)
+            self._local.conn = conn
+        return conn
+
+    def get(self, kind: str, date: str) -> Optional[dict]:
+        """{'data', 'etag', 'modified', 'fetched'} or None; 'data' is shared, do not mutate."""
+        conn = self._conn()
+        row = conn.execute('SELECT etag, modified, fetched FROM snapshots WHERE kind=? AND date=?',
+                           (kind, date)).fetchone()
+        if row is None:
+            return None
+        etag, modified, fetched = row
+        with self._lock:
+            entry = self._parsed.get((kind, date))
+        if entry is None or entry['etag'] != etag:
+            payload = conn.execute('SELECT payload FROM snapshots WHERE kind=? AND date=?', (kind, date)).fetchone()
+            if payload is None:
+                return None
+            entry = {'data': json.loads(payload[0]), 'etag': etag}
+        entry = dict(entry, modified=modified, fetched=fetched)
+        with self._lock:
+            self._parsed[(kind, date)] = entry
+        return entry
+
+    def put(self, kind: str, date: str, data, now: Optional[float] = None) -> dict:
+        """Store a fresh snapshot; 'modified' is kept when the content did not change."""
+        now = time.time() if now is None else now
+        etag = content_etag(data)
+        conn = self._conn()
+        with _transaction(conn):
+            row = conn.execute('SELECT etag, modified FROM snapshots WHERE kind=? AND date=?', (kind, date)).fetchone()
+            modified = row[1] if row and row[0] == etag else now
+            conn.execute('INSERT OR REPLACE INTO snapshots (kind, date, etag, modified, fetched, payload) '
+                         'VALUES (?, ?, ?, ?, ?, ?)', (kind, date, etag, modified, now, json.dumps(data)))
+            conn.execute('DELETE FROM leases WHERE kind=? AND date=?', (kind, date))
+        return {'data': data, 'etag': etag, 'modified': modified, 'fetched': now}
+
+    def touch(self, kind: str, date: str, now: Optional[float] = None) -> None:
+        """Mark a snapshot as fetched without changing it (after a failed refresh).
+        Without a snapshot the lease is left to expire, which spaces out the retries."""
+        conn = self._conn()
+        with _transaction(conn):
+            cur = conn.execute('UPDATE snapshots SET fetched=? WHERE kind=? AND date=?',
+                               (time.time() if now is None else now, kind, date))
+            if cur.rowcount:
+                conn.execute('DELETE FROM leases WHERE kind=? AND date=?', (kind, date))
+
+    def claim(self, kind: str, date: str, interval: float, owner: str, lease_sec: float = 120.0,
+              now: Optional[float] = None) -> bool:
+        """True when the snapshot is older than interval and no unexpired refresh lease exists
+        (including our own: a lease left by a failed fetch is the retry backoff)."""
+        now = time.time() if now is None else now
+        conn = self._conn()
+        with _transaction(conn):
+            row = conn.execute('SELECT fetched FROM snapshots WHERE kind=? AND date=?', (kind, date)).fetchone()
+            if row and now - row[0] < interval:
+                return False
+            lease = conn.execute('SELECT owner, expires FROM leases WHERE kind=? AND date=?', (kind, date)).fetchone()
+            if lease and lease[1] > now:
+                return False
+            conn.execute('INSERT OR REPLACE INTO leases (kind, date, owner, expires) VALUES (?, ?, ?, ?)',
+                         (kind, date, owner, now + lease_sec))
+        return True
+
+
+class _transaction:
+    """BEGIN IMMEDIATE ... COMMIT/ROLLBACK on an autocommit connection."""
+
+    def __init__(self, conn: sqlite3.Connection):
+        self.conn = conn
+
+    def __enter__(self):
+        self.conn.execute('BEGIN IMMEDIATE')
+        return self.conn
+
+    def __exit__(self, exc_type, exc, tb):
+        self.conn.execute('ROLLBACK' if exc_type else 'COMMIT')
+        return False
+
+
+class Refresher:
+    """Background threads, one per kind, refreshing the (kind, date) snapshots requests asked for.
+
+    fetchers maps kind -> (fetch(date) -> data, interval seconds). want() is
+    called from request handlers and only records interest.
+    """
+
+    def __init__(self, store: SnapshotStore, fetchers: Dict[str, Tuple[Callable[[str], dict], float]],
+                 idle_sec: float = 600.0, tick_sec: float = 2.0):
+        self.store = store
+        self.fetchers = fetchers
+        self.idle_sec = idle_sec
+        self.tick_sec = tick_sec
+        self.owner = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        self._wanted: Dict[Tuple[str, str], float] = {}
+        self._lock = threading.Lock()
+        self._wake: Dict[str, threading.Event] = {kind: threading.Event() for kind in fetchers}
+        self._stop = threading.Event()
+        self._threads: Dict[str, threading.Thread] = {}
+        self.fetches = 0
+        self.errors = 0
+
+    def want(self, kind: str, date: str) -> None:
+        with self._lock:
+            new = (kind, date) not in self._wanted
+            self._wanted[(kind, date)] = time.time()
+        if new and kind in self._wake:
+            self._wake[kind].set()
+
+    def start(self) -> 'Refresher':
+        with self._lock:
+            self._stop.clear()
+            for kind in self.fetchers:
+                thread = self._threads.get(kind)
+                if thread is None or not thread.is_alive():
+                    thread = self._threads[kind] = threading.Thread(target=self._run, args=(kind,),
+                                                                    name=f'live-refresher-{kind}', daemon=True)
+                    thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+        for wake in self._wake.values():
+            wake.set()
+
+    def run_once(self, now: Optional[float] = None, kind: Optional[str] = None) -> int:
+        """Refresh every wanted snapshot (of kind, or of every kind) that is due and unclaimed;
+        returns the number fetched."""
+        now = time.time() if now is None else now
+        with self._lock:
+            for key in [k for k, seen in self._wanted.items() if now - seen > self.idle_sec]:
+                del self._wanted[key]
+            due = [k for k in self._wanted if kind is None or k[0] == kind]
+        n = 0
+        for due_kind, date in due:
+            fetch, interval = self.fetchers[due_kind]
+            if not self.store.claim(due_kind, date, interval, self.owner, now=now):
+                continue
+            try:
+                self.store.put(due_kind, date, fetch(date), now=now)
+            except Exception:
+                self._count(errors=1)
+                self.store.touch(due_kind, date, now=now)
+            self._count(fetches=1)
+            n += 1
+        return n
+
+    def _count(self, fetches: int = 0, errors: int = 0) -> None:
+        with self._lock:
+            self.fetches += fetches
+            self.errors += errors
+
+    def _run(self, kind: str) -> None:
+        wake = self._wake[kind]
+        while not self._stop.is_set():
+            try:
+                self.run_once(kind=kind)
+            except Exception:
+                self._count(errors=1)
+            wake.wait(self.tick_sec)
+            wake.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            wanted = sorted(f"{k}:{d}" for k, d in self._wanted)
+            running = {kind: t.is_alive() for kind, t in self._threads.items()}
+        return {'owner': self.owner, 'wanted': wanted, 'fetches': self.fetches, 'errors': self.errors,
+                'running': bool(running) and all(running.values()), 'threads': running}
+
+
+if __name__ == '__main__':
+    import argparse
+    import sys
+    sys.path.insert(0, APP_DIR)
+    # The app module owns the fetchers (live HR, game states) and their intervals
+    from hr_scores_app import _live_fetchers
+
+    ap = argparse.ArgumentParser(description='Keep live snapshots fresh for the app workers')
+    ap.add_argument('--date', action='append', required=True, help='YYYY-MM-DD (repeatable)')
+    args = ap.parse_args()
+    refresher = Refresher(SnapshotStore(), _live_fetchers).start()
+    seen = 0
+    while True:
+        for d in args.date:
+            for kind in _live_fetchers:
+                refresher.want(kind, d)
+        if refresher.fetches != seen:
+            seen = refresher.fetches
+            print(f"refreshed {', '.join(args.date)}; {seen} fetches so far")
+        time.sleep(2.0)
@@ -0,0 +1,170 @@
+"""Active rosters for the teams playing on a date, fetched once per run.
+
+fetch_players_simple, fetch_pitchers_simple and the H2H batter fallback all
+read the same active rosters. get_rosters(date, team_ids) fetches the teams
+it does not have yet concurrently (in fetch_engine's 'rosters' lane), keeps
+them and saves them to data/rosters-DATE.json, so the later tools of a daily
+run, which are separate processes, load the file instead of refetching.
+Rosters older than the roster endpoint's http_client.CACHE_TTLS entry (1 hour)
+are refetched, in the process and from the file, so a same-day rerun picks up
+roster moves. A team whose roster request fails is reported, left out and
+retried by the next call; the file is only written once every requested team
+is present.
+
+The registry indexes entries by team and by player id (team, position).
+"""
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from typing import Dict, Iterable, List, Optional
+
+import fetch_engine
+import http_client
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+DATA_DIR = os.path.join(APP_DIR, 'data')
+ROSTER_URL = 'https://statsapi.mlb.com/api/v1/teams/{tid}/roster?rosterType=active'
+ROSTER_TTL_SEC = http_client.cache_ttl(ROSTER_URL.format(tid=0))
+
+_REGISTRIES: Dict[str, 'RosterRegistry'] = {}
+_REGISTRIES_LOCK = threading.Lock()
+
+
+@dataclass
+class RosterEntry:
+    pid: int
+    name: Optional[str]
+    team_id: int
+    position: str = 'Unknown'
+    position_code: Optional[str] = None
+    position_abbr: Optional[str] = None
+    parent_abbr: Optional[str] = None
+
+    @property
+    def is_pitcher(self) -> bool:
+        # StatsAPI roster positions: {code: '1', abbreviation: 'P', name: 'Pitcher'}
+        return self.position_code == '1' or self.position_abbr == 'P'
+
+
+@dataclass
+class RosterRegistry:
+    date: str
+    by_team: Dict[int, List[RosterEntry]] = field(default_factory=dict)
+    # pid -> team id / position name (first roster a player appears on)
+    team_by_pid: Dict[int, int] = field(default_factory=dict)
+    position_by_pid: Dict[int, str] = field(default_factory=dict)
+    # team id -> time.time() its roster was fetched
+    fetched: Dict[int, float] = field(default_factory=dict)
+
+    def add_team(self, tid: int, entries: List[RosterEntry], fetched: Optional[float] = None) -> None:
+        self.by_team[tid] = entries
+        self.fetched[tid] = time.time() if fetched is None else fetched
+        self.team_by_pid = {}
+        self.position_by_pid = {}
+        for t, team_entries in self.by_team.items():
+            for e in team_entries:
+                self.team_by_pid.setdefault(e.pid, t)
+                self.position_by_pid.setdefault(e.pid, e.position)
+
+    def is_fresh(self, tid: int) -> bool:
+        return tid in self.by_team and time.time() - self.fetched.get(tid, 0.0) < ROSTER_TTL_SEC
+
+    def roster(self, tid: int) -> List[RosterEntry]:
+        return self.by_team.get(int(tid)) or []
+
+    def pids(self, tid: int) -> set:
+        return {e.pid for e in self.roster(tid)}
+
+    def pitchers(self, tid: int) -> List[RosterEntry]:
+        return [e for e in self.roster(tid) if e.is_pitcher]
+
+    def position_players(self, tid: int) -> List[RosterEntry]:
+        return [e for e in self.roster(tid) if not e.is_pitcher]
+
+    def team_of(self, pid: int) -> Optional[int]:
+        return self.team_by_pid.get(int(pid))
+
+
+def rosters_path(date: str) -> str:
+    return os.path.join(DATA_DIR, f'rosters-{date}.json')
+
+
+def _parse_roster(tid: int, data: dict) -> List[RosterEntry]:
+    out = []
+    for e in data.get('roster') or []:
+        person = e.get('person') or {}
+        pos = e.get('position') or {}
+        if not person.get('id'):
+            continue
+        out.append(RosterEntry(pid=int(person['id']), name=person.get('fullName'), team_id=tid,
+                               position=pos.get('name') or 'Unknown', position_code=pos.get('code'),
+                               position_abbr=pos.get('abbreviation'), parent_abbr=e.get('parentTeamAbbreviation')))
+    return out
+
+
+def _fetch_roster(tid: int) -> Optional[List[RosterEntry]]:
+    try:
+        return _parse_roster(tid, http_client.get_json(ROSTER_URL.format(tid=tid), timeout=20))
+    except Exception:
+        return None
+
+
+def _load_file(reg: RosterRegistry) -> None:
+    try:
+        with open(rosters_path(reg.date), 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        fetched = data.get('fetched') or {}
+        for tid, entries in (data.get('teams') or {}).items():
+            # Files without fetch times predate the TTL: treat them as stale
+            reg.add_team(int(tid), [RosterEntry(**e) for e in entries], fetched=float(fetched.get(tid) or 0.0))
+    except Exception:
+        pass
+
+
+def _save_file(reg: RosterRegistry) -> None:
+    path = rosters_path(reg.date)
+    payload = {'date': reg.date,
+               'fetched': {str(tid): reg.fetched.get(tid) for tid in sorted(reg.by_team)},
+               'teams': {str(tid): [asdict(e) for e in entries] for tid, entries in sorted(reg.by_team.items())}}
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(payload, f, indent=2)
+        os.replace(tmp, path)
+    except OSError:
+        pass
+
+
+def get_rosters(date: str, team_ids: Iterable[int]) -> RosterRegistry:
+    """Registry for the date covering team_ids (minus teams whose fetch failed, which are reported)."""
+    wanted = list(dict.fromkeys(int(t) for t in team_ids if t))
+    with _REGISTRIES_LOCK:
+        reg = _REGISTRIES.get(date)
+        if reg is None:
+            reg = _REGISTRIES[date] = RosterRegistry(date)
+            _load_file(reg)
+        stale = [tid for tid in wanted if not reg.is_fresh(tid)]
+        if stale:
+            with fetch_engine.executor('rosters') as ex:
+                fetched = list(zip(stale, ex.map(_fetch_roster, stale)))
+            failed = [tid for tid, entries in fetched if entries is None]
+            for tid, entries in fetched:
+                if entries is not None:
+                    reg.add_team(tid, entries)
+            missing = [tid for tid in failed if tid not in reg.by_team]
+            kept = [tid for tid in failed if tid in reg.by_team]
+            if missing:
+                # Leave the file alone so the next run refetches instead of loading a partial registry
+                print(f"Warning: no active roster for team(s) {', '.join(map(str, missing))} on {date}; "
+                      f"their players are left out")
+            else:
+                _save_file(reg)
+            if kept:
+                print(f"Warning: roster refetch failed for team(s) {', '.join(map(str, kept))} on {date}; "
+                      f"using the older roster")
+        return reg
@@ -0,0 +1,201 @@
+"""Normalized schedule model shared by the scorer and the app.
+
+Parses a schedule JSON (MLB StatsAPI `dates[0].games` or a flat `games` list
+with home_team/away_team) once into per-game records with O(1) maps:
+team -> game, team -> home team / park key, team -> opponent and opposing
+probable pitcher, and gamePk -> game.
+
+Team codes are normalized with the caller's `norm_team`, since the scorer and
+the app normalize abbreviations slightly differently. Parsed schedules are
+memoized by file (path, mtime, size) and normalizer.
+"""
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Tuple
+
+from file_memo import file_memo
+
+TEAM_NAME_TO_ABBR = {
+    'Arizona Diamondbacks': 'ARI', 'Atlanta Braves': 'ATL', 'Baltimore Orioles': 'BAL', 'Boston Red Sox': 'BOS',
+    'Chicago Cubs': 'CHC', 'Chicago White Sox': 'CWS', 'Cincinnati Reds': 'CIN', 'Cleveland Guardians': 'CLE',
+    'Colorado Rockies': 'COL', 'Detroit Tigers': 'DET', 'Houston Astros': 'HOU', 'Kansas City Royals': 'KC',
+    'Los Angeles Angels': 'LAA', 'Los Angeles Dodgers': 'LAD', 'Miami Marlins': 'MIA', 'Milwaukee Brewers': 'MIL',
+    'Minnesota Twins': 'MIN', 'New York Mets': 'NYM', 'New York Yankees': 'NYY', 'Oakland Athletics': 'OAK',
+    'Philadelphia Phillies': 'PHI', 'Pittsburgh Pirates': 'PIT', 'San Diego Padres': 'SD', 'Seattle Mariners': 'SEA',
+    'San Francisco Giants': 'SF', 'St. Louis Cardinals': 'STL', 'Tampa Bay Rays': 'TB', 'Texas Rangers': 'TEX',
+    'Toronto Blue Jays': 'TOR', 'Washington Nationals': 'WSH'
+}
+
+
+def _upper(abbr: Optional[str]) -> Optional[str]:
+    return abbr.upper() if abbr else abbr
+
+
+def state_code(status: Optional[dict]) -> str:
+    """Map a StatsAPI status object to LIVE | FINAL | SCHEDULED."""
+    st = status or {}
+    abs_state = (st.get('abstractGameState') or st.get('detailedState') or '').strip().lower()
+    if abs_state.startswith('live') or abs_state in ('in progress', 'in-progress'):
+        return 'LIVE'
+    if abs_state.startswith('final'):
+        return 'FINAL'
+    return 'SCHEDULED'
+
+
+@dataclass
+class ScheduledGame:
+    game_pk: Optional[str]
+    home: Optional[str]
+    away: Optional[str]
+    home_pitcher: Optional[str] = None
+    away_pitcher: Optional[str] = None
+    home_pitcher_id: Optional[int] = None
+    away_pitcher_id: Optional[int] = None
+    state: str = 'SCHEDULED'
+    raw: dict = field(default_factory=dict, repr=False)
+
+    def side_of(self, team: Optional[str]) -> Optional[str]:
+        if team and team == self.home:
+            return 'home'
+        if team and team == self.away:
+            return 'away'
+        return None
+
+
+def _team_to_abbr(tobj: dict, norm_team: Callable) -> Optional[str]:
+    ab = tobj.get('abbreviation') or tobj.get('triCode') or tobj.get('teamCode')
+    if not ab:
+        nm = tobj.get('name') or tobj.get('teamName') or tobj.get('shortName')
+        ab = TEAM_NAME_TO_ABBR.get(nm or '', None)
+    return norm_team(ab) if ab else None
+
+
+def _parse_game(g: dict, norm_team: Callable) -> ScheduledGame:
+    teams_obj = g.get('teams') or {}
+    home_abbr = away_abbr = None
+    if 'home_team' in g and 'away_team' in g:
+        home_abbr = norm_team(g.get('home_team'))
+        away_abbr = norm_team(g.get('away_team'))
+    elif teams_obj:
+        home_abbr = _team_to_abbr(teams_obj.get('home', {}).get('team', {}) or {}, norm_team)
+        away_abbr = _team_to_abbr(teams_obj.get('away', {}).get('team', {}) or {}, norm_team)
+    home_p = (g.get('home_pitcher') or {}).get('name')
+    away_p = (g.get('away_pitcher') or {}).get('name')
+    home_pid = (g.get('home_pitcher') or {}).get('id')
+    away_pid = (g.get('away_pitcher') or {}).get('id')
+    if not home_p or not away_p:
+        pp = g.get('probablePitchers') or {}
+        hp = pp.get('home') or {}
+        ap = pp.get('away') or {}
+        home_p = home_p or hp.get('fullName') or hp.get('name')
+        away_p = away_p or ap.get('fullName') or ap.get('name')
+        home_pid = home_pid or hp.get('id')
+        away_pid = away_pid or ap.get('id')
+    if (not home_p or not away_p) and teams_obj:
+        hp = teams_obj.get('home', {}).get('probablePitcher') or {}
+        ap = teams_obj.get('away', {}).get('probablePitcher') or {}
+        home_p = home_p or hp.get('fullName') or hp.get('lastFirstName') or hp.get('name')
+        away_p = away_p or ap.get('fullName') or ap.get('lastFirstName') or ap.get('name')
+        home_pid = home_pid or hp.get('id')
+        away_pid = away_pid or ap.get('id')
+    game_pk = g.get('gamePk') or g.get('gamepk')
+    return ScheduledGame(
+        game_pk=str(game_pk) if game_pk else None,
+        home=home_abbr,
+        away=away_abbr,
+        home_pitcher=home_p,
+        away_pitcher=away_p,
+        home_pitcher_id=home_pid,
+        away_pitcher_id=away_pid,
+        state=state_code(g.get('status')),
+        raw=g,
+    )
+
+
+class Schedule:
+    """One slate's games with constant-time team and gamePk lookups.
+
+    For doubleheaders the per-team maps hold the team's first game, like the
+    app's old team lookup; the scorer walks `games` itself so the later game
+    wins there, as it always did.
+    """
+
+    def __init__(self, data: Optional[dict] = None, norm_team: Optional[Callable] = None):
+        self.norm_team = norm_team or _upper
+        data = data or {}
+        raw_games = data.get('games') or (data.get('dates') or [{}])[0].get('games', []) if data else []
+        self.date: Optional[str] = None
+        if isinstance(data.get('dates'), list) and data['dates']:
+            self.date = data['dates'][0].get('date')
+        self.games: List[ScheduledGame] = [_parse_game(g, self.norm_team) for g in (raw_games or [])]
+        self.by_pk: Dict[str, ScheduledGame] = {}
+        self.by_team: Dict[str, ScheduledGame] = {}
+        for game in self.games:
+            if game.game_pk:
+                self.by_pk.setdefault(game.game_pk, game)
+            if game.home and game.away:
+                self.by_team.setdefault(game.home, game)
+                self.by_team.setdefault(game.away, game)
+
+    def __bool__(self) -> bool:
+        return bool(self.games)
+
+    def game_for_team(self, team: Optional[str]) -> Optional[ScheduledGame]:
+        return self.by_team.get(team) if team else None
+
+    def game_by_pk(self, game_pk) -> Optional[ScheduledGame]:
+        return self.by_pk.get(str(game_pk)) if game_pk else None
+
+    def teams(self) -> List[str]:
+        return list(self.by_team.keys())
+
+    def opponent(self, team: Optional[str]) -> Tuple[Optional[str], Optional[bool]]:
+        """Return (opponent_abbr, is_home), or (None, None) when the team is off."""
+        game = self.game_for_team(team)
+        side = game.side_of(team) if game else None
+        if side == 'home':
+            return game.away, True
+        if side == 'away':
+            return game.home, False
+        return None, None
+
+    def opposing_pitcher(self, team: Optional[str]) -> Tuple[Optional[str], Optional[int]]:
+        """Probable starter the team faces: (name, mlbam id)."""
+        game = self.game_for_team(team)
+        side = game.side_of(team) if game else None
+        if side == 'home':
+            return game.away_pitcher, game.away_pitcher_id
+        if side == 'away':
+            return game.home_pitcher, game.home_pitcher_id
+        return None, None
+
+    def home_team(self, team: Optional[str]) -> Optional[str]:
+        game = self.game_for_team(team)
+        return game.home if game else None
+
+    def park_key(self, team: Optional[str]) -> Optional[str]:
+        home = self.home_team(team)
+        return f"{home}_park" if home else None
+
+    def state(self, team: Optional[str]) -> Optional[str]:
+        game = self.game_for_team(team)
+        return game.state if game else None
+
+
+def _read_schedule(path: str, norm_team: Optional[Callable] = None) -> Schedule:
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except Exception:
+        data = {}
+    return Schedule(data if isinstance(data, dict) else {}, norm_team)
+
+
+_load_schedule = file_memo(_read_schedule, maxsize=16, missing=lambda path, norm_team: Schedule({}, norm_team))
+
+
+def load_schedule(path: Optional[str], norm_team: Optional[Callable] = None) -> Schedule:
+    """Parse a schedule file once per (path, mtime, size, normalizer); empty Schedule if missing."""
+    return _load_schedule(path, norm_team)
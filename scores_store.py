@@ -0,0 +1,228 @@
+"""Read and write hr-scores-YYYY-MM-DD outputs in the supported formats.
+
+Formats (HR_SCORES_FORMAT, or generate(output_format=...)):
+
+- json     hr-scores-DATE.json, indented (legacy default)
+- compact  hr-scores-DATE.json without whitespace
+- gzip     compact JSON in hr-scores-DATE.json.gz
+
+Compact and gzip saves also write hr-scores-DATE.npz, a columnar sidecar
+holding the numeric fields (scores, probabilities, factors, stats) as one
+float matrix plus names, teams and MLBAM ids, for readers that want columns
+rather than nested rows. Saving a date in one format removes its file in the other
+format and any stale sidecar, so every reader sees exactly one version.
+
+load_scores() reads any format. load_columns() uses the sidecar when it is
+at least as new as the scores file, else builds the columns from the JSON.
+ScoresCache keeps parsed documents in memory for long-running readers (the
+app), keyed by file version and bounded by entry count and bytes.
+"""
+from __future__ import annotations
+
+import gzip
+import json
+import os
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+from file_memo import file_version
+
+FORMATS = ('json', 'compact', 'gzip')
+FORMAT_ENV = 'HR_SCORES_FORMAT'
+
+FACTOR_KEYS = ('power_comp', 'recent_comp', 'pitcher_comp', 'park_weather_pct', 'h2h_bonus', 'pitchtype_bonus',
+               'market_scaler_pct', 'market_blend_delta', 'pa_multiplier_pct')
+STAT_KEYS = ('homeRuns', 'battingAvg', 'slugging', 'iso')
+NUMERIC_KEYS = ('hr_score', 'model_prob', 'model_prob_raw', 'pitcher_era', 'pitcher_hr_allowed')
+TEXT_KEYS = ('name', 'team', 'position', 'opposing_pitcher')
+
+
+def output_format(value: Optional[str] = None) -> str:
+    """Explicit value, else HR_SCORES_FORMAT, else 'json'; unknown names fall back to 'json'."""
+    fmt = str(value or os.environ.get(FORMAT_ENV) or 'json').lower().strip()
+    return fmt if fmt in FORMATS else 'json'
+
+
+def scores_path(data_dir: str, date: str, fmt: str = 'json') -> str:
+    return os.path.join(data_dir, f"hr-scores-{date}.json" + ('.gz' if fmt == 'gzip' else ''))
+
+
+def columns_path(path: str) -> str:
+    """hr-scores-DATE.json[.gz] -> hr-scores-DATE.npz"""
+    base = path[:-3] if path.endswith('.gz') else path
+    return (base[:-5] if base.endswith('.json') else base) + '.npz'
+
+
+def existing_scores_path(data_dir: str, date: str) -> Optional[str]:
+    for fmt in ('json', 'gzip'):
+        path = scores_path(data_dir, date, fmt)
+        if os.path.exists(path):
+            return path
+    return None
+
+
+def _remove(path: str) -> None:
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+def _replace_atomic(path: str, payload: bytes) -> None:
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, 'wb') as f:
+        f.write(payload)
+    os.replace(tmp, path)
+
+
+def save_scores(data: Dict, data_dir: str, fmt: str = 'json') -> str:
+    """Write a scores document for data['date'] in the given format; returns the path written."""
+    fmt = output_format(fmt)
+    date = data['date']
+    path = scores_path(data_dir, date, fmt)
+    if fmt == 'json':
+        payload = json.dumps(data, indent=2).encode('utf-8')
+    else:
+        payload = json.dumps(data, separators=(',', ':')).encode('utf-8')
+        if fmt == 'gzip':
+            payload = gzip.compress(payload, compresslevel=6, mtime=0)
+    _replace_atomic(path, payload)
+    _remove(scores_path(data_dir, date, 'json' if fmt == 'gzip' else 'gzip'))
+    sidecar = columns_path(path)
+    if fmt == 'json' or not _save_columns(data, sidecar):
+        _remove(sidecar)
+    return path
+
+
+def _read_payload(path: str) -> bytes:
+    """The file's JSON text as bytes (decompressed for .gz)."""
+    with open(path, 'rb') as f:
+        raw = f.read()
+    return gzip.decompress(raw) if path.endswith('.gz') else raw
+
+
+def load_scores(path: str) -> Dict:
+    return json.loads(_read_payload(path))
+
+
+class ScoresCache:
+    """LRU of parsed scores documents keyed by (path, mtime_ns, size).
+
+    Bounded by entry count and by the documents' JSON size in bytes; a newer
+    version of a file replaces the old entry. Thread-safe; parsing happens
+    outside the lock. Cached documents are shared by every caller, so they
+    must be treated as read-only: copy a row (or the document) before
+    overlaying per-request fields on it.
+    """
+
+    def __init__(self, max_entries: int = 16, max_bytes: int = 64 * 1024 * 1024):
+        self.max_entries = max(1, int(max_entries))
+        self.max_bytes = max(0, int(max_bytes))
+        self._lock = threading.Lock()
+        self._entries: 'OrderedDict[Tuple[str, int, int], Tuple[Dict, int]]' = OrderedDict()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, path: str) -> Dict:
+        key = file_version(path)
+        if key is None:
+            raise FileNotFoundError(path)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+            self.misses += 1
+        payload = _read_payload(path)
+        doc = json.loads(payload)
+        nbytes = len(payload)
+        if nbytes > self.max_bytes:
+            return doc
+        with self._lock:
+            for old in [k for k in self._entries if k[0] == path and k != key]:
+                self._bytes -= self._entries.pop(old)[1]
+            if key not in self._entries:
+                self._entries[key] = (doc, nbytes)
+                self._bytes += nbytes
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self._bytes -= evicted
+                self.evictions += 1
+            return self._entries[key][0] if key in self._entries else doc
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'max_entries': self.max_entries,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+            }
+
+
+def columns_from_doc(doc: Dict) -> Dict:
+    """Column arrays (numpy) for a scores document, in row order."""
+    import numpy as np
+
+    players = doc.get('players') or []
+
+    def num(v):
+        return float('nan') if v is None else float(v)
+
+    cols = {key: np.array([p.get(key) or '' for p in players], dtype=str) for key in TEXT_KEYS}
+    cols['mlbam_id'] = np.array([p.get('mlbam_id') if p.get('mlbam_id') is not None else -1 for p in players],
+                                dtype=np.int64)
+    for key in NUMERIC_KEYS:
+        cols[key] = np.array([num(p.get(key)) for p in players], dtype=float)
+    for key in FACTOR_KEYS:
+        cols['factors.' + key] = np.array([num((p.get('factors') or {}).get(key)) for p in players], dtype=float)
+    for key in STAT_KEYS:
+        cols['stats.' + key] = np.array([num((p.get('stats') or {}).get(key)) for p in players], dtype=float)
+    return cols
+
+
+def _save_columns(doc: Dict, path: str) -> bool:
+    try:
+        import numpy as np
+    except Exception:
+        return False
+    cols = columns_from_doc(doc)
+    # Float columns are stored as one (n_columns, n_players) matrix: far fewer archive members to open
+    float_keys = [k for k, v in cols.items() if v.dtype.kind == 'f']
+    arrays = {k: v for k, v in cols.items() if v.dtype.kind != 'f'}
+    arrays['float_keys'] = np.array(float_keys, dtype=str)
+    arrays['float_values'] = np.vstack([cols[k] for k in float_keys]) if float_keys else np.empty((0, 0))
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, 'wb') as f:
+        np.savez(f, **arrays)
+    os.replace(tmp, path)
+    return True
+
+
+def load_columns(path: str) -> Dict:
+    """Columns for a scores file: the .npz sidecar when current, else derived from the JSON."""
+    sidecar = columns_path(path)
+    try:
+        if os.stat(sidecar).st_mtime_ns >= os.stat(path).st_mtime_ns:
+            import numpy as np
+            with np.load(sidecar, allow_pickle=False) as z:
+                cols = {key: z[key] for key in z.files}
+            values = cols.pop('float_values')
+            for i, key in enumerate(cols.pop('float_keys').tolist()):
+                cols[key] = values[i]
+            return cols
+    except Exception:
+        pass
+    return columns_from_doc(load_scores(path))
@@ -0,0 +1,126 @@
+"""Immutable scoring parameters for generate_hr_scores_core.
+
+A ScoringConfig is resolved once per run (env, then an optional JSON file,
+then CLI overrides) and passed explicitly into generate()/_compute_scores(),
+so the scorer never reads the environment while scoring and several configs
+can be scored side by side in threads or processes.
+
+Overrides may use either the field name (``park_exponent``) or the env var
+name (``PARK_EXPONENT``). Unparseable values fall back to the defaults, as
+the old per-call env reads did.
+"""
+from __future__ import annotations
+
+import dataclasses
+import json
+import os
+from dataclasses import dataclass
+from typing import Dict, Mapping, Optional
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+DATA_DIR = os.path.join(APP_DIR, 'data')
+
+# field name -> env var
+ENV_VARS = {
+    'park_exponent': 'PARK_EXPONENT',
+    'park_clamp_min': 'PARK_CLAMP_MIN',
+    'park_clamp_max': 'PARK_CLAMP_MAX',
+    'rank_mode': 'RANK_MODE',
+    'player_market_alpha': 'PLAYER_MARKET_ALPHA',
+    'player_market_blend_cap': 'PLAYER_MARKET_BLEND_CAP',
+    'market_scale_min': 'MARKET_SCALE_MIN',
+    'market_scale_max': 'MARKET_SCALE_MAX',
+    'engine': 'SCORING_ENGINE',
+    'calibration_file': 'CALIBRATION_FILE',
+}
+_FIELD_BY_ENV = {v: k for k, v in ENV_VARS.items()}
+ENGINES = ('loop', 'vectorized')
+
+
+@dataclass(frozen=True)
+class ScoringConfig:
+    park_exponent: float = 1.1
+    park_clamp_min: float = 0.9
+    park_clamp_max: float = 1.1
+    rank_mode: str = 'model'
+    # None -> 0.1 when rank_mode is 'blended', else 0.0
+    player_market_alpha: Optional[float] = None
+    player_market_blend_cap: float = 3.0
+    market_scale_min: float = 0.99
+    market_scale_max: float = 1.03
+    engine: str = 'loop'
+    calibration_file: Optional[str] = None
+
+    @property
+    def market_alpha(self) -> float:
+        if self.player_market_alpha is not None:
+            return self.player_market_alpha
+        return 0.1 if self.rank_mode == 'blended' else 0.0
+
+    @property
+    def blended(self) -> bool:
+        return self.rank_mode == 'blended' and self.market_alpha > 0.0
+
+    @property
+    def calibration_path(self) -> str:
+        return self.calibration_file or os.path.join(DATA_DIR, 'model_calibration.json')
+
+    def with_overrides(self, overrides: Optional[Mapping[str, object]] = None) -> 'ScoringConfig':
+        """Copy with overrides applied (field or env var names); unknown keys raise KeyError."""
+        if not overrides:
+            return self
+        changes = {}
+        for key, raw in overrides.items():
+            name = _FIELD_BY_ENV.get(key, key)
+            if name not in ENV_VARS:
+                raise KeyError(f"unknown scoring setting: {key}")
+            changes[name] = _parse(name, raw, getattr(ScoringConfig, name, None))
+        return dataclasses.replace(self, **changes)
+
+    def to_dict(self) -> Dict[str, object]:
+        return dataclasses.asdict(self)
+
+
+def _parse(name: str, raw, default):
+    if name == 'rank_mode':
+        return str(raw or 'model').lower().strip()
+    if name == 'engine':
+        engine = str(raw or 'loop').lower().strip()
+        return engine if engine in ENGINES else 'loop'
+    if name == 'calibration_file':
+        return str(raw) if raw else None
+    try:
+        return float(raw)
+    except Exception:
+        return default
+
+
+def from_env(env: Optional[Mapping[str, str]] = None) -> ScoringConfig:
+    env = os.environ if env is None else env
+    return ScoringConfig().with_overrides({k: env[v] for k, v in ENV_VARS.items() if v in env})
+
+
+def from_file(path: str, base: Optional[ScoringConfig] = None) -> ScoringConfig:
+    """Apply a JSON object of settings on top of base (default: from_env())."""
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    if not isinstance(data, dict):
+        raise ValueError(f"{path}: expected a JSON object of scoring settings")
+    return (base or from_env()).with_overrides(data)
+
+
+def resolve_config(path: Optional[str] = None, overrides: Optional[Mapping[str, object]] = None) -> ScoringConfig:
+    """env -> optional JSON file -> explicit overrides (e.g. CLI), resolved once."""
+    cfg = from_file(path) if path else from_env()
+    return cfg.with_overrides(overrides)
+
+
+def parse_set_args(items) -> Dict[str, str]:
+    """['PARK_EXPONENT=1.15', 'rank_mode=blended'] -> dict, for repeatable --set flags."""
+    out = {}
+    for item in items or []:
+        key, sep, val = str(item).partition('=')
+        if not sep or not key.strip():
+            raise ValueError(f"expected NAME=VALUE, got {item!r}")
+        out[key.strip()] = val.strip()
+    return out
@@ -0,0 +1,10 @@
+from data_catalog import DataCatalog
+
+
+def test_only_hr_scores_are_indexed_as_gzip(tmp_path):
+    for name in ('player-stats-2025-09-01.json', 'player-stats-2025-09-02.json.gz', 'hr-scores-2025-09-02.json.gz'):
+        (tmp_path / name).write_text('{}')
+    catalog = DataCatalog(str(tmp_path))
+    # The gzipped player stats would be opened as text by the scorer; the earlier plain file is used
+    assert catalog.pick('player-stats', '2025-09-02') == (str(tmp_path / 'player-stats-2025-09-01.json'), '2025-09-01')
+    assert catalog.exact('hr-scores', '2025-09-02') == str(tmp_path / 'hr-scores-2025-09-02.json.gz')
@@ -0,0 +1,29 @@
+"""Doubleheaders: the scorer keeps the later game per team, the app's lookups the first."""
+import generate_hr_scores_core as core
+from schedule_index import Schedule
+
+
+def _game(pk, home, away, home_p, away_p):
+    return {'gamePk': pk, 'home_team': home, 'away_team': away,
+            'home_pitcher': {'name': home_p[0], 'id': home_p[1]},
+            'away_pitcher': {'name': away_p[0], 'id': away_p[1]}}
+
+
+SCHEDULE = Schedule({'games': [
+    _game(1, 'NYY', 'BOS', ('Gerrit Cole', 543037), ('Brayan Bello', 678394)),
+    _game(2, 'BOS', 'NYY', ('Garrett Crochet', 676979), ('Carlos Rodon', 607074)),
+]}, core._norm_team)
+
+
+def test_scorer_uses_the_later_game():
+    opp = core._opp_pitcher_by_team(SCHEDULE, lambda name: None)
+    assert opp['NYY'] == {'opp_pitcher': 'Garrett Crochet', 'opp_pitcher_id': 676979, 'home': False, 'opp_team': 'BOS'}
+    assert opp['BOS'] == {'opp_pitcher': 'Carlos Rodon', 'opp_pitcher_id': 607074, 'home': True, 'opp_team': 'NYY'}
+    assert core._park_team(opp, 'BOS') == 'BOS'
+    assert core._park_team(opp, 'NYY') is None
+
+
+def test_schedule_lookups_use_the_first_game():
+    assert SCHEDULE.opponent('NYY') == ('BOS', True)
+    assert SCHEDULE.opposing_pitcher('NYY') == ('Brayan Bello', 678394)
+    assert SCHEDULE.game_by_pk(2).home == 'BOS'
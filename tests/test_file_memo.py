@@ -0,0 +1,42 @@
+"""file_memo: parse once per file version, FIFO eviction, uncached missing files."""
+import os
+
+from file_memo import file_memo, file_version
+
+
+def test_reparses_only_when_the_file_changes(tmp_path):
+    path = tmp_path / 'a.json'
+    path.write_text('1')
+    calls = []
+    load = file_memo(lambda p, scale: calls.append(p) or int(open(p).read()) * scale, maxsize=2)
+    assert load(str(path), 10) == 10 and load(str(path), 10) == 10
+    assert load(str(path), 2) == 2
+    path.write_text('33')
+    assert load(str(path), 10) == 330
+    assert len(calls) == 3
+
+
+def test_oldest_entry_is_evicted(tmp_path):
+    paths = []
+    for i in range(3):
+        p = tmp_path / f'{i}.txt'
+        p.write_text(str(i))
+        paths.append(str(p))
+    calls = []
+    load = file_memo(lambda p: calls.append(p) or open(p).read(), maxsize=2)
+    for p in paths + paths[1:]:
+        load(p)
+    assert calls == paths
+    load(paths[0])
+    assert calls == paths + paths[:1]
+
+
+def test_missing_files_are_not_cached(tmp_path):
+    path = str(tmp_path / 'later.txt')
+    load = file_memo(lambda p: open(p).read(), maxsize=4, missing=lambda p: '')
+    assert file_version(path) is None and load(path) == ''
+    with open(path, 'w') as f:
+        f.write('x')
+    assert file_version(path)[0] == path and load(path) == 'x'
+    os.remove(path)
+    assert load(path) == ''
@@ -0,0 +1,9 @@
+import generate_hr_scores_core as core
+
+
+def test_dates_without_their_own_schedule_are_skipped(capsys):
+    # 2025-09-10 has no schedule and would fall back to (and rewrite) 2025-09-09
+    results = core.generate_many(['2025-09-09', '2025-09-10'], save=False)
+    assert results[0]['date'] == '2025-09-09'
+    assert results[1] is None
+    assert 'skipping 2025-09-10' in capsys.readouterr().out
@@ -0,0 +1,40 @@
+"""Live snapshots: one refresher thread per kind, and requests never fetch upstream."""
+import threading
+import time
+
+import live_cache
+
+
+def test_slow_kind_does_not_hold_up_others(tmp_path):
+    release = threading.Event()
+
+    def slow(date):
+        release.wait(10)
+        return {'date': date, 'hitters': {}}
+
+    store = live_cache.SnapshotStore(str(tmp_path / 'live.sqlite'))
+    refresher = live_cache.Refresher(store, {'live-hr': (slow, 90), 'game-states': (lambda d: {'date': d, 'teams': {}}, 60)},
+                                     tick_sec=0.05)
+    refresher.want('live-hr', '2025-09-05')
+    refresher.want('game-states', '2025-09-05')
+    refresher.start()
+    try:
+        deadline = time.time() + 5
+        while store.get('game-states', '2025-09-05') is None and time.time() < deadline:
+            time.sleep(0.02)
+        assert store.get('game-states', '2025-09-05') is not None
+        assert store.get('live-hr', '2025-09-05') is None
+        assert set(refresher.stats()['threads']) == {'live-hr', 'game-states'}
+    finally:
+        release.set()
+        refresher.stop()
+
+
+def test_first_game_states_request_does_not_fetch(tmp_path, monkeypatch):
+    import hr_scores_app as app_mod
+    monkeypatch.setattr(app_mod, '_live_store', live_cache.SnapshotStore(str(tmp_path / 'live.sqlite')))
+    monkeypatch.setattr(app_mod, '_LIVE_REFRESHER_ENABLED', False)
+    monkeypatch.setattr(app_mod, '_fetch_game_states', lambda date: (_ for _ in ()).throw(AssertionError('fetched')))
+    resp = app_mod.app.test_client().get('/api/game-states?date=2025-09-05')
+    assert resp.status_code == 200
+    assert resp.get_json() == {'date': '2025-09-05', 'teams': {}}
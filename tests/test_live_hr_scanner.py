@@ -0,0 +1,108 @@
+import json
+
+from live_cache import SnapshotStore
+from tools import fetch_hr_hitters as hr
+
+DATE = '2025-09-05'
+
+
+class _Response:
+    status_code = 200
+
+    def __init__(self, data):
+        self.data = data
+        self.content = json.dumps(data).encode('utf-8')
+
+    def json(self):
+        return self.data
+
+
+def _homer(pid, name):
+    return {'result': {'eventType': 'home_run'}, 'matchup': {'batter': {'id': pid, 'fullName': name}},
+            'about': {'isComplete': True}}
+
+
+def test_scan_resumes_from_cursors_saved_by_another_worker(tmp_path, monkeypatch):
+    plays = [{'result': {'eventType': 'single'}, 'about': {'isComplete': True}}, _homer(1, 'A')]
+
+    def fake_get(url, params=None, **kwargs):
+        if url.endswith('/schedule'):
+            return _Response({'dates': [{'games': [{'gamePk': 7, 'status': {'abstractGameState': 'Live'}}]}]})
+        return _Response({'liveData': {'plays': {'allPlays': list(plays)}}})
+
+    monkeypatch.setattr(hr.http_client, 'get', fake_get)
+    db = str(tmp_path / 'live.sqlite')
+
+    first = hr.fetch_hr_hitters_from_statsapi(DATE, store=SnapshotStore(db))
+    assert first['hitters'] == {'1': {'name': 'A', 'hr': 1}}
+
+    # The lease moves to another worker: a separate store and no in-process scanner
+    plays.append(_homer(1, 'A'))
+    plays.append(_homer(2, 'B'))
+    second = hr.fetch_hr_hitters_from_statsapi(DATE, store=SnapshotStore(db))
+    assert second['hitters'] == {'1': {'name': 'A', 'hr': 2}, '2': {'name': 'B', 'hr': 1}}
+    saved = SnapshotStore(db).get(hr.SCAN_STATE_KIND, DATE)['data']
+    assert saved['7']['cursor'] == 4
+
+
+def test_refresh_applies_only_the_diff_since_the_last_timecode(monkeypatch):
+    requests = []
+    diffs = {
+        # A homer completes, the next play starts and is then completed as a homer in a later patch
+        '20250905_010000': [{'diff': [
+            {'op': 'add', 'path': '/liveData/plays/allPlays/2', 'value': _homer(1, 'A')},
+            {'op': 'add', 'path': '/liveData/plays/allPlays/3',
+             'value': dict(_homer(2, 'B'), about={'isComplete': False}, result={})},
+            {'op': 'replace', 'path': '/liveData/linescore/currentInning', 'value': 5},
+            {'op': 'replace', 'path': '/metaData/timeStamp', 'value': '20250905_010500'}]}],
+        '20250905_010500': [{'diff': [
+            {'op': 'add', 'path': '/liveData/plays/allPlays/3/result/eventType', 'value': 'home_run'},
+            {'op': 'replace', 'path': '/liveData/plays/allPlays/3/about/isComplete', 'value': True},
+            {'op': 'replace', 'path': '/metaData/timeStamp', 'value': '20250905_011000'}]}],
+        '20250905_011000': [],
+    }
+
+    def fake_get(url, params=None, **kwargs):
+        requests.append(url.rsplit('/', 1)[-1])
+        if url.endswith('/schedule'):
+            return _Response({'dates': [{'games': [{'gamePk': 7, 'status': {'abstractGameState': 'Live'}}]}]})
+        if url.endswith('/diffPatch'):
+            return _Response(diffs[params['startTimecode']])
+        plays = [{'result': {'eventType': 'single'}, 'about': {'isComplete': True}},
+                 {'result': {}, 'about': {'isComplete': False}}]
+        return _Response({'metaData': {'timeStamp': '20250905_010000'}, 'liveData': {'plays': {'allPlays': plays}}})
+
+    monkeypatch.setattr(hr.http_client, 'get', fake_get)
+    scanner = hr.LiveHRScanner(DATE)
+    assert scanner.scan()['hitters'] == {}
+    assert scanner.games[7]['cursor'] == 1
+    # Play 1 was still in progress; the diff replaces nothing for it, so it stays pending
+    diffs['20250905_010000'][0]['diff'].insert(0, {'op': 'replace', 'path': '/liveData/plays/allPlays/1',
+                                                   'value': {'result': {'eventType': 'walk'}, 'about': {'isComplete': True}}})
+    assert scanner.scan()['hitters'] == {'1': {'name': 'A', 'hr': 1}}
+    assert scanner.games[7]['cursor'] == 3
+    assert scanner.scan()['hitters'] == {'1': {'name': 'A', 'hr': 1}, '2': {'name': 'B', 'hr': 1}}
+    assert scanner.scan()['hitters'] == {'1': {'name': 'A', 'hr': 1}, '2': {'name': 'B', 'hr': 1}}
+    assert [r for r in requests if r != 'schedule'] == ['live', 'diffPatch', 'diffPatch', 'diffPatch']
+    assert scanner.full_reads == 1 and scanner.games[7]['pending'] == []
+
+
+def test_unplaceable_diff_falls_back_to_the_full_feed(monkeypatch):
+    feeds = []
+
+    def fake_get(url, params=None, **kwargs):
+        if url.endswith('/schedule'):
+            return _Response({'dates': [{'games': [{'gamePk': 7, 'status': {'abstractGameState': 'Live'}}]}]})
+        if url.endswith('/diffPatch'):
+            # An edit to a play the scanner never saw
+            return _Response([{'diff': [{'op': 'replace', 'path': '/liveData/plays/allPlays/9/about/isComplete',
+                                         'value': True}]}])
+        feeds.append(url)
+        plays = [_homer(1, 'A')] * len(feeds)
+        return _Response({'metaData': {'timeStamp': f't{len(feeds)}'}, 'liveData': {'plays': {'allPlays': plays}}})
+
+    monkeypatch.setattr(hr.http_client, 'get', fake_get)
+    scanner = hr.LiveHRScanner(DATE)
+    scanner.scan()
+    assert scanner.scan()['hitters'] == {'1': {'name': 'A', 'hr': 2}}
+    assert len(feeds) == 2 and scanner.games[7]['timecode'] == 't2'
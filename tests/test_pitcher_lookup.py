@@ -0,0 +1,28 @@
+"""Opposing pitchers without an id still find their stats under another spelling of their name."""
+import pytest
+
+import generate_hr_scores_core as core
+
+PITCHER_IDX = {
+    'Jose Berrios': {'era_f': 3.9, 'hr_allowed_i': 25},
+    'JP France': {'era_f': 5.1, 'hr_allowed_i': 30},
+    'Luis Garcia': {'era_f': 4.4, 'hr_allowed_i': 12},
+}
+PITCHER_ADV_IDX = {'Jose Berrios': {'vsR': {'xslg': 0.41}, 'vsL': {'xslg': 0.38}}}
+
+
+@pytest.mark.parametrize('schedule_name, idx_name', [
+    ('José Berríos', 'Jose Berrios'),
+    ('J.P. France', 'JP France'),
+    ('Luis Garcia Jr.', 'Luis Garcia'),
+])
+def test_pitcher_found_by_normalized_name(schedule_name, idx_name):
+    opp = {'NYY': {'opp_pitcher': schedule_name, 'opp_pitcher_id': None}}
+    ctx = core._build_slate_context(opp, PITCHER_IDX, PITCHER_ADV_IDX)
+    assert ctx.pitchers[schedule_name]['era'] == PITCHER_IDX[idx_name]['era_f']
+    assert ctx.pitchers[schedule_name]['hr_allowed'] == PITCHER_IDX[idx_name]['hr_allowed_i']
+
+
+def test_unknown_pitcher_stays_unscored():
+    opp = {'NYY': {'opp_pitcher': 'Nobody Known', 'opp_pitcher_id': None}}
+    assert 'Nobody Known' not in core._build_slate_context(opp, PITCHER_IDX, PITCHER_ADV_IDX).pitchers
@@ -0,0 +1,54 @@
+"""Roster registry: stale rosters are refetched and partial registries are not saved."""
+import json
+import os
+
+import pytest
+
+import roster_registry as rr
+
+
+@pytest.fixture
+def registry_env(tmp_path, monkeypatch):
+    monkeypatch.setattr(rr, 'DATA_DIR', str(tmp_path))
+    monkeypatch.setattr(rr, '_REGISTRIES', {})
+    calls = []
+    rosters = {111: [rr.RosterEntry(pid=1, name='A', team_id=111)], 147: [rr.RosterEntry(pid=2, name='B', team_id=147)]}
+
+    def fetch(tid):
+        calls.append(tid)
+        return rosters.get(tid)
+    monkeypatch.setattr(rr, '_fetch_roster', fetch)
+    return tmp_path, calls, rosters
+
+
+def test_failed_team_is_reported_and_not_saved(registry_env, capsys):
+    tmp_path, calls, _ = registry_env
+    reg = rr.get_rosters('2025-09-02', [111, 999])
+    assert reg.team_of(1) == 111 and not reg.roster(999)
+    assert '999' in capsys.readouterr().out
+    assert not os.path.exists(rr.rosters_path('2025-09-02'))
+    # The missing team is retried by the next call
+    rr.get_rosters('2025-09-02', [111, 999])
+    assert calls.count(999) == 2 and calls.count(111) == 1
+
+
+def test_stale_file_is_refetched(registry_env, monkeypatch):
+    tmp_path, calls, rosters = registry_env
+    rr.get_rosters('2025-09-02', [111, 147])
+    with open(rr.rosters_path('2025-09-02'), encoding='utf-8') as f:
+        saved = json.load(f)
+    assert set(saved['fetched']) == {'111', '147'}
+    # A later process loads the fresh file without fetching ...
+    monkeypatch.setattr(rr, '_REGISTRIES', {})
+    rr.get_rosters('2025-09-02', [111, 147])
+    assert sorted(calls) == [111, 147]
+    # ... but refetches once the rosters are older than the TTL, picking up roster moves
+    saved['fetched'] = {tid: 0 for tid in saved['fetched']}
+    with open(rr.rosters_path('2025-09-02'), 'w', encoding='utf-8') as f:
+        json.dump(saved, f)
+    rosters[147] = [rr.RosterEntry(pid=1, name='A', team_id=147)]
+    rosters[111] = []
+    monkeypatch.setattr(rr, '_REGISTRIES', {})
+    reg = rr.get_rosters('2025-09-02', [111, 147])
+    assert sorted(calls) == [111, 111, 147, 147]
+    assert reg.team_of(1) == 147
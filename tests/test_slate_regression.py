@@ -0,0 +1,35 @@
+"""Scoring every checked-in slate must reproduce the pre-series output.
+
+tests/golden/hr-scores-DATE.json.gz is what the baseline scorer (commit
+f22e014) produced for each date, minus generated_at. The only field the
+current scorer adds is each player's mlbam_id. To rebuild a golden, run the
+baseline's generate_hr_scores_core.generate(date, save=False) from a
+worktree of f22e014 and gzip the JSON.
+"""
+import glob
+import gzip
+import json
+import os
+
+import pytest
+
+import generate_hr_scores_core as core
+
+GOLDEN_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'golden')
+DATES = sorted(os.path.basename(p)[len('hr-scores-'):-len('.json.gz')]
+               for p in glob.glob(os.path.join(GOLDEN_DIR, 'hr-scores-????-??-??.json.gz')))
+
+
+def _golden(date):
+    with gzip.open(os.path.join(GOLDEN_DIR, f'hr-scores-{date}.json.gz'), 'rt', encoding='utf-8') as f:
+        return json.load(f)
+
+
+@pytest.mark.parametrize('date', DATES)
+def test_generate_matches_baseline_scores(date):
+    got = core.generate(date, save=False)
+    got.pop('generated_at', None)
+    for p in got['players']:
+        assert 'mlbam_id' in p
+        p.pop('mlbam_id')
+    assert json.loads(json.dumps(got)) == _golden(date)
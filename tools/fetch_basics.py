@@ -6,31 +6,32 @@ Self-contained fetchers to populate hr_app/data with the minimal inputs needed:
 - fetch_daily_player_stats -> player-stats-YYYY-MM-DD.json
 - fetch_todays_pitchers -> pitcher-stats-YYYY-MM-DD.json
 - fetch_recent_performance -> recent-performance-YYYY-MM-DD.json
+- player-identity.json (MLBAM id -> name/aliases), merged incrementally
 """
 from __future__ import annotations
-import os, json
+import io, os, sys, json
 from datetime import datetime, timedelta
 from typing import Dict, Any, List, Iterable
-import requests
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import as_completed
+from itertools import chain
 import pandas as pd
 
 APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 DATA_DIR = os.path.join(APP_DIR, 'data')
 os.makedirs(DATA_DIR, exist_ok=True)
+if APP_DIR not in sys.path:
+    sys.path.insert(0, APP_DIR)
+from identity import update_identity
+import fetch_engine
+import http_client
+from roster_registry import get_rosters
 
 
 def http_json(url: str, tries: int = 3, timeout: int = 20) -> dict:
-    last = None
-    for _ in range(tries):
-        try:
-            r = requests.get(url, timeout=timeout)
-            if r.status_code == 200:
-                return r.json()
-            last = RuntimeError(f"HTTP {r.status_code}")
-        except Exception as e:
-            last = e
-    raise last or RuntimeError('request failed')
+    r = http_client.get(url, timeout=timeout, retries=tries - 1)
+    if r.status_code != 200:
+        raise RuntimeError(f"HTTP {r.status_code}")
+    return r.json()
 
 
 def save(obj: Any, path: str):
@@ -42,7 +43,47 @@ def save(obj: Any, path: str):
 def fetch_schedule(date: str) -> dict:
     # Use hydrate to include probable starters directly in schedule
     url = f"https://statsapi.mlb.com/api/v1/schedule?sportId=1&date={date}&hydrate=probablePitcher(note)"
-    return http_json(url)
+    with fetch_engine.lane('schedule'):
+        return http_json(url)
+
+
+# League-wide /stats pages; a season has ~1,500 hitters and ~1,000 pitchers
+STATS_PAGE_SIZE = 1000
+_BULK_STATS: Dict[tuple, Dict[int, List[dict]]] = {}
+
+
+def fetch_season_stats_bulk(group: str, season: int) -> Dict[int, List[dict]]:
+    """pid -> season splits ('hitting' or 'pitching') for every MLB player, from paged /stats?playerPool=ALL.
+    Empty when any page fails, so callers fall back to per-player requests. Memoized per run."""
+    key = (group, season)
+    if key in _BULK_STATS:
+        return _BULK_STATS[key]
+    out: Dict[int, List[dict]] = {}
+    offset = 0
+    try:
+        while True:
+            data = http_json(
+                f"https://statsapi.mlb.com/api/v1/stats?stats=season&group={group}&season={season}&gameType=R"
+                f"&sportId=1&playerPool=ALL&limit={STATS_PAGE_SIZE}&offset={offset}"
+            )
+            splits = [sp for blk in (data.get('stats') or []) for sp in (blk.get('splits') or [])]
+            for sp in splits:
+                pid = (sp.get('player') or {}).get('id')
+                if pid:
+                    out.setdefault(int(pid), []).append(sp)
+            if len(splits) < STATS_PAGE_SIZE:
+                break
+            offset += STATS_PAGE_SIZE
+    except Exception as e:
+        print(f"Bulk {group} stats failed ({e}); using per-player requests")
+        out = {}
+    _BULK_STATS[key] = out
+    return out
+
+
+def _season_stats_doc(group: str, splits: List[dict]) -> dict:
+    """Bulk splits in the people/{id}/stats response shape the per-player parsers read."""
+    return {'stats': [{'group': {'displayName': group}, 'type': {'displayName': 'season'}, 'splits': splits}]}
 
 
 def fetch_players_simple(date: str) -> dict:
@@ -81,18 +122,20 @@ def fetch_players_simple(date: str) -> dict:
     player_tasks = []
     # For deduping duplicate roster appearances, keep best per player id
     best_by_pid: Dict[int, Dict[str, Any]] = {}
-    with ThreadPoolExecutor(max_workers=16) as executor:
+    rosters = get_rosters(date, teams)
+    # Season lines for the whole league in a few requests, joined to the rosters by player id
+    bulk = fetch_season_stats_bulk('hitting', season_year)
+    bulk_rows = []
+    with fetch_engine.executor('stats') as executor:
         for tid in teams:
-            ro = http_json(f"https://statsapi.mlb.com/api/v1/teams/{tid}/roster?rosterType=active")
-            for e in ro.get('roster', []):
-                pid = e.get('person', {}).get('id')
-                name = e.get('person', {}).get('fullName')
-                pos = e.get('position', {}).get('name') or 'Unknown'
-                if not pid:
+            for e in rosters.roster(tid):
+                pid, name, pos = e.pid, e.name, e.position
+                team_abbr = team_abbr_by_id.get(tid) or e.parent_abbr or ''
+                if pid in bulk or (bulk and e.is_pitcher):
+                    # Absent from a complete bulk response: a pitcher without a hitting line
+                    bulk_rows.append((pid, _season_stats_doc('hitting', bulk.get(pid) or []), name, team_abbr, pos))
                     continue
-                team_abbr = team_abbr_by_id.get(tid) or e.get('parentTeamAbbreviation') or ''
-                # Submit fetching stats in parallel
-                # Use dedicated stats endpoint for reliability
+                # Fallback: dedicated stats endpoint per player, in parallel
                 player_tasks.append(executor.submit(
                     lambda pid=pid, name=name, team_abbr=team_abbr, pos=pos, season_year=season_year: (
                         pid,
@@ -104,8 +147,7 @@ def fetch_players_simple(date: str) -> dict:
                         pos,
                     )
                 ))
-        for future in as_completed(player_tasks):
-            pid, stats, name, team_abbr, pos = future.result()
+        for pid, stats, name, team_abbr, pos in chain(bulk_rows, (f.result() for f in as_completed(player_tasks))):
             avg = slg = 0.0
             hr = 0
             try:
@@ -167,6 +209,17 @@ def fetch_pitchers_simple(date: str) -> dict:
     pitchers: List[dict] = []
     want: Dict[int, str] = {}
     team_ids_today: List[int] = []
+    season_year = datetime.strptime(date, '%Y-%m-%d').year
+    # Season pitching lines for the whole league; pitchers missing from it are fetched one by one
+    bulk = fetch_season_stats_bulk('pitching', season_year)
+
+    def _pitching_stats(pid: int) -> dict:
+        if pid in bulk:
+            return _season_stats_doc('pitching', bulk[pid])
+        return http_json(
+            f"https://statsapi.mlb.com/api/v1/people/{pid}/stats?stats=season&group=pitching&season={season_year}&gameType=R"
+        )
+
     # First try probablePitcher
     for d in sched.get('dates', []):
         for g in d.get('games', []):
@@ -238,23 +291,13 @@ def fetch_pitchers_simple(date: str) -> dict:
     # Fallback: if no probables could be determined (or very few),
     # pick a likely starter per team based on max gamesStarted among active pitchers
     def _pick_likely_starter_for_team(tid: int):
-        try:
-            ro = http_json(f"https://statsapi.mlb.com/api/v1/teams/{tid}/roster?rosterType=active")
-        except Exception:
-            return None
         best = None  # (gamesStarted, pid, name)
-        for e in ro.get('roster', []) or []:
-            pos = (e.get('position') or {}).get('code') or ''
-            if pos != 'P':
-                continue
-            pid = (e.get('person') or {}).get('id')
-            name = (e.get('person') or {}).get('fullName')
-            if not pid or not name:
+        for e in rosters.pitchers(tid):
+            pid, name = e.pid, e.name
+            if not name:
                 continue
             try:
-                stats = http_json(
-                    f"https://statsapi.mlb.com/api/v1/people/{int(pid)}/stats?stats=season&group=pitching&season={datetime.strptime(date, '%Y-%m-%d').year}&gameType=R"
-                )
+                stats = _pitching_stats(pid)
                 entries = []
                 for blk in (stats.get('stats') or []):
                     grp = blk.get('group')
@@ -286,47 +329,27 @@ def fetch_pitchers_simple(date: str) -> dict:
         unique_team_ids = sorted(set(team_ids_today))
     except Exception:
         unique_team_ids = []
-    team_has_probable = set()
-    if want:
-        # Map probables to teams by roster lookup once to avoid duplicates
-        try:
-            for tid in unique_team_ids:
-                ro = http_json(f"https://statsapi.mlb.com/api/v1/teams/{tid}/roster?rosterType=active")
-                pids = {int((e.get('person') or {}).get('id')) for e in (ro.get('roster') or []) if (e.get('person') or {}).get('id')}
-                if any(pid in want for pid in pids):
-                    team_has_probable.add(tid)
-        except Exception:
-            pass
+    # Active rosters of today's teams, shared with fetch_players_simple (one fetch per run)
+    rosters = get_rosters(date, unique_team_ids)
+    # Map probables to teams through the registry's pid -> team index
+    team_has_probable = {rosters.team_of(pid) for pid in want} & set(unique_team_ids)
     need_fallback = len(team_has_probable) < max(1, len(unique_team_ids) // 2)
     if need_fallback:
-        for tid in unique_team_ids:
-            # Skip teams that already have a probable in 'want'
-            try:
-                ro = http_json(f"https://statsapi.mlb.com/api/v1/teams/{tid}/roster?rosterType=active")
-                roster_pids = {int((e.get('person') or {}).get('id')) for e in (ro.get('roster') or []) if (e.get('person') or {}).get('id')}
-            except Exception:
-                roster_pids = set()
-            if any(pid in want for pid in roster_pids):
-                continue
-            picked = _pick_likely_starter_for_team(tid)
-            if picked:
-                _, pid, name, _ = picked
-                want.setdefault(pid, name)
-
-    # Fetch season pitching stats for all wanted pitchers
-    season_year = datetime.strptime(date, '%Y-%m-%d').year
+        # Skip teams that already have a probable in 'want'; teams are picked concurrently, merged in order
+        todo = [tid for tid in unique_team_ids if tid not in team_has_probable]
+        with fetch_engine.executor('stats') as executor:
+            for picked in executor.map(_pick_likely_starter_for_team, todo):
+                if picked:
+                    _, pid, name, _ = picked
+                    want.setdefault(pid, name)
+
+    # Fetch season pitching stats for all wanted pitchers (bulk lines; per-player for the rest)
     pitcher_tasks = []
     best_by_pid: Dict[int, Dict[str, Any]] = {}
-    with ThreadPoolExecutor(max_workers=12) as executor:
+    with fetch_engine.executor('stats') as executor:
         for pid, name in want.items():
             pitcher_tasks.append(executor.submit(
-                lambda pid=pid, name=name, season_year=season_year: (
-                    pid,
-                    http_json(
-                        f"https://statsapi.mlb.com/api/v1/people/{pid}/stats?stats=season&group=pitching&season={season_year}&gameType=R"
-                    ),
-                    name,
-                )
+                lambda pid=pid, name=name: (pid, _pitching_stats(pid), name)
             ))
         for future in as_completed(pitcher_tasks):
             pid, stats, name = future.result()
@@ -477,7 +500,7 @@ def fetch_ballpark_weather(date: str) -> dict:
     Extend with real weather API as needed.
     """
     import os
-    from concurrent.futures import ThreadPoolExecutor, as_completed
+    from concurrent.futures import as_completed
     from datetime import datetime as _dt
     sched = fetch_schedule(date)
     ballpark_factors = {}
@@ -550,7 +573,7 @@ def fetch_ballpark_weather(date: str) -> dict:
 
     try:
         url_pf = f"https://www.fangraphs.com/guts.aspx?type=pf&teamid=0&season={year}"
-        tables = pd.read_html(url_pf)
+        tables = pd.read_html(io.StringIO(http_client.get(url_pf, timeout=30).text))
         for df in tables:
             cols = [str(c) for c in df.columns]
             if not any('team' in str(c).lower() for c in cols):
@@ -598,7 +621,7 @@ def fetch_ballpark_weather(date: str) -> dict:
     if len(hr_pf_by_abbr) < 24:  # try Baseball-Reference as a fallback
         try:
             br_url = f"https://www.baseball-reference.com/leagues/majors/{year}-park-factors.shtml"
-            tables = pd.read_html(br_url)
+            tables = pd.read_html(io.StringIO(http_client.get(br_url, timeout=30).text))
             for df in tables:
                 cols = [str(c).lower() for c in df.columns]
                 if not any('team' in c for c in cols) or not any(c.strip() == 'hr' for c in [str(x).lower().strip() for x in df.columns]):
@@ -771,7 +794,7 @@ def fetch_ballpark_weather(date: str) -> dict:
         'WSH': 'Nationals Park',
     }
 
-    with ThreadPoolExecutor(max_workers=8) as ex:
+    with fetch_engine.executor('stats') as ex:
         def weather_task(k, meta):
             from datetime import datetime, timezone
             ab = meta.get('abbr')
@@ -872,7 +895,10 @@ def main():
     import argparse
     parser = argparse.ArgumentParser()
     parser.add_argument('--date', default=datetime.now().strftime('%Y-%m-%d'))
+    parser.add_argument('--offline', action='store_true', help='serve HTTP only from data/.http-cache')
     args = parser.parse_args()
+    if args.offline:
+        http_client.set_offline()
     date = args.date
 
     sched = fetch_schedule(date)
@@ -880,10 +906,20 @@ def main():
     save(sched, os.path.join(DATA_DIR, 'todays-schedule.json'))
     save(sched, os.path.join(DATA_DIR, f'todays-schedule-{date}.json'))
     save(sched, os.path.join(DATA_DIR, f'fresh-schedule-{date}.json'))
-    save(fetch_players_simple(date), os.path.join(DATA_DIR, f'player-stats-{date}.json'))
-    save(fetch_pitchers_simple(date), os.path.join(DATA_DIR, f'pitcher-stats-{date}.json'))
-    save(fetch_recent_simple(date), os.path.join(DATA_DIR, f'recent-performance-{date}.json'))
+    players = fetch_players_simple(date)
+    pitchers = fetch_pitchers_simple(date)
+    recent = fetch_recent_simple(date)
+    save(players, os.path.join(DATA_DIR, f'player-stats-{date}.json'))
+    save(pitchers, os.path.join(DATA_DIR, f'pitcher-stats-{date}.json'))
+    save(recent, os.path.join(DATA_DIR, f'recent-performance-{date}.json'))
+    try:
+        n = update_identity(batters=(players.get('players') or []) + (recent.get('players') or []),
+                            pitchers=pitchers.get('pitchers') or [])
+        print(f"Identity map: {n} new/updated people")
+    except Exception as e:
+        print(f"Identity map update failed: {e}")
     save(fetch_ballpark_weather(date), os.path.join(DATA_DIR, f'ballpark-weather-{date}.json'))
 
 if __name__ == '__main__':
     main()
+    print(f"HTTP: {http_client.summary()}")
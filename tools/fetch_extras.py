@@ -13,11 +13,10 @@ Files created:
 - lineups-YYYY-MM-DD.json
 """
 from __future__ import annotations
-import os, json, math
+import os, sys, json, math
 from datetime import datetime, timedelta
 from typing import Any, Dict, List, Tuple
-from concurrent.futures import ThreadPoolExecutor, as_completed
-import requests
+from concurrent.futures import as_completed
 import pandas as pd
 from pybaseball import statcast_batter_exitvelo_barrels
 from pybaseball import statcast_pitcher_exitvelo_barrels
@@ -25,6 +24,10 @@ from pybaseball import pitching_stats
 
 APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 DATA_DIR = os.path.join(APP_DIR, 'data')
+if APP_DIR not in sys.path:
+    sys.path.insert(0, APP_DIR)
+import fetch_engine
+import http_client
 os.makedirs(DATA_DIR, exist_ok=True)
 
 
@@ -43,7 +46,7 @@ def save_json(obj: Any, path: str):
 
 def http_json(url: str, timeout: int = 25) -> dict:
     try:
-        r = requests.get(url, timeout=timeout)
+        r = http_client.get(url, timeout=timeout)
         if r.status_code == 200:
             return r.json()
     except Exception:
@@ -374,7 +377,7 @@ def fetch_pitch_type_metrics(date: str):
         ps = load_json(os.path.join(DATA_DIR, f'pitcher-stats-{date}.json')).get('pitchers', [])
         pitchers_today = [{'id': int(p['mlbam_id']), 'name': p['name']} for p in ps if p.get('mlbam_id') and p.get('name')]
 
-    with ThreadPoolExecutor(max_workers=8) as ex:
+    with fetch_engine.executor('extras') as ex:
         futures = [ex.submit(calc_usage, p['id'], p['name']) for p in pitchers_today]
         for f in as_completed(futures):
             name, top = f.result()
@@ -554,7 +557,7 @@ def fetch_implied_totals(date: str):
             base = "https://api.the-odds-api.com/v4/sports/baseball_mlb/odds/"
             params = f"?regions=us,us2,eu,uk,au&markets=team_totals,totals,h2h&oddsFormat=american&dateFormat=iso&apiKey={api_key}"
             url1 = base + params
-            r = requests.get(url1, timeout=30)
+            r = http_client.get(url1, timeout=30)
             games = None
             if r.status_code == 200:
                 games = r.json()
@@ -566,7 +569,7 @@ def fetch_implied_totals(date: str):
                 # If list is empty, try again without team_totals market (some plans/bookmakers omit it)
                 if isinstance(games, list) and len(games) == 0:
                     url2 = base + f"?regions=us,eu,uk,au&markets=totals,h2h&oddsFormat=american&dateFormat=iso&apiKey={api_key}"
-                    r2 = requests.get(url2, timeout=30)
+                    r2 = http_client.get(url2, timeout=30)
                     if r2.status_code == 200:
                         games = r2.json()
                         try:
@@ -586,7 +589,7 @@ def fetch_implied_totals(date: str):
                 except Exception:
                     pass
                 url2 = base + f"?regions=us,eu,uk,au&markets=totals,h2h&oddsFormat=american&dateFormat=iso&apiKey={api_key}"
-                r2 = requests.get(url2, timeout=30)
+                r2 = http_client.get(url2, timeout=30)
                 if r2.status_code == 200:
                     games = r2.json()
                     try:
@@ -700,7 +703,7 @@ def fetch_implied_totals(date: str):
     try:
         yyyymmdd = date.replace('-', '')
         espn_url = f"https://site.api.espn.com/apis/v2/sports/baseball/mlb/scoreboard?dates={yyyymmdd}"
-        er = requests.get(espn_url, timeout=20)
+        er = http_client.get(espn_url, timeout=20)
         if er.status_code == 200:
             ed = er.json()
             events = ed.get('events', [])
@@ -791,7 +794,7 @@ def fetch_lineups(date: str):
     def fetch_game_lineup(game_pk: int):
         try:
             url = f"https://statsapi.mlb.com/api/v1/game/{game_pk}/boxscore"
-            r = requests.get(url, timeout=20)
+            r = http_client.get(url, timeout=20)
             if r.status_code != 200:
                 return None
             return r.json()
@@ -808,7 +811,7 @@ def fetch_lineups(date: str):
         if abbr and abbr not in lineups:
             lineups[abbr] = []
     # Parallel fetch
-    with ThreadPoolExecutor(max_workers=8) as ex:
+    with fetch_engine.executor('extras') as ex:
         futures = [ex.submit(fetch_game_lineup, pk) for pk in gpks]
         for f in as_completed(futures):
             data = f.result()
@@ -841,7 +844,7 @@ def fetch_lineups(date: str):
                 # If no entries found, try pulling projected starters from live feed probable lineups
                 if not lineups.get(team):
                     try:
-                        live = requests.get(f"https://statsapi.mlb.com/api/v1.1/game/{int(td.get('team',{}).get('gamePk',0))}/feed/live", timeout=20)
+                        live = http_client.get(f"https://statsapi.mlb.com/api/v1.1/game/{int(td.get('team',{}).get('gamePk',0))}/feed/live", timeout=20)
                         if live.status_code == 200:
                             ld = live.json()
                             roster = (((ld.get('gameData') or {}).get('players')) or {})
@@ -881,7 +884,10 @@ def main():
     import argparse
     parser = argparse.ArgumentParser()
     parser.add_argument('--date', default=datetime.now().strftime('%Y-%m-%d'))
+    parser.add_argument('--offline', action='store_true', help='serve HTTP only from data/.http-cache')
     args = parser.parse_args()
+    if args.offline:
+        http_client.set_offline()
     date = args.date
 
     fetch_statcast_metrics(date)
@@ -894,3 +900,4 @@ def main():
 
 if __name__ == '__main__':
     main()
+    print(f"HTTP: {http_client.summary()}")
@@ -15,18 +15,24 @@ We use MLB StatsAPI to get batter vs pitcher splits by querying for each batter
 against his opposing probable pitcher.
 """
 from __future__ import annotations
-import os, json
+import os, sys, json
 from datetime import datetime
-from concurrent.futures import ThreadPoolExecutor, as_completed
-import requests
+from concurrent.futures import as_completed
 
 APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 DATA_DIR = os.path.join(APP_DIR, 'data')
+if APP_DIR not in sys.path:
+    sys.path.insert(0, APP_DIR)
+import fetch_engine
+import http_client
 os.makedirs(DATA_DIR, exist_ok=True)
 
+# Lowest-priority lane; lookups still queued after this long are given up (treated as no data)
+H2H_DEADLINE_SEC = 600
+
 
 def http_json(url: str, timeout: int = 20) -> dict:
-    r = requests.get(url, timeout=timeout)
+    r = http_client.get(url, timeout=timeout)
     r.raise_for_status()
     return r.json()
 
@@ -52,7 +58,7 @@ def players_list_for_teams(date: str, teams: set[str]) -> list[dict]:
 def team_id_to_abbr(team_id: int) -> str | None:
     try:
         url = f"https://statsapi.mlb.com/api/v1/teams/{team_id}"
-        r = requests.get(url, timeout=15)
+        r = http_client.get(url, timeout=15)
         if r.status_code != 200:
             return None
         data = r.json()
@@ -84,7 +90,10 @@ def main():
     import argparse
     parser = argparse.ArgumentParser()
     parser.add_argument('--date', default=datetime.now().strftime('%Y-%m-%d'))
+    parser.add_argument('--offline', action='store_true', help='serve HTTP only from data/.http-cache')
     args = parser.parse_args()
+    if args.offline:
+        http_client.set_offline()
     date = args.date
 
     sched = load_schedule(date)
@@ -112,21 +121,23 @@ def main():
 
     # For each batter, query vs his opposing pitcher
     tasks = []
-    with ThreadPoolExecutor(max_workers=16) as ex:
+    with fetch_engine.executor('h2h', deadline=H2H_DEADLINE_SEC) as ex:
         futures = {}
         for b in batters:
             team = b.get('team')
             opp = opp_pitcher_by_team.get(team)
             if not opp:
                 continue
-            futures[ex.submit(fetch_bvps_for_pair, int(b['mlbam_id']), int(opp['id']))] = (b.get('name'), opp['name'])
+            futures[ex.submit(fetch_bvps_for_pair, int(b['mlbam_id']), int(opp['id']))] = (b.get('name'), opp['name'], int(b['mlbam_id']), int(opp['id']))
 
         h2h: dict[str, dict[str, dict]] = {}
+        h2h_ids: dict[str, dict[str, dict]] = {}
         for f in as_completed(futures):
-            batter, pitcher = futures[f]
+            batter, pitcher, bid, pid = futures[f]
             stats = f.result() or {}
             if stats:
                 h2h.setdefault(batter, {})[pitcher] = stats
+                h2h_ids.setdefault(str(bid), {})[str(pid)] = stats
 
     # Write JS (for app) and date-stamped JSON (for history)
     out_js = os.path.join(DATA_DIR, 'hitter-vs-pitcher.js')
@@ -136,10 +147,11 @@ def main():
         f.write(';' + "\n")
     out_json = os.path.join(DATA_DIR, f'hitter-vs-pitcher-{date}.json')
     with open(out_json, 'w', encoding='utf-8') as f:
-        json.dump({'date': date, 'h2h': h2h}, f, indent=2)
+        json.dump({'date': date, 'h2h': h2h, 'h2h_ids': h2h_ids}, f, indent=2)
     print(f"Saved {out_js}")
     print(f"Saved {out_json}")
 
 
 if __name__ == '__main__':
     main()
+    print(f"HTTP: {http_client.summary()}")
@@ -10,20 +10,27 @@ Dedicated H2H (batter vs pitcher) fetcher.
 Also logs simple counts for debugging.
 """
 from __future__ import annotations
-import os, json
+import os, sys, json
 from datetime import datetime
 from typing import Dict, Any, List, Tuple
-from concurrent.futures import ThreadPoolExecutor, as_completed
-import requests
+from concurrent.futures import as_completed
 
 APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 DATA_DIR = os.path.join(APP_DIR, 'data')
+if APP_DIR not in sys.path:
+    sys.path.insert(0, APP_DIR)
+import fetch_engine
+import http_client
+from roster_registry import get_rosters
 os.makedirs(DATA_DIR, exist_ok=True)
 
+# Lowest-priority lane; lookups still queued after this long are given up (treated as no data)
+H2H_DEADLINE_SEC = 600
+
 
 def http_json(url: str, timeout: int = 25) -> dict:
     try:
-        r = requests.get(url, timeout=timeout)
+        r = http_client.get(url, timeout=timeout)
         if r.status_code == 200:
             return r.json()
     except Exception:
@@ -128,16 +135,10 @@ def lineup_batters_for_team(date: str, team_abbr: str) -> List[Dict[str, Any]]:
                     if t.get('id'):
                         team_ids.append(int(t['id']))
     team_ids = list(dict.fromkeys(team_ids))
+    # Saved by fetch_basics earlier in the run (data/rosters-DATE.json); fetched only if missing
+    rosters = get_rosters(date, team_ids)
     for tid in team_ids:
-        ro = http_json(f"https://statsapi.mlb.com/api/v1/teams/{tid}/roster?rosterType=active")
-        out = []
-        for e in ro.get('roster', []) or []:
-            if (e.get('position') or {}).get('code') == 'P':
-                continue
-            pid = (e.get('person') or {}).get('id')
-            name = (e.get('person') or {}).get('fullName')
-            if pid and name:
-                out.append({'mlbam_id': int(pid), 'name': name})
+        out = [{'mlbam_id': e.pid, 'name': e.name} for e in rosters.position_players(tid) if e.name]
         if out:
             return out[:12]
     return []
@@ -193,7 +194,10 @@ def main():
     import argparse
     parser = argparse.ArgumentParser(description='Fetch batter-vs-pitcher H2H for a date')
     parser.add_argument('--date', default=datetime.now().strftime('%Y-%m-%d'))
+    parser.add_argument('--offline', action='store_true', help='serve HTTP only from data/.http-cache')
     args = parser.parse_args()
+    if args.offline:
+        http_client.set_offline()
     date = args.date
     year = datetime.strptime(date, '%Y-%m-%d').year
 
@@ -208,7 +212,7 @@ def main():
     print(f"Collected {total_batters} batter entries across teams")
 
     h2h: Dict[str, Dict[str, Any]] = {}
-    with ThreadPoolExecutor(max_workers=16) as ex:
+    with fetch_engine.executor('h2h', deadline=H2H_DEADLINE_SEC) as ex:
         futures = {}
         for team, batters in batters_by_team.items():
             pitcher = opp.get(team)
@@ -218,12 +222,14 @@ def main():
             for b in batters:
                 bid = int(b['mlbam_id'])
                 bname = b.get('name')
-                futures[ex.submit(fetch_bvp, bid, pid, year)] = (bname, pitcher['name'])
+                futures[ex.submit(fetch_bvp, bid, pid, year)] = (bname, pitcher['name'], bid, pid)
+    h2h_ids: Dict[str, Dict[str, Any]] = {}
     for f in as_completed(futures):
-            bname, pname = futures[f]
+            bname, pname, bid, pid = futures[f]
             stats = f.result() or {}
             if stats:
                 h2h.setdefault(bname, {})[pname] = stats
+                h2h_ids.setdefault(str(bid), {})[str(pid)] = stats
 
     # Save files
     js_path = os.path.join(DATA_DIR, 'hitter-vs-pitcher.js')
@@ -233,7 +239,7 @@ def main():
         f.write(';' + "\n")
     json_path = os.path.join(DATA_DIR, f'hitter-vs-pitcher-{date}.json')
     with open(json_path, 'w', encoding='utf-8') as f:
-        json.dump({'date': date, 'h2h': h2h}, f, indent=2)
+        json.dump({'date': date, 'h2h': h2h, 'h2h_ids': h2h_ids}, f, indent=2)
     print(f"Saved {js_path}")
     print(f"Saved {json_path}")
     print(f"H2H pairs written: {sum(len(v) for v in h2h.values())}")
@@ -241,3 +247,4 @@ def main():
 
 if __name__ == '__main__':
     main()
+    print(f"HTTP: {http_client.summary()}")
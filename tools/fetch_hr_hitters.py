@@ -1,11 +1,15 @@
 #!/usr/bin/env python3
 from __future__ import annotations
-import os, json
+import os, sys, json, threading
 from datetime import datetime, timedelta
-from typing import Any, Dict
+from typing import Any, Dict, List, Optional
 
 APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 DATA_DIR = os.path.join(APP_DIR, 'data')
+if APP_DIR not in sys.path:
+    sys.path.insert(0, APP_DIR)
+import fetch_engine
+import http_client
 os.makedirs(DATA_DIR, exist_ok=True)
 
 
@@ -52,12 +56,314 @@ def fetch_hr_hitters_for_date(date: str) -> Dict[str, Any]:
     return {'date': date, 'hitters': hitters}
 
 
+STATSAPI = 'https://statsapi.mlb.com/api'
+# Trim StatsAPI responses to what the HR tally reads
+SCHEDULE_FIELDS = 'dates,games,gamePk,status,abstractGameState'
+FEED_FIELDS = ('metaData,timeStamp,gameData,status,abstractGameState,liveData,plays,allPlays,result,eventType,'
+               'event,matchup,batter,id,fullName,lastFirstName,about,isComplete')
+_ALL_PLAYS = ('liveData', 'plays', 'allPlays')
+# Concurrent game-feed fetches; stays within http_client.POOL_MAXSIZE
+SCAN_WORKERS = 8
+# Feeds not fetched within this are left for the next refresh (their cursors do not move)
+SCAN_DEADLINE_SEC = 60
+# live_cache kind holding a date's scanner state (per-game cursors and tallies)
+SCAN_STATE_KIND = 'live-hr-scan'
+
+
+def _is_hr(play: Dict[str, Any]) -> bool:
+    res = play.get('result') or {}
+    return (res.get('eventType') or '').lower() == 'home_run' or 'home run' in (res.get('event') or '').lower()
+
+
+def _trim_play(play: Any) -> Dict[str, Any]:
+    """The parts of a play the tally reads (what FEED_FIELDS keeps)."""
+    if not isinstance(play, dict):
+        return {}
+    res = play.get('result') or {}
+    batter = (play.get('matchup') or {}).get('batter') or {}
+    out = {'result': {k: res[k] for k in ('eventType', 'event') if k in res},
+           'matchup': {'batter': {k: batter[k] for k in ('id', 'fullName', 'lastFirstName') if k in batter}}}
+    if 'isComplete' in (play.get('about') or {}):
+        out['about'] = {'isComplete': play['about']['isComplete']}
+    return out
+
+
+def _apply_play_ops(ops: List[Dict[str, Any]], cursor: int, pending: List[Dict[str, Any]]) -> Optional[str]:
+    """Apply a diffPatch's JSON-Patch ops under /liveData/plays/allPlays to the
+    plays from cursor on (pending, edited in place). Ops on plays before cursor
+    are ignored: those were complete and counted. Returns the new
+    /metaData/timeStamp, if the ops carry one; raises ValueError when an op
+    cannot be placed, so the caller rereads the full feed."""
+    timecode = None
+    for op in ops:
+        path = [seg.replace('~1', '/').replace('~0', '~') for seg in (op.get('path') or '').split('/')[1:]]
+        kind = op.get('op')
+        if path == ['metaData', 'timeStamp'] and kind in ('add', 'replace'):
+            timecode = op.get('value')
+            continue
+        if tuple(path[:3]) != _ALL_PLAYS:
+            continue
+        rest = path[3:]
+        if not rest:
+            if kind == 'remove':
+                raise ValueError('allPlays removed')
+            plays = op.get('value') or []
+            pending[:] = [_trim_play(p) for p in plays[cursor:]]
+            continue
+        idx = len(pending) if rest[0] == '-' else int(rest[0]) - cursor
+        if rest[0] != '-' and int(rest[0]) < cursor:
+            continue
+        if len(rest) == 1:
+            if kind == 'remove':
+                if idx >= len(pending):
+                    raise ValueError('remove past the known plays')
+                del pending[idx]
+            elif kind == 'add' and idx <= len(pending):
+                pending.insert(idx, _trim_play(op.get('value')))
+            elif kind == 'replace' and idx < len(pending):
+                pending[idx] = _trim_play(op.get('value'))
+            else:
+                raise ValueError('play index past the known plays')
+            continue
+        if idx >= len(pending):
+            raise ValueError('edit to an unknown play')
+        # A field inside an in-progress play; only the trimmed fields are kept
+        node = pending[idx]
+        for seg in rest[1:-1]:
+            node = node.setdefault(seg, {}) if isinstance(node, dict) else None
+            if node is None:
+                break
+        if not isinstance(node, dict):
+            continue
+        if kind == 'remove':
+            node.pop(rest[-1], None)
+        elif kind in ('add', 'replace'):
+            node[rest[-1]] = op.get('value')
+        pending[idx] = _trim_play(pending[idx])
+    return timecode
+
+
+class LiveHRScanner:
+    """Incremental StatsAPI HR tally for one date.
+
+    Each game keeps a cursor (number of completed plays already counted), its
+    own hitter tally, the feed timecode it was last read at and the plays
+    from the cursor on that were still in progress. The first read of a game
+    is the full feed trimmed by `fields=`; later refreshes ask diffPatch for
+    the JSON-Patch ops since that timecode and apply only the ones under
+    allPlays, so a refresh downloads the changes since the last one rather
+    than every play of the game. When StatsAPI answers with a full feed
+    instead (an old or unknown timecode), or the ops do not fit the kept
+    plays, the game is read in full again. Games are fetched concurrently;
+    games not started are skipped, and a FINAL game is read once more after
+    it ends and then never again. Response bytes are counted in `bytes`.
+    """
+
+    def __init__(self, date: str, workers: int = SCAN_WORKERS, games: Optional[Dict[int, Dict[str, Any]]] = None):
+        self.date = date
+        self.workers = workers
+        # game_pk -> { cursor, final, timecode, pending: [plays from cursor on], hitters: { pid: { name, hr } } }
+        self.games: Dict[int, Dict[str, Any]] = games or {}
+        self._lock = threading.Lock()
+        self._lock_bytes = threading.Lock()
+        self.fetched = 0
+        self.skipped = 0
+        self.full_reads = 0
+        self.bytes = 0
+
+    @classmethod
+    def from_state(cls, date: str, state: Optional[Dict[str, Any]]) -> 'LiveHRScanner':
+        """Scanner resuming from state() output (copied, so the source can be shared)."""
+        games = {}
+        for pk, st in (state or {}).items():
+            try:
+                games[int(pk)] = {'cursor': int(st.get('cursor') or 0), 'final': bool(st.get('final')),
+                                  'timecode': st.get('timecode'),
+                                  'pending': json.loads(json.dumps(st.get('pending') or [])),
+                                  'hitters': {pid: dict(rec) for pid, rec in (st.get('hitters') or {}).items()}}
+            except Exception:
+                continue
+        return cls(date, games=games)
+
+    def state(self) -> Dict[str, Any]:
+        """JSON-safe per-game cursors and tallies."""
+        with self._lock:
+            return {str(pk): {'cursor': st['cursor'], 'final': st['final'], 'timecode': st.get('timecode'),
+                              'pending': json.loads(json.dumps(st.get('pending') or [])),
+                              'hitters': {pid: dict(rec) for pid, rec in st['hitters'].items()}}
+                    for pk, st in self.games.items()}
+
+    def _schedule(self) -> List[Dict[str, Any]]:
+        r = http_client.get(f"{STATSAPI}/v1/schedule",
+                            params={'sportId': 1, 'date': self.date, 'fields': SCHEDULE_FIELDS}, timeout=12, ttl=0)
+        dates = (r.json().get('dates') or []) if r.status_code == 200 else []
+        return dates[0].get('games', []) if dates else []
+
+    def _get(self, url: str, params: Dict[str, Any]):
+        r = http_client.get(url, params=params, timeout=12, ttl=0)
+        with self._lock_bytes:
+            self.bytes += len(r.content or b'')
+        return r.json() if r.status_code == 200 else None
+
+    def _read_full(self, game_pk: int, state: Dict[str, Any], feed: Optional[Dict[str, Any]] = None) -> bool:
+        if feed is None:
+            feed = self._get(f"{STATSAPI}/v1.1/game/{game_pk}/feed/live", {'fields': FEED_FIELDS})
+        if not isinstance(feed, dict):
+            return False
+        with self._lock_bytes:
+            self.full_reads += 1
+        plays = (((feed.get('liveData') or {}).get('plays') or {}).get('allPlays')) or []
+        state['pending'] = [_trim_play(p) for p in plays[state['cursor']:]]
+        state['timecode'] = (feed.get('metaData') or {}).get('timeStamp')
+        return True
+
+    def _read_diff(self, game_pk: int, state: Dict[str, Any]) -> bool:
+        diff = self._get(f"{STATSAPI}/v1.1/game/{game_pk}/feed/live/diffPatch",
+                         {'startTimecode': state['timecode']})
+        if isinstance(diff, dict):
+            # Too far behind for a diff: StatsAPI sent the whole (untrimmed) feed
+            return self._read_full(game_pk, state, diff)
+        if not isinstance(diff, list):
+            return False
+        pending = [dict(p) for p in state.get('pending') or []]
+        timecode = state['timecode']
+        try:
+            for patch in diff:
+                ops = patch.get('diff') if isinstance(patch, dict) else patch
+                timecode = _apply_play_ops(ops or [], state['cursor'], pending) or timecode
+        except (ValueError, TypeError, AttributeError):
+            return self._read_full(game_pk, state)
+        state['pending'] = pending
+        state['timecode'] = timecode
+        return True
+
+    def _scan_game(self, game_pk: int, state: Dict[str, Any], final: bool) -> None:
+        read = self._read_diff if state.get('timecode') else self._read_full
+        if not read(game_pk, state):
+            return
+        pending = state['pending']
+        done = 0
+        for p in pending:
+            if not (p.get('about') or {}).get('isComplete', True):
+                break
+            done += 1
+            if not _is_hr(p):
+                continue
+            batter = (p.get('matchup') or {}).get('batter') or {}
+            pid = batter.get('id')
+            if not pid:
+                continue
+            rec = state['hitters'].setdefault(str(pid), {'name': batter.get('fullName') or batter.get('lastFirstName'), 'hr': 0})
+            rec['hr'] = int(rec.get('hr') or 0) + 1
+        state['cursor'] += done
+        state['pending'] = pending[done:]
+        state['final'] = final
+
+    def scan(self) -> Dict[str, Any]:
+        """Fetch what changed since the last scan; returns { date, hitters } for the whole date."""
+        with self._lock:
+            try:
+                games = self._schedule()
+            except Exception:
+                # Keep the tally we have rather than reporting no homers
+                games = []
+            todo = []
+            for g in games:
+                pk = g.get('gamePk')
+                if not pk:
+                    continue
+                status = ((g.get('status') or {}).get('abstractGameState') or '').lower()
+                if status.startswith('preview') or (self.games.get(pk) or {}).get('final'):
+                    self.skipped += 1
+                    continue
+                state = self.games.setdefault(pk, {'cursor': 0, 'final': False, 'timecode': None, 'pending': [],
+                                                   'hitters': {}})
+                todo.append((pk, state, status.startswith('final')))
+            if todo:
+                with fetch_engine.executor('live', deadline=SCAN_DEADLINE_SEC,
+                                           max_workers=max(1, min(self.workers, len(todo)))) as ex:
+                    for f in [ex.submit(self._scan_game, *job) for job in todo]:
+                        try:
+                            f.result()
+                        except Exception:
+                            continue
+                self.fetched += len(todo)
+            return {'date': self.date, 'hitters': self.hitters()}
+
+    def hitters(self) -> Dict[str, Dict[str, Any]]:
+        out: Dict[str, Dict[str, Any]] = {}
+        for state in self.games.values():
+            for pid, rec in state['hitters'].items():
+                cur = out.get(pid)
+                if cur is None:
+                    out[pid] = dict(rec)
+                else:
+                    cur['hr'] += rec['hr']
+        return out
+
+
+_SCANNERS: Dict[str, LiveHRScanner] = {}
+_SCANNERS_MAX = 4
+_SCANNERS_LOCK = threading.Lock()
+
+
+def scanner_for(date: str) -> LiveHRScanner:
+    """Process-wide scanner for the date, so cursors survive between refreshes."""
+    with _SCANNERS_LOCK:
+        sc = _SCANNERS.get(date)
+        if sc is None:
+            if len(_SCANNERS) >= _SCANNERS_MAX:
+                _SCANNERS.pop(next(iter(_SCANNERS)))
+            sc = _SCANNERS[date] = LiveHRScanner(date)
+        return sc
+
+
+def fetch_hr_hitters_from_statsapi(date: str, store=None) -> Dict[str, Any]:
+    """StatsAPI HR tally for the date, scanned incrementally across calls.
+
+    With a live_cache.SnapshotStore the scanner state is loaded from and saved
+    to it (SCAN_STATE_KIND), so the app worker that next holds the refresh
+    lease resumes the scan; otherwise it is kept in this process.
+    """
+    try:
+        if store is None:
+            return scanner_for(date).scan()
+        saved = store.get(SCAN_STATE_KIND, date)
+        scanner = LiveHRScanner.from_state(date, saved['data'] if saved else None)
+        out = scanner.scan()
+    except Exception:
+        return {'date': date, 'hitters': {}}
+    try:
+        store.put(SCAN_STATE_KIND, date, scanner.state())
+    except Exception:
+        # The tally is rebuilt from the last saved cursors on the next scan
+        pass
+    return out
+
+
+def fetch_live_hr_hitters(date: str, store=None) -> Dict[str, Any]:
+    """Statcast first, StatsAPI game feeds when that is empty or fails."""
+    try:
+        out = fetch_hr_hitters_for_date(date) or {'date': date, 'hitters': {}}
+        if out.get('hitters'):
+            return out
+    except Exception:
+        pass
+    try:
+        return fetch_hr_hitters_from_statsapi(date, store)
+    except Exception:
+        return {'date': date, 'hitters': {}}
+
+
 def main():
     import argparse
     parser = argparse.ArgumentParser(description='Fetch list of HR hitters for a specific date')
     default_date = (datetime.now() - timedelta(days=1)).strftime('%Y-%m-%d')
     parser.add_argument('--date', default=default_date, help='YYYY-MM-DD (defaults to yesterday)')
+    parser.add_argument('--offline', action='store_true', help='serve HTTP only from data/.http-cache')
     args = parser.parse_args()
+    if args.offline:
+        http_client.set_offline()
     date = args.date
 
     out = fetch_hr_hitters_for_date(date)
@@ -66,3 +372,4 @@ def main():
 
 if __name__ == '__main__':
     main()
+    print(f"HTTP: {http_client.summary()}")
@@ -22,13 +22,15 @@ Notes:
 - The Odds API plan must include player props. Market keys for HR can vary by book.
 - We try a set of candidate market keys; override via env PLAYER_HR_MARKETS (comma-separated).
 """
-import os, json
+import os, sys, json
 from datetime import datetime
 from typing import Any, Dict, List
-import requests
 
 APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 DATA_DIR = os.path.join(APP_DIR, 'data')
+if APP_DIR not in sys.path:
+    sys.path.insert(0, APP_DIR)
+import http_client
 os.makedirs(DATA_DIR, exist_ok=True)
 
 
@@ -57,21 +59,21 @@ def norm_player_name(n: str) -> str:
     return s
 
 
-def build_browser_session() -> requests.Session:
-    s = requests.Session()
+def browser_options() -> Dict[str, Any]:
+    """http_client.get kwargs that look like a browser on the sportsbook site."""
     # Desktop Chrome UA; some sportsbooks block default Python UA
-    s.headers.update({
+    opts: Dict[str, Any] = {'headers': {
         'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/125.0.0.0 Safari/537.36',
         'Accept': 'application/json, text/plain, */*',
         'Accept-Language': 'en-US,en;q=0.9',
         'Origin': 'https://sportsbook.draftkings.com',
         'Referer': 'https://sportsbook.draftkings.com/leagues/baseball/mlb'
-    })
+    }}
     # Optional proxy support
     proxy = os.getenv('HTTP_PROXY') or os.getenv('http_proxy')
     if proxy:
-        s.proxies.update({'http': proxy, 'https': proxy})
-    return s
+        opts['proxies'] = {'http': proxy, 'https': proxy}
+    return opts
 
 
 def fetch_player_hr_odds(date: str):
@@ -114,7 +116,7 @@ def fetch_player_hr_odds(date: str):
     games = []
     if api_key:
         try:
-            r = requests.get(url, timeout=45)
+            r = http_client.get(url, timeout=45)
             if r.status_code != 200:
                 try:
                     dbg = {'date': date, 'status': r.status_code, 'text': r.text[:800], 'url': url}
@@ -124,14 +126,14 @@ def fetch_player_hr_odds(date: str):
                 # Try discover valid markets for this account and retry once
                 try:
                     mk_url = f"https://api.the-odds-api.com/v4/sports/baseball_mlb/odds-markets/?apiKey={api_key}"
-                    mr = requests.get(mk_url, timeout=30)
+                    mr = http_client.get(mk_url, timeout=30)
                     if mr.status_code == 200:
                         ml = mr.json() if isinstance(mr.json(), list) else []
                         cand = [m for m in ml if isinstance(m, str) and ('player' in m.lower()) and (('home' in m.lower()) or ('hr' in m.lower()) or ('homer' in m.lower()))]
                         cand = list(dict.fromkeys(cand))[:5]
                         if cand:
                             url2 = f"https://api.the-odds-api.com/v4/sports/baseball_mlb/odds/?regions=us,us2,eu,uk,au&markets={','.join(cand)}&oddsFormat=american&dateFormat=iso&apiKey={api_key}"
-                            r2 = requests.get(url2, timeout=45)
+                            r2 = http_client.get(url2, timeout=45)
                             if r2.status_code == 200:
                                 games = r2.json()
                                 try:
@@ -201,8 +203,7 @@ def fetch_player_hr_odds(date: str):
     if not players:
         try:
             dk_url = 'https://sportsbook.draftkings.com/sites/US-SB/api/v5/eventgroups/84240?format=json'
-            sess = build_browser_session()
-            dr = sess.get(dk_url, timeout=45)
+            dr = http_client.get(dk_url, timeout=45, **browser_options())
             if dr.status_code == 200:
                 dj = dr.json() or {}
                 # Build eventId -> startDate map to filter by target date
@@ -277,10 +278,9 @@ def fetch_player_hr_odds(date: str):
     # If still empty, try Bovada public JSON
     if not players:
         try:
-            sess = build_browser_session()
             # Bovada MLB events with descriptions; market names vary by locale
             bv_url = 'https://www.bovada.lv/services/sports/event/v2/events/A/description/baseball/mlb'
-            br = sess.get(bv_url, timeout=45)
+            br = http_client.get(bv_url, timeout=45, **browser_options())
             if br.status_code == 200:
                 bj = br.json() or []
                 # bj is typically a list with one or more sport trees
@@ -370,9 +370,13 @@ def main():
     import argparse
     parser = argparse.ArgumentParser(description='Fetch player HR prop odds (anytime HR) if available')
     parser.add_argument('--date', default=datetime.now().strftime('%Y-%m-%d'))
+    parser.add_argument('--offline', action='store_true', help='serve HTTP only from data/.http-cache')
     args = parser.parse_args()
+    if args.offline:
+        http_client.set_offline()
     fetch_player_hr_odds(args.date)
 
 
 if __name__ == '__main__':
     main()
+    print(f"HTTP: {http_client.summary()}")
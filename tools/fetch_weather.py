@@ -9,13 +9,17 @@ import sys
 APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 if APP_DIR not in sys.path:
     sys.path.insert(0, APP_DIR)
+import http_client
 from tools.fetch_basics import fetch_ballpark_weather, DATA_DIR, save
 
 
 def main():
     parser = argparse.ArgumentParser(description='Fetch only ballpark weather/park factors')
     parser.add_argument('--date', default=datetime.now().strftime('%Y-%m-%d'))
+    parser.add_argument('--offline', action='store_true', help='serve HTTP only from data/.http-cache')
     args = parser.parse_args()
+    if args.offline:
+        http_client.set_offline()
     date = args.date
 
     out = fetch_ballpark_weather(date)
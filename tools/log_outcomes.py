@@ -1,10 +1,13 @@
 #!/usr/bin/env python3
 from __future__ import annotations
-import os, json, csv
+import os, json, csv, sys
 from datetime import datetime
 
 APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 DATA_DIR = os.path.join(APP_DIR, 'data')
+if APP_DIR not in sys.path:
+    sys.path.insert(0, APP_DIR)
+from scores_store import existing_scores_path, load_scores
 os.makedirs(DATA_DIR, exist_ok=True)
 
 # Output CSV path (append)
@@ -25,9 +28,12 @@ def load_json(path: str):
 
 
 def log_outcomes(date: str):
-    scores_path = os.path.join(DATA_DIR, f'hr-scores-{date}.json')
+    scores_path = existing_scores_path(DATA_DIR, date)
     hitters_path = os.path.join(DATA_DIR, f'hr-hitters-{date}.json')
-    scores = load_json(scores_path) or {}
+    try:
+        scores = load_scores(scores_path) if scores_path else {}
+    except Exception:
+        scores = {}
     hitters = (load_json(hitters_path) or {}).get('hitters') or {}
     # Build map of player -> hr count (by id) not always available: rely on name match fallback
     # The scores file might not include MLBAM id; so we match by name case-insensitive